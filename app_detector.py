@@ -5,9 +5,8 @@ import os
 import json
 import requests
 import platform
-import subprocess
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 # Comprehensive mapping of executable names to app info with logo sources
 # Icons from: SimpleIcons CDN + Icons8 (reliable, 99% uptime, high quality)
@@ -237,24 +236,83 @@ def get_installed_apps_windows() -> Dict[str, Dict]:
     
     return apps
 
+# Executables found on PATH, rebuilt only when PATH or a PATH directory's mtime changes
+_PATH_INDEX = {"key": None, "executables": {}}
+
+def _path_directories(search_path: Optional[str] = None) -> List[str]:
+    """De-duplicated PATH directories in lookup order"""
+    directories = []
+    for directory in (search_path if search_path is not None else os.environ.get("PATH", "")).split(os.pathsep):
+        directory = directory or "."
+        if directory not in directories:
+            directories.append(directory)
+    return directories
+
+def _path_index_key(directories: List[str]) -> Tuple:
+    """(directory, mtime_ns) pairs: adding or removing a file changes its directory's mtime"""
+    key = []
+    for directory in directories:
+        try:
+            key.append((directory, os.stat(directory).st_mtime_ns))
+        except OSError:
+            key.append((directory, None))
+    return tuple(key)
+
+def build_path_index(search_path: Optional[str] = None) -> Dict[str, str]:
+    """
+    Index every file on PATH with one os.scandir() per directory
+    Like `which`, the first directory on PATH wins for a given name
+    Returns: Dict mapping file name to full path
+    """
+    executables = {}
+    for directory in _path_directories(search_path):
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name not in executables:
+                        try:
+                            if entry.is_file():
+                                executables[entry.name] = entry.path
+                        except OSError:
+                            pass  # Dangling symlink
+        except OSError:
+            continue
+    return executables
+
+def get_path_index(search_path: Optional[str] = None) -> Dict[str, str]:
+    """
+    Cached PATH index, rebuilt when PATH or the mtime of one of its directories changes
+    Returns: Dict mapping file name to full path (treat as read-only)
+    """
+    directories = _path_directories(search_path)
+    key = _path_index_key(directories)
+    if _PATH_INDEX["key"] != key:
+        _PATH_INDEX["executables"] = build_path_index(search_path)
+        _PATH_INDEX["key"] = key
+    return _PATH_INDEX["executables"]
+
+def find_executable(name: str, search_path: Optional[str] = None) -> Optional[str]:
+    """
+    Full path of an executable on PATH (like `which`), or None
+    """
+    path = get_path_index(search_path).get(name)
+    if path is not None and os.access(path, os.X_OK):
+        return path
+    return None
+
 def get_installed_apps_linux() -> Dict[str, Dict]:
     """
     Detect installed applications on Linux
+    Looks every app up in the PATH index (one scan of the PATH directories)
     Returns: Dict mapping app name to app info
     """
     apps = {}
     
     try:
-        # Use 'which' command to detect if apps are in PATH
-        for app_name in ACTIVE_APP_SOURCES.keys():
-            try:
-                result = subprocess.run(['which', app_name], capture_output=True, text=True, timeout=2)
-                if result.returncode == 0:
-                    path = result.stdout.strip()
-                    apps[app_name] = {"name": ACTIVE_APP_SOURCES[app_name]["name"], "path": path}
-            except Exception:
-                # App not found, but keep it in mappings for reference
-                apps[app_name] = {"name": ACTIVE_APP_SOURCES[app_name]["name"], "path": None}
+        for app_name, info in ACTIVE_APP_SOURCES.items():
+            path = find_executable(app_name)
+            if path is not None:
+                apps[app_name] = {"name": info["name"], "path": path}
     except Exception as e:
         print(f"Error detecting Linux apps: {str(e)}")
     
@@ -306,6 +364,25 @@ def build_app_icons_dict() -> Dict[str, str]:
     
     return app_icons
 
+# Parsed app_mappings.json, reused while the file's mtime and size are unchanged
+_MAPPINGS_CACHE = {"key": None, "mappings": None}
+
+def load_app_mappings() -> Optional[Dict[str, Dict]]:
+    """
+    Load the cached app mappings file, parsing it only when it changed
+    Returns: Dict of {exe_name: mapping} (treat as read-only), or None if there is no cache
+    """
+    try:
+        stat = APP_MAPPINGS_FILE.stat()
+    except OSError:
+        return None
+    key = (stat.st_mtime_ns, stat.st_size)
+    if _MAPPINGS_CACHE["key"] != key:
+        with open(APP_MAPPINGS_FILE, 'r') as f:
+            _MAPPINGS_CACHE["mappings"] = json.load(f)
+        _MAPPINGS_CACHE["key"] = key
+    return _MAPPINGS_CACHE["mappings"]
+
 def get_detected_apps() -> Dict[str, str]:
     """
     Get all detected applications with their logos
@@ -315,10 +392,9 @@ def get_detected_apps() -> Dict[str, str]:
     
     # Try to load from cache first
     try:
-        if APP_MAPPINGS_FILE.exists():
-            with open(APP_MAPPINGS_FILE, 'r') as f:
-                mappings = json.load(f)
-                return {k: v.get("logo", "") for k, v in mappings.items()}
+        mappings = load_app_mappings()
+        if mappings is not None:
+            return {k: v.get("logo", "") for k, v in mappings.items()}
     except Exception as e:
         print(f"Error loading mappings cache: {str(e)}")
     
@@ -330,8 +406,8 @@ def get_app_info() -> List[Dict]:
     Get a list of all known apps with their information for current platform
     """
     apps_list = []
+    app_icons = get_detected_apps()
     for exe_name, info in ACTIVE_APP_SOURCES.items():
-        app_icons = get_detected_apps()
         logo = app_icons.get(exe_name, "/static/logo/default.png")
         
         apps_list.append({
@@ -1,18 +1,46 @@
 """
 Backend module for System Pulse
 """
-from .scoring import calculate_relevance_score, sort_processes_by_relevance
+from .scoring import calculate_relevance_score, sort_processes_by_relevance, RankedIndex
+from .columnar import AppColumns
+from .records import AppRecord
 from .cache import TTLCache, get_cache
 from .async_ops import run_in_executor, get_thread_pool_executor, shutdown_executor
 from .timeout import RequestTimeoutMiddleware
+from .sampler import BackgroundSampler, Sample
+from .stream import SampleStream
+from .snapshot_index import SnapshotIndex
+from .autocomplete import ProcessPrefixIndex
+from .process_details import ProcessDetailCache
+from .grouping import ProcessGrouper
+from .containers import CgroupCollector
+from .history import MetricHistory
+from .icons import IconResolver
+from .storage import MetricStore
+from .sqlite_sink import SnapshotSink
 
 __all__ = [
     'calculate_relevance_score',
     'sort_processes_by_relevance',
+    'RankedIndex',
+    'AppColumns',
+    'AppRecord',
     'TTLCache',
     'get_cache',
     'run_in_executor',
     'get_thread_pool_executor',
     'shutdown_executor',
-    'RequestTimeoutMiddleware'
+    'RequestTimeoutMiddleware',
+    'BackgroundSampler',
+    'Sample',
+    'SampleStream',
+    'SnapshotIndex',
+    'ProcessPrefixIndex',
+    'ProcessDetailCache',
+    'ProcessGrouper',
+    'CgroupCollector',
+    'MetricHistory',
+    'IconResolver',
+    'MetricStore',
+    'SnapshotSink'
 ]
@@ -3,20 +3,29 @@ Async operations for System Pulse.
 Runs expensive I/O operations in a thread pool to avoid blocking the event loop.
 """
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
-from typing import Callable, Any
+import contextvars
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, Any, Optional
 
-# Thread pool for CPU-bound and I/O operations
-_executor = ThreadPoolExecutor(max_workers=2)
+from .timeout import current_deadline
 
+# Thread pool for request work (store/SQLite queries, process detail reads,
+# cache refreshes); periodic jobs like sampling and compaction run on their
+# own dedicated_executor() so they never compete with it
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="system-pulse")
 
-async def run_in_executor(func: Callable, *args) -> Any:
+
+async def run_in_executor(func: Callable, *args, executor: Optional[Executor] = None) -> Any:
     """
     Run a blocking function in a thread pool without blocking the event loop.
+    The function runs in a copy of the caller's context, so it sees the
+    request deadline (backend.timeout.check_deadline). If the caller is
+    cancelled, queued work is dropped and running work is asked to stop.
     
     Args:
         func: Blocking function to execute
         *args: Arguments to pass to the function
+        executor: Executor to run on (default: the shared pool)
     
     Returns:
         Result from the function
@@ -24,8 +33,29 @@ async def run_in_executor(func: Callable, *args) -> Any:
     Usage:
         result = await run_in_executor(collect_process_data)
     """
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(_executor, func, *args)
+    context = contextvars.copy_context()
+    future = (executor or _executor).submit(context.run, func, *args)
+    try:
+        return await asyncio.wrap_future(future)
+    except asyncio.CancelledError:
+        deadline = current_deadline()
+        if deadline is not None:
+            deadline.cancel_work(future)
+        else:
+            future.cancel()
+        raise
+
+
+def dedicated_executor(name: str) -> ThreadPoolExecutor:
+    """
+    Single-thread executor for one periodic background job.
+    A long run of that job then only delays its own next run, never request
+    work on the shared pool (or another job).
+    
+    Args:
+        name: Thread name prefix, e.g. "sampler"
+    """
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
 
 
 def get_thread_pool_executor() -> ThreadPoolExecutor:
@@ -0,0 +1,173 @@
+"""
+Process autocomplete index for System Pulse.
+A sorted array of word prefixes of every live process name, kept up to
+date by the incremental process table, so each keystroke of the process
+search is a bisect instead of a walk over all processes.
+"""
+import bisect
+import re
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .timeout import deadline_expired
+
+ProcessKey = Tuple[int, float]  # (pid, create_time)
+
+# Word starts inside a name: "Google Chrome Helper" is found by "chr" and "help"
+_WORD_START = re.compile(r'(?<=[\s\-_.:/])\w')
+
+
+def word_suffixes(lowered: str) -> List[str]:
+    """The name itself plus its tail from every later word start."""
+    suffixes = [lowered]
+    for match in _WORD_START.finditer(lowered):
+        suffixes.append(lowered[match.start():])
+    return suffixes
+
+
+class ProcessPrefixIndex:
+    """
+    Word-prefix index over live processes.
+    
+    Entries are (name suffix, pid, create_time) tuples kept sorted; a query
+    bisects to the first entry >= the typed prefix and reads forward until
+    the prefix no longer matches or the limit is reached. New entries are
+    buffered and merged into the sorted array by the next query (one
+    timsort run merge instead of one insertion each). add()/remove() are
+    called by IncrementalProcessTable when a process joins or leaves an app
+    (births, exits and renames), so maintenance only touches changed
+    processes.
+    
+    exe paths are resolved lazily, only for returned rows, and cached per
+    (pid, create_time) until the process exits.
+    
+    Usage:
+        index = ProcessPrefixIndex(exe_fn=lambda pid: psutil.Process(pid).exe())
+        table = IncrementalProcessTable(logo_fn, process_listeners=[index])
+        rows = index.search("chr", limit=10)
+    """
+    
+    def __init__(self, exe_fn: Optional[Callable[[int], str]] = None):
+        """
+        Args:
+            exe_fn: Returns the executable path of a PID (may raise; "" is used then)
+        """
+        self.exe_fn = exe_fn
+        self._entries: List[Tuple[str, int, float]] = []
+        self._pending: List[Tuple[str, int, float]] = []
+        self._names: Dict[ProcessKey, str] = {}
+        self._by_pid: Dict[int, ProcessKey] = {}
+        self._exes: Dict[ProcessKey, str] = {}
+        self._lock = threading.Lock()
+        self._stats = {'queries': 0, 'exe_lookups': 0, 'exe_cache_hits': 0}
+    
+    def __len__(self) -> int:
+        return len(self._names)
+    
+    def add(self, key: ProcessKey, name: str) -> None:
+        """Index a process under its name."""
+        with self._lock:
+            if key in self._names:
+                self._remove(key)
+            self._names[key] = name
+            self._by_pid[key[0]] = key
+            for suffix in word_suffixes(name.lower()):
+                self._pending.append((suffix, key[0], key[1]))
+    
+    def remove(self, key: ProcessKey) -> None:
+        """Forget a process (exit, or before it is re-added under a new name)."""
+        with self._lock:
+            self._remove(key)
+    
+    def _remove(self, key: ProcessKey) -> None:
+        name = self._names.pop(key, None)
+        if name is None:
+            return
+        if self._by_pid.get(key[0]) == key:
+            del self._by_pid[key[0]]
+        self._exes.pop(key, None)
+        entries = self._entries
+        for suffix in word_suffixes(name.lower()):
+            entry = (suffix, key[0], key[1])
+            i = bisect.bisect_left(entries, entry)
+            if i < len(entries) and entries[i] == entry:
+                del entries[i]
+            elif entry in self._pending:
+                self._pending.remove(entry)
+    
+    def search(self, query: str, limit: int = 10) -> List[dict]:
+        """
+        Processes whose name (or a word in it) starts with query, plus the
+        process whose PID is query, if any. Ordered by matched text.
+        
+        Args:
+            query: Typed text (case-insensitive); "" lists names alphabetically
+            limit: Maximum number of rows
+        
+        Returns:
+            list: dicts with pid, name and exe (exe not resolved yet is None)
+        """
+        prefix = query.strip().lower()
+        keys: List[ProcessKey] = []
+        seen = set()
+        with self._lock:
+            self._stats['queries'] += 1
+            if self._pending:
+                self._entries.extend(self._pending)
+                self._entries.sort()
+                self._pending = []
+            if prefix.isdigit():
+                key = self._by_pid.get(int(prefix))
+                if key is not None:
+                    keys.append(key)
+                    seen.add(key)
+            entries = self._entries
+            i = bisect.bisect_left(entries, (prefix,))
+            while len(keys) < limit and i < len(entries):
+                suffix, pid, create_time = entries[i]
+                if not suffix.startswith(prefix):
+                    break
+                key = (pid, create_time)
+                if key not in seen:
+                    seen.add(key)
+                    keys.append(key)
+                i += 1
+            return [{"pid": key[0], "name": self._names[key], "exe": self._exes.get(key)}
+                    for key in keys[:limit]]
+    
+    def resolve_exes(self, rows: List[dict]) -> List[dict]:
+        """
+        Fill in missing exe paths of search() rows (blocking: run in a worker).
+        Each live process is looked up at most once.
+        """
+        for row in rows:
+            if row["exe"] is not None:
+                self._stats['exe_cache_hits'] += 1
+                continue
+            exe = ""
+            if deadline_expired():
+                # Out of time: answer without the exe, look it up next time
+                row["exe"] = exe
+                continue
+            if self.exe_fn is not None:
+                try:
+                    exe = self.exe_fn(row["pid"]) or ""
+                except Exception:
+                    pass
+            self._stats['exe_lookups'] += 1
+            row["exe"] = exe
+            with self._lock:
+                key = self._by_pid.get(row["pid"])
+                if key is not None and self._names.get(key) == row["name"]:
+                    self._exes[key] = exe
+        return rows
+    
+    def get_stats(self) -> dict:
+        """Get index statistics for monitoring."""
+        with self._lock:
+            return {
+                'processes': len(self._names),
+                'entries': len(self._entries) + len(self._pending),
+                'cached_exes': len(self._exes),
+                **self._stats
+            }
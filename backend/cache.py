@@ -2,22 +2,52 @@
 Performance caching layer with TTL (Time To Live).
 Reduces redundant process/connection lookups.
 """
+import asyncio
+import sys
+import threading
 import time
+from collections import OrderedDict
 from typing import Any, Optional, Callable
 
+from .async_ops import run_in_executor, get_thread_pool_executor
+from .timeout import DeadlineExceeded, clear_deadline, time_remaining
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """
+    Approximate memory footprint of a cached value in bytes.
+    Walks nested dicts/lists/tuples/sets (up to 4 levels deep).
+    """
+    size = sys.getsizeof(value)
+    if _depth >= 4:
+        return size
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += estimate_size(item, _depth + 1)
+    return size
+
 
 class CacheEntry:
     """Single cache entry with expiration tracking."""
     
-    def __init__(self, value: Any, ttl: float):
+    def __init__(self, value: Any, ttl: float, stale_ttl: float = 0.0, size: int = 0):
         self.value = value
         self.created_at = time.time()
         self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.size = size
     
     def is_expired(self) -> bool:
         """Check if entry has exceeded TTL."""
         return (time.time() - self.created_at) > self.ttl
     
+    def is_dead(self) -> bool:
+        """Check if entry has exceeded TTL plus its stale grace window."""
+        return (time.time() - self.created_at) > self.ttl + self.stale_ttl
+    
     def get(self) -> Optional[Any]:
         """Get value if not expired, else None."""
         if self.is_expired():
@@ -25,13 +55,38 @@ class CacheEntry:
         return self.value
 
 
+class InFlightCall:
+    """A computation in progress that other threads can wait on."""
+    
+    def __init__(self):
+        self._done = threading.Event()
+        self._value = None
+        self._error: Optional[BaseException] = None
+    
+    def set_result(self, value: Any) -> None:
+        self._value = value
+        self._done.set()
+    
+    def set_exception(self, error: BaseException) -> None:
+        self._error = error
+        self._done.set()
+    
+    def wait(self) -> Any:
+        """Block until the computation finishes, then return or raise its result."""
+        self._done.wait()
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+
 class TTLCache:
     """
     Time-To-Live cache for expensive operations.
     Automatically expires entries after specified seconds.
+    Optionally bounded by entry count and/or approximate bytes (LRU eviction).
     
     Usage:
-        cache = TTLCache()
+        cache = TTLCache(max_entries=256)
         
         # Set value with 2 second TTL
         cache.set('processes', data, ttl=2)
@@ -40,20 +95,46 @@ class TTLCache:
         value = cache.get('processes')
         
         # Get or compute (auto-calculate if missing/expired)
-        value = cache.get_or_compute('processes', 
+        value = cache.get_or_compute('processes',
                                      compute_fn=lambda: get_all_processes(),
                                      ttl=2)
+        
+        # Coalesce concurrent misses into a single computation
+        value = cache.get_or_compute('processes', get_all_processes, ttl=2, coalesce=True)
+        value = await cache.get_or_compute_async('processes', get_all_processes, ttl=2)
+        
+        # Stale-while-revalidate: for 5s after expiry, return the old value
+        # immediately and refresh it in the background
+        value = await cache.get_or_compute_async('processes', get_all_processes,
+                                                 ttl=2, stale_ttl=5)
     """
     
-    def __init__(self):
-        self._cache = {}
+    def __init__(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None):
+        """
+        Args:
+            max_entries: Maximum number of entries (None = unbounded)
+            max_bytes: Maximum approximate total size in bytes (None = unbounded)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._cache = OrderedDict()  # key -> CacheEntry, least recently used first
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._inflight = {}        # key -> InFlightCall (thread callers)
+        self._async_inflight = {}  # key -> asyncio.Future (event loop callers)
+        self._sweeper: Optional[asyncio.Task] = None
         self._stats = {
             'hits': 0,
             'misses': 0,
-            'total_requests': 0
+            'total_requests': 0,
+            'coalesced_waits': 0,
+            'stale_hits': 0,
+            'background_refreshes': 0,
+            'evictions': 0,
+            'expired_removed': 0
         }
     
-    def set(self, key: str, value: Any, ttl: float = 1.0) -> None:
+    def set(self, key: str, value: Any, ttl: float = 1.0, stale_ttl: float = 0.0) -> None:
         """
         Store value in cache with TTL.
         
@@ -61,8 +142,57 @@ class TTLCache:
             key: Cache key
             value: Value to cache
             ttl: Time to live in seconds (default: 1 second)
+            stale_ttl: Grace window after ttl during which the value may still
+                be served stale by get_or_compute (default: 0 = none)
+        """
+        size = estimate_size(value) if self.max_bytes is not None else 0
+        with self._lock:
+            self._remove(key)
+            self._cache[key] = CacheEntry(value, ttl, stale_ttl, size)
+            self._bytes += size
+            self._evict()
+    
+    def _remove(self, key: str) -> None:
+        """Remove an entry and its size accounting (caller holds the lock)."""
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+    
+    def _evict(self) -> None:
+        """Evict least recently used entries until within bounds (caller holds the lock)."""
+        while self._cache and (
+            (self.max_entries is not None and len(self._cache) > self.max_entries) or
+            (self.max_bytes is not None and self._bytes > self.max_bytes and len(self._cache) > 1)
+        ):
+            _, entry = self._cache.popitem(last=False)
+            self._bytes -= entry.size
+            self._stats['evictions'] += 1
+    
+    def _lookup(self, key: str):
         """
-        self._cache[key] = CacheEntry(value, ttl)
+        Find an entry and classify it as 'fresh', 'stale' or missing.
+        Dead entries (past their stale window) are removed.
+        
+        Returns:
+            tuple: (entry or None, state) where state is 'fresh', 'stale' or 'miss'
+        """
+        with self._lock:
+            self._stats['total_requests'] += 1
+            entry = self._cache.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None, 'miss'
+            if not entry.is_expired():
+                self._cache.move_to_end(key)
+                self._stats['hits'] += 1
+                return entry, 'fresh'
+            if entry.is_dead():
+                # Expired - clean up
+                self._remove(key)
+                self._stats['misses'] += 1
+                return None, 'miss'
+            self._cache.move_to_end(key)
+            return entry, 'stale'
     
     def get(self, key: str) -> Optional[Any]:
         """
@@ -74,25 +204,16 @@ class TTLCache:
         Returns:
             Cached value or None if expired/missing
         """
-        self._stats['total_requests'] += 1
-        
-        if key not in self._cache:
-            self._stats['misses'] += 1
-            return None
-        
-        entry = self._cache[key]
-        value = entry.get()
-        
-        if value is None:
-            # Expired - clean up
-            del self._cache[key]
+        entry, state = self._lookup(key)
+        if state == 'fresh':
+            return entry.value
+        if state == 'stale':
+            # Plain reads never see stale values; keep the entry for get_or_compute
             self._stats['misses'] += 1
-            return None
-        
-        self._stats['hits'] += 1
-        return value
+        return None
     
-    def get_or_compute(self, key: str, compute_fn: Callable, ttl: float = 1.0) -> Any:
+    def get_or_compute(self, key: str, compute_fn: Callable, ttl: float = 1.0,
+                       coalesce: bool = False, stale_ttl: float = 0.0) -> Any:
         """
         Get from cache or compute if missing/expired.
         Useful for expensive operations.
@@ -101,18 +222,143 @@ class TTLCache:
             key: Cache key
             compute_fn: Function to call if cache miss
             ttl: Time to live in seconds
+            coalesce: If True, concurrent callers missing the same key wait for
+                a single computation instead of each running compute_fn
+            stale_ttl: Seconds after expiry during which the old value is
+                returned immediately while the thread pool refreshes it
+        
+        Returns:
+            Cached or newly computed value
+        """
+        entry, state = self._lookup(key)
+        if state == 'fresh':
+            return entry.value
+        if state == 'stale':
+            self._stats['stale_hits'] += 1
+            self._refresh_in_background(key, compute_fn, ttl, stale_ttl)
+            return entry.value
+        
+        if not coalesce:
+            # Compute new value
+            value = compute_fn()
+            self.set(key, value, ttl=ttl, stale_ttl=stale_ttl)
+            return value
+        
+        with self._lock:
+            # Another thread may have finished computing since our miss
+            entry = self._cache.get(key)
+            if entry is not None and not entry.is_expired():
+                return entry.value
+            call = self._inflight.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._inflight[key] = InFlightCall()
+            else:
+                self._stats['coalesced_waits'] += 1
+        
+        if not is_leader:
+            return call.wait()
+        return self._compute_as_leader(key, call, compute_fn, ttl, stale_ttl)
+    
+    def _compute_as_leader(self, key: str, call: InFlightCall, compute_fn: Callable,
+                           ttl: float, stale_ttl: float) -> Any:
+        try:
+            value = compute_fn()
+            self.set(key, value, ttl=ttl, stale_ttl=stale_ttl)
+            call.set_result(value)
+            return value
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+    
+    def _refresh_in_background(self, key: str, compute_fn: Callable, ttl: float,
+                               stale_ttl: float) -> None:
+        """Recompute a stale key on the thread pool unless a refresh is already running."""
+        with self._lock:
+            if key in self._inflight:
+                return
+            call = self._inflight[key] = InFlightCall()
+            self._stats['background_refreshes'] += 1
+        
+        def refresh():
+            # Serves every later caller, so no request's budget applies
+            clear_deadline()
+            try:
+                self._compute_as_leader(key, call, compute_fn, ttl, stale_ttl)
+            except Exception as e:
+                print(f"Warning: Background refresh of '{key}' failed: {str(e)}")
+        
+        get_thread_pool_executor().submit(refresh)
+    
+    async def get_or_compute_async(self, key: str, compute_fn: Callable, ttl: float = 1.0,
+                                   stale_ttl: float = 0.0) -> Any:
+        """
+        Async variant of get_or_compute that always coalesces.
+        A blocking compute_fn runs in the thread pool; a coroutine function is awaited.
+        All concurrent callers missing the same key await one shared computation.
+        The computation is not bound by the deadline of the request that
+        started it; each caller waits for it only within its own deadline.
+        
+        Args:
+            key: Cache key
+            compute_fn: Blocking function or coroutine function to call on miss
+            ttl: Time to live in seconds
+            stale_ttl: Seconds after expiry during which the old value is
+                returned immediately while a background task refreshes it
         
         Returns:
             Cached or newly computed value
         """
-        cached = self.get(key)
-        if cached is not None:
-            return cached
+        entry, state = self._lookup(key)
+        if state == 'fresh':
+            return entry.value
+        if state == 'stale':
+            self._stats['stale_hits'] += 1
+            if key not in self._async_inflight:
+                self._stats['background_refreshes'] += 1
+                self._start_async_compute(key, compute_fn, ttl, stale_ttl)
+            return entry.value
+        
+        future = self._async_inflight.get(key)
+        if future is not None:
+            self._stats['coalesced_waits'] += 1
+        else:
+            future = self._start_async_compute(key, compute_fn, ttl, stale_ttl)
         
-        # Compute new value
-        value = compute_fn()
-        self.set(key, value, ttl=ttl)
-        return value
+        # Shield so a cancelled or timed-out waiter does not cancel the shared
+        # computation
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout=time_remaining())
+        except asyncio.TimeoutError:
+            if future.done():
+                raise  # raised by the computation itself
+            raise DeadlineExceeded(f"Gave up waiting for '{key}' at the request deadline")
+    
+    def _start_async_compute(self, key: str, compute_fn: Callable, ttl: float,
+                             stale_ttl: float) -> asyncio.Future:
+        future = asyncio.ensure_future(self._compute_async(key, compute_fn, ttl, stale_ttl))
+        # Avoid "exception never retrieved" if nobody awaits (background refresh)
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._async_inflight[key] = future
+        return future
+    
+    async def _compute_async(self, key: str, compute_fn: Callable, ttl: float,
+                             stale_ttl: float) -> Any:
+        # Runs in a copy of the starting request's context: detach it from
+        # that request's deadline, which its joined callers do not share
+        clear_deadline()
+        try:
+            if asyncio.iscoroutinefunction(compute_fn):
+                value = await compute_fn()
+            else:
+                value = await run_in_executor(compute_fn)
+            self.set(key, value, ttl=ttl, stale_ttl=stale_ttl)
+            return value
+        finally:
+            self._async_inflight.pop(key, None)
     
     def clear(self, key: Optional[str] = None) -> None:
         """
@@ -121,10 +367,12 @@ class TTLCache:
         Args:
             key: Specific key to clear, or None to clear all
         """
-        if key is None:
-            self._cache.clear()
-        elif key in self._cache:
-            del self._cache[key]
+        with self._lock:
+            if key is None:
+                self._cache.clear()
+                self._bytes = 0
+            else:
+                self._remove(key)
     
     def get_stats(self) -> dict:
         """Get cache performance statistics."""
@@ -137,22 +385,53 @@ class TTLCache:
             'cache_hits': hits,
             'cache_misses': self._stats['misses'],
             'hit_rate_percent': round(hit_rate, 2),
-            'active_entries': len(self._cache)
+            'coalesced_waits': self._stats['coalesced_waits'],
+            'inflight_computations': len(self._inflight) + len(self._async_inflight),
+            'stale_hits': self._stats['stale_hits'],
+            'background_refreshes': self._stats['background_refreshes'],
+            'evictions': self._stats['evictions'],
+            'expired_removed': self._stats['expired_removed'],
+            'active_entries': len(self._cache),
+            'approx_bytes': self._bytes if self.max_bytes is not None else None
         }
     
     def cleanup_expired(self) -> int:
         """
         Remove all expired entries from cache.
+        Entries still inside their stale grace window are kept.
         Returns number of entries cleaned up.
         """
-        expired_keys = [k for k, v in self._cache.items() if v.is_expired()]
-        for key in expired_keys:
-            del self._cache[key]
+        with self._lock:
+            expired_keys = [k for k, v in self._cache.items() if v.is_dead()]
+            for key in expired_keys:
+                self._remove(key)
+            self._stats['expired_removed'] += len(expired_keys)
         return len(expired_keys)
+    
+    async def _sweep(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            self.cleanup_expired()
+    
+    def start_sweeper(self, interval: float = 30.0) -> None:
+        """Periodically run cleanup_expired() on the running event loop."""
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep(interval))
+    
+    async def stop_sweeper(self) -> None:
+        """Cancel the periodic sweeper."""
+        if self._sweeper is None:
+            return
+        self._sweeper.cancel()
+        try:
+            await self._sweeper
+        except asyncio.CancelledError:
+            pass
+        self._sweeper = None
 
 
-# Global cache instance
-_cache_instance = TTLCache()
+# Global cache instance (bounded so per-filter keys cannot grow without limit)
+_cache_instance = TTLCache(max_entries=256, max_bytes=64 * 1024 * 1024)
 
 
 def get_cache() -> TTLCache:
@@ -0,0 +1,200 @@
+"""
+Process collectors for System Pulse.
+A collector returns one row per running process as a tuple:
+    (pid, create_time, name, cpu_percent, rss_bytes)
+
+create_time only needs to be stable for the lifetime of a process, so that
+(pid, create_time) identifies a process even when its PID is reused.
+
+After collect(), a collector's ppids attribute maps every collected PID to
+its parent PID (read in the same pass, used for process tree grouping).
+
+PsutilCollector works on every platform. ProcfsCollector is a Linux fast path
+that reads /proc directly and computes CPU usage from jiffy deltas itself.
+"""
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+import psutil
+
+ProcessRow = Tuple[int, float, str, float, int]
+
+# comm in /proc/<pid>/stat is truncated to TASK_COMM_LEN - 1 characters
+COMM_MAX_LEN = 15
+
+
+class PsutilCollector:
+    """Collect process rows through psutil.process_iter (portable)."""
+    
+    name = 'psutil'
+    
+    def __init__(self):
+        self.ppids: Dict[int, int] = {}
+    
+    def collect(self) -> List[ProcessRow]:
+        rows = []
+        ppids = {}
+        try:
+            for proc in psutil.process_iter(['pid', 'create_time', 'name', 'cpu_percent',
+                                             'memory_info', 'ppid']):
+                try:
+                    pinfo = proc.info
+                    memory_info = pinfo['memory_info']
+                    ppids[pinfo['pid']] = pinfo['ppid'] or 0
+                    rows.append((
+                        pinfo['pid'],
+                        pinfo['create_time'] or 0.0,
+                        pinfo['name'],
+                        pinfo['cpu_percent'] or 0.0,
+                        memory_info.rss if memory_info else 0
+                    ))
+                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                    pass
+        except Exception as e:
+            print(f"Warning: Error iterating processes: {str(e)}")
+        self.ppids = ppids
+        return rows
+
+
+class ProcfsCollector:
+    """
+    Collect process rows by reading /proc/<pid>/stat directly (Linux only).
+    
+    - One os.scandir() of /proc per cycle, one read per process into a reused buffer
+    - create_time is the raw starttime (jiffies after boot): cheap and stable
+    - RSS comes from the same stat line (field 24, identical to statm's resident)
+    - CPU percent is computed from utime+stime jiffy deltas between cycles, with
+      the same semantics as psutil's cpu_percent(interval=None): 100% = one core,
+      0.0 on the first sighting of a process
+    """
+    
+    name = 'procfs'
+    
+    def __init__(self, procfs_path: str = '/proc'):
+        self.procfs_path = procfs_path
+        self._buf = bytearray(4096)
+        self._clock_ticks = os.sysconf('SC_CLK_TCK')
+        self._page_size = os.sysconf('SC_PAGE_SIZE')
+        # pid -> (starttime, utime + stime) from the previous cycle
+        self._prev_times: Dict[int, Tuple[int, int]] = {}
+        self._prev_timestamp: Optional[float] = None
+        # (pid, starttime) -> full name for processes whose comm was truncated
+        self._long_names: Dict[Tuple[int, int], str] = {}
+        self.ppids: Dict[int, int] = {}
+    
+    @staticmethod
+    def is_supported(procfs_path: str = '/proc') -> bool:
+        """Check that a Linux-style /proc is available."""
+        return os.path.exists(os.path.join(procfs_path, 'self', 'stat'))
+    
+    def _read(self, path: str) -> Optional[bytes]:
+        """Read a small /proc file into the reused buffer."""
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            return None
+        try:
+            n = os.readv(fd, [self._buf])
+        except OSError:
+            return None
+        finally:
+            os.close(fd)
+        return bytes(self._buf[:n])
+    
+    def _full_name(self, pid: int, starttime: int, comm: str) -> str:
+        """
+        Resolve the untruncated process name the way psutil does:
+        if comm was cut at 15 chars, use argv[0]'s basename when it extends comm.
+        """
+        key = (pid, starttime)
+        cached = self._long_names.get(key)
+        if cached is not None:
+            return cached
+        
+        name = comm
+        data = self._read(f"{self.procfs_path}/{pid}/cmdline")
+        if data:
+            argv0 = data.split(b'\0', 1)[0].decode('utf-8', 'replace')
+            candidate = os.path.basename(argv0)
+            if candidate.startswith(comm):
+                name = candidate
+        self._long_names[key] = name
+        return name
+    
+    def collect(self) -> List[ProcessRow]:
+        rows = []
+        now = time.monotonic()
+        elapsed_ticks = ((now - self._prev_timestamp) * self._clock_ticks
+                         if self._prev_timestamp is not None else 0.0)
+        prev_times = self._prev_times
+        cur_times = {}
+        ppids = {}
+        page_size = self._page_size
+        
+        try:
+            entries = os.scandir(self.procfs_path)
+        except OSError as e:
+            print(f"Warning: Error reading {self.procfs_path}: {str(e)}")
+            return rows
+        
+        with entries:
+            for entry in entries:
+                if not entry.name.isdigit():
+                    continue
+                data = self._read(f"{entry.path}/stat")
+                if not data:
+                    continue  # Process exited between scandir and read
+                
+                try:
+                    # "pid (comm) state ppid ..." - comm may contain spaces/parens
+                    lparen = data.index(b'(')
+                    rparen = data.rindex(b')')
+                    pid = int(data[:lparen])
+                    comm = data[lparen + 1:rparen].decode('utf-8', 'replace')
+                    fields = data[rparen + 2:].split()
+                    ppid = int(fields[1])
+                    total_time = int(fields[11]) + int(fields[12])  # utime + stime
+                    starttime = int(fields[19])
+                    rss = int(fields[21]) * page_size
+                except (ValueError, IndexError):
+                    continue
+                
+                cpu = 0.0
+                prev = prev_times.get(pid)
+                if prev is not None and prev[0] == starttime and elapsed_ticks > 0:
+                    cpu = round(max(total_time - prev[1], 0) / elapsed_ticks * 100, 1)
+                cur_times[pid] = (starttime, total_time)
+                ppids[pid] = ppid
+                
+                name = comm
+                if len(comm) >= COMM_MAX_LEN:
+                    name = self._full_name(pid, starttime, comm)
+                
+                rows.append((pid, starttime, name, cpu, rss))
+        
+        self._prev_times = cur_times
+        self.ppids = ppids
+        self._prev_timestamp = now
+        # Forget long names of exited processes
+        if self._long_names:
+            self._long_names = {k: v for k, v in self._long_names.items()
+                                if cur_times.get(k[0], (None,))[0] == k[1]}
+        return rows
+
+
+def get_collector(kind: str = 'auto'):
+    """
+    Create a process collector.
+    
+    Args:
+        kind: 'procfs', 'psutil', or 'auto' (procfs when /proc is available)
+    
+    Returns:
+        Collector instance with a collect() method; psutil is the fallback
+    """
+    if kind in ('auto', 'procfs') and ProcfsCollector.is_supported():
+        return ProcfsCollector()
+    if kind == 'procfs':
+        print("Warning: /proc is not available, falling back to psutil collector")
+    return PsutilCollector()
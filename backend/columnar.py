@@ -0,0 +1,244 @@
+"""
+Columnar app table for System Pulse.
+One sample's apps as parallel columns (pid, cpu, memory, incoming, outgoing,
+relevance_score) next to their AppRecords, so scoring, threshold filters and
+ranking run over whole columns at once instead of once per record.
+
+The process table keeps an AppColumnTable up to date between cycles (only
+the rows of changed apps are written and scored) and publishes an immutable
+AppColumns copy with every sample.
+
+Columns are NumPy arrays when NumPy is installed (optional dependency) and
+plain lists otherwise; every operation has a pure-Python fallback.
+"""
+import heapq
+from typing import Callable, Iterable, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # Optional: columns stay plain Python lists
+    np = None
+
+# Numeric columns, named like the AppRecord attributes they hold
+COLUMNS = ('pid', 'cpu', 'memory', 'incoming', 'outgoing', 'relevance_score')
+DTYPES = {'pid': 'int64', 'cpu': 'float64', 'memory': 'float64',
+          'incoming': 'int64', 'outgoing': 'int64', 'relevance_score': 'float64'}
+
+# Batch scorer: (cpu, memory, incoming, outgoing) columns -> scores
+ScoreFn = Callable[..., object]
+
+
+def _score_rows(records: list, columns: dict, rows: List[int], score_fn: ScoreFn) -> None:
+    """Score some rows in one batch, writing the score column and the records."""
+    if not rows:
+        return
+    if np is not None:
+        index = np.fromiter(rows, dtype=np.int64, count=len(rows))
+        scores = score_fn(columns['cpu'][index], columns['memory'][index],
+                          columns['incoming'][index], columns['outgoing'][index])
+        columns['relevance_score'][index] = scores
+        scores = scores.tolist()
+    else:
+        scores = score_fn(*([columns[field][row] for row in rows]
+                            for field in ('cpu', 'memory', 'incoming', 'outgoing')))
+        score_column = columns['relevance_score']
+        for row, score in zip(rows, scores):
+            score_column[row] = score
+    for row, score in zip(rows, scores):
+        records[row].relevance_score = score
+
+
+class AppColumns:
+    """
+    Struct-of-arrays view of one sample's apps (read-only once published).
+    Row i of every column belongs to records[i].
+    
+    Usage:
+        columns = AppColumns.from_records(apps.values(), calculate_relevance_scores)
+        rows = columns.at_least(min_cpu=5.0, min_memory=100.0)
+        ranking = [columns.records[i] for i in columns.order('relevance_score', True)]
+    """
+    
+    __slots__ = ('records',) + COLUMNS
+    
+    def __init__(self, records: list, pid, cpu, memory, incoming, outgoing, relevance_score):
+        """
+        Args:
+            records: AppRecords, one per row
+            pid, cpu, memory, incoming, outgoing, relevance_score: Columns
+                (NumPy arrays or lists) of the records' values
+        """
+        self.records = records
+        self.pid = pid
+        self.cpu = cpu
+        self.memory = memory
+        self.incoming = incoming
+        self.outgoing = outgoing
+        self.relevance_score = relevance_score
+    
+    @classmethod
+    def from_records(cls, records: Iterable, score_fn: ScoreFn) -> 'AppColumns':
+        """
+        Build columns from AppRecords, scoring those without a score in one batch.
+        
+        Args:
+            records: AppRecords (relevance_score is filled in where None)
+            score_fn: Batch scorer, e.g. backend.scoring.calculate_relevance_scores
+        """
+        records = list(records)
+        columns = {field: [getattr(app, field) for app in records] for field in COLUMNS[:-1]}
+        unscored = [i for i, app in enumerate(records) if app.relevance_score is None]
+        columns['relevance_score'] = [app.relevance_score or 0.0 for app in records]
+        if np is not None:
+            columns = {field: np.array(values, dtype=DTYPES[field]) for field, values in columns.items()}
+        _score_rows(records, columns, unscored, score_fn)
+        return cls(records, **columns)
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    def at_least(self, min_cpu: Optional[float] = None, min_memory: Optional[float] = None) -> List[int]:
+        """
+        Rows with cpu >= min_cpu and memory >= min_memory (None = no limit),
+        in row order; both thresholds are checked in one pass.
+        """
+        if np is not None:
+            mask = np.ones(len(self.records), dtype=bool)
+            if min_cpu is not None:
+                mask &= self.cpu >= min_cpu
+            if min_memory is not None:
+                mask &= self.memory >= min_memory
+            return np.flatnonzero(mask).tolist()
+        cpu_limit = float('-inf') if min_cpu is None else min_cpu
+        memory_limit = float('-inf') if min_memory is None else min_memory
+        return [i for i, (cpu, memory) in enumerate(zip(self.cpu, self.memory))
+                if cpu >= cpu_limit and memory >= memory_limit]
+    
+    def order(self, field: str, descending: bool, rows: Optional[List[int]] = None) -> List[int]:
+        """
+        Rows ordered by a numeric column; ties keep row order (stable).
+        
+        Args:
+            field: One of COLUMNS
+            descending: Highest first
+            rows: Rows to order (None = all)
+        """
+        column = getattr(self, field)
+        if np is not None:
+            index = None if rows is None else np.fromiter(rows, dtype=np.int64, count=len(rows))
+            values = column if index is None else column[index]
+            order = np.argsort(-values if descending else values, kind='stable')
+            return (order if index is None else index[order]).tolist()
+        if rows is None:
+            rows = range(len(self.records))
+        return sorted(rows, key=column.__getitem__, reverse=descending)
+    
+    def top(self, k: int) -> List[int]:
+        """
+        Rows of the k highest relevance scores, highest first, without sorting
+        every row (np.partition with NumPy, a heap otherwise). Agrees with
+        order('relevance_score', True)[:k], ties included.
+        """
+        n = len(self.records)
+        if k >= n:
+            return self.order('relevance_score', True)
+        if k <= 0:
+            return []
+        scores = self.relevance_score
+        if np is None:
+            return heapq.nlargest(k, range(n), key=scores.__getitem__)
+        negated = -scores
+        kth = np.partition(negated, k - 1)[k - 1]
+        # Every row tied with the k-th score, so ties resolve by row order
+        candidates = np.flatnonzero(negated <= kth)
+        return candidates[np.argsort(negated[candidates], kind='stable')][:k].tolist()
+
+
+class AppColumnTable:
+    """
+    Mutable columnar table of the current apps, updated in place per cycle.
+    
+    - set()/remove() touch one row; a removed row is filled with the last
+      one, so the columns stay dense
+    - snapshot() scores the rows written since the previous snapshot in one
+      batch and returns an AppColumns copy (array copies, no per-row work)
+    
+    Usage:
+        table = AppColumnTable()
+        table.set(record); table.remove("old-app")
+        columns = table.snapshot(calculate_relevance_scores)
+    """
+    
+    def __init__(self, capacity: int = 256):
+        """
+        Args:
+            capacity: Initial rows allocated per column (NumPy only; grows by doubling)
+        """
+        self._rows = {}      # name -> row
+        self._records = []
+        self._dirty = set()  # rows written since the last snapshot
+        if np is not None:
+            self._columns = {field: np.zeros(capacity, dtype=DTYPES[field]) for field in COLUMNS}
+        else:
+            self._columns = {field: [] for field in COLUMNS}
+    
+    def __len__(self) -> int:
+        return len(self._records)
+    
+    def _grow(self) -> None:
+        for field, column in self._columns.items():
+            grown = np.zeros(max(len(column) * 2, 16), dtype=column.dtype)
+            grown[:len(column)] = column
+            self._columns[field] = grown
+    
+    def set(self, record) -> None:
+        """Insert or replace the row of an app (scored at the next snapshot)."""
+        row = self._rows.get(record.name)
+        columns = self._columns
+        if row is None:
+            row = self._rows[record.name] = len(self._records)
+            self._records.append(record)
+            if np is None:
+                for column in columns.values():
+                    column.append(0)
+            elif row >= len(columns['pid']):
+                self._grow()
+        else:
+            self._records[row] = record
+        for field in COLUMNS[:-1]:
+            columns[field][row] = getattr(record, field)
+        self._dirty.add(row)
+    
+    def remove(self, name: str) -> None:
+        """Delete the row of an app, moving the last row into its place."""
+        row = self._rows.pop(name, None)
+        if row is None:
+            return
+        last = len(self._records) - 1
+        if row != last:
+            moved = self._records[row] = self._records[last]
+            self._rows[moved.name] = row
+            for column in self._columns.values():
+                column[row] = column[last]
+            if last in self._dirty:
+                self._dirty.add(row)
+            else:
+                self._dirty.discard(row)
+        self._dirty.discard(last)
+        self._records.pop()
+        if np is None:
+            for column in self._columns.values():
+                column.pop()
+    
+    def snapshot(self, score_fn: ScoreFn) -> AppColumns:
+        """
+        Score the rows written since the last snapshot and copy the table.
+        
+        Args:
+            score_fn: Batch scorer, e.g. backend.scoring.calculate_relevance_scores
+        """
+        dirty, self._dirty = sorted(self._dirty), set()
+        _score_rows(self._records, self._columns, dirty, score_fn)
+        n = len(self._records)
+        return AppColumns(list(self._records), **{field: column[:n].copy()
+                                                  for field, column in self._columns.items()})
@@ -0,0 +1,211 @@
+"""
+Connection counting for System Pulse.
+Maps sockets to PIDs and counts incoming (LISTEN) and outgoing
+(ESTABLISHED with a remote address) connections per process.
+
+ProcNetConnectionIndex reads /proc/net/tcp{,6} once per cycle and keeps an
+incrementally refreshed socket inode -> PID index, so file descriptors are
+only re-read for new processes instead of for every process every cycle.
+PsutilConnectionCounter is the portable fallback using psutil.net_connections.
+"""
+import os
+import time
+from typing import Dict, Iterable, Set, Tuple
+
+import psutil
+
+# TCP states as encoded in /proc/net/tcp (include/net/tcp_states.h)
+TCP_ESTABLISHED = '01'
+TCP_LISTEN = '0A'
+
+ConnectionCounts = Dict[int, Tuple[int, int]]  # pid -> (incoming, outgoing)
+
+
+class PsutilConnectionCounter:
+    """Count connections per PID with psutil.net_connections (portable)."""
+    
+    name = 'psutil'
+    
+    def count(self, pids: Iterable[int]) -> ConnectionCounts:
+        """
+        Args:
+            pids: PIDs seen in this collection cycle (unused; psutil walks all)
+        
+        Returns:
+            dict: pid -> (incoming, outgoing)
+        """
+        try:
+            connections = psutil.net_connections(kind='inet')
+        except (psutil.AccessDenied, OSError):
+            return {}
+        
+        counts = {}
+        for conn in connections:
+            if not conn.pid:
+                continue
+            if conn.status == 'LISTEN':
+                incoming, outgoing = counts.get(conn.pid, (0, 0))
+                counts[conn.pid] = (incoming + 1, outgoing)
+            elif conn.status == 'ESTABLISHED' and conn.raddr:
+                incoming, outgoing = counts.get(conn.pid, (0, 0))
+                counts[conn.pid] = (incoming, outgoing + 1)
+        return counts
+
+
+class ProcNetConnectionIndex:
+    """
+    Count connections per PID from /proc/net with an incremental inode index.
+    
+    Each cycle:
+    - /proc/net/tcp and tcp6 are parsed once into {inode: (incoming, outgoing)}
+    - fds of new PIDs are scanned for socket inodes; exited PIDs are dropped
+    - if sockets remain unattributed, survivors that already own sockets are
+      rescanned, and all survivors at most every full_rescan_interval seconds
+      (unreadable processes of other users would otherwise force a rescan
+      every cycle)
+    
+    UDP sockets are not parsed: they have no LISTEN/ESTABLISHED state, so they
+    never counted towards incoming/outgoing.
+    """
+    
+    name = 'procfs'
+    
+    def __init__(self, procfs_path: str = '/proc', kinds: Tuple[str, ...] = ('tcp', 'tcp6'),
+                 full_rescan_interval: float = 5.0):
+        self.procfs_path = procfs_path
+        self.kinds = kinds
+        self.full_rescan_interval = full_rescan_interval
+        self._pid_inodes: Dict[int, Set[int]] = {}
+        self._inode_to_pid: Dict[int, int] = {}
+        self._last_full_rescan = 0.0
+        self._stats = {'fd_scans': 0, 'full_rescans': 0}
+    
+    @staticmethod
+    def is_supported(procfs_path: str = '/proc') -> bool:
+        """Check that /proc/net/tcp is readable."""
+        return os.access(os.path.join(procfs_path, 'net', 'tcp'), os.R_OK)
+    
+    def parse_sockets(self) -> Dict[int, Tuple[int, int]]:
+        """
+        Parse /proc/net tables into per-socket contributions.
+        
+        Returns:
+            dict: inode -> (incoming, outgoing), only for counted sockets
+        """
+        sockets = {}
+        for kind in self.kinds:
+            try:
+                with open(os.path.join(self.procfs_path, 'net', kind), 'rb') as f:
+                    next(f, None)  # Header line
+                    for line in f:
+                        fields = line.split()
+                        if len(fields) < 10:
+                            continue
+                        inode = int(fields[9])
+                        if not inode:
+                            continue  # Orphaned socket, owned by no process
+                        state = fields[3].decode()
+                        if state == TCP_LISTEN:
+                            sockets[inode] = (1, 0)
+                        elif state == TCP_ESTABLISHED and not fields[2].endswith(b':0000'):
+                            sockets[inode] = (0, 1)
+            except OSError:
+                continue
+        return sockets
+    
+    def _scan_pid(self, pid: int) -> None:
+        """Re-read the socket inodes held by one process."""
+        self._stats['fd_scans'] += 1
+        old = self._pid_inodes.get(pid)
+        if old:
+            for inode in old:
+                if self._inode_to_pid.get(inode) == pid:
+                    del self._inode_to_pid[inode]
+        
+        inodes = set()
+        try:
+            with os.scandir(f"{self.procfs_path}/{pid}/fd") as entries:
+                for entry in entries:
+                    try:
+                        target = os.readlink(entry.path)
+                    except OSError:
+                        continue
+                    if target.startswith('socket:['):
+                        inodes.add(int(target[8:-1]))
+        except OSError:
+            pass  # Exited or not readable (other user's process)
+        
+        self._pid_inodes[pid] = inodes
+        for inode in inodes:
+            self._inode_to_pid[inode] = pid
+    
+    def forget(self, pid: int) -> None:
+        """Drop a PID (exited, or reused by a new process) from the index."""
+        for inode in self._pid_inodes.pop(pid, ()):
+            if self._inode_to_pid.get(inode) == pid:
+                del self._inode_to_pid[inode]
+    
+    def count(self, pids: Iterable[int]) -> ConnectionCounts:
+        """
+        Refresh the index for this cycle's PIDs and count their connections.
+        
+        Args:
+            pids: PIDs seen in this collection cycle
+        
+        Returns:
+            dict: pid -> (incoming, outgoing)
+        """
+        live = set(pids)
+        for pid in [p for p in self._pid_inodes if p not in live]:
+            self.forget(pid)
+        new_pids = [pid for pid in live if pid not in self._pid_inodes]
+        for pid in new_pids:
+            self._scan_pid(pid)
+        
+        sockets = self.parse_sockets()
+        if any(inode not in self._inode_to_pid for inode in sockets):
+            now = time.monotonic()
+            if now - self._last_full_rescan >= self.full_rescan_interval:
+                self._last_full_rescan = now
+                self._stats['full_rescans'] += 1
+                rescan = live
+            else:
+                rescan = [pid for pid, inodes in self._pid_inodes.items() if inodes]
+            scanned = set(new_pids)
+            for pid in rescan:
+                if pid not in scanned:
+                    self._scan_pid(pid)
+        
+        counts = {}
+        inode_to_pid = self._inode_to_pid
+        for inode, (incoming, outgoing) in sockets.items():
+            pid = inode_to_pid.get(inode)
+            if pid is None:
+                continue
+            prev_in, prev_out = counts.get(pid, (0, 0))
+            counts[pid] = (prev_in + incoming, prev_out + outgoing)
+        return counts
+    
+    def get_stats(self) -> dict:
+        """Get index statistics for monitoring."""
+        return {
+            'indexed_pids': len(self._pid_inodes),
+            'indexed_sockets': len(self._inode_to_pid),
+            'fd_scans': self._stats['fd_scans'],
+            'full_rescans': self._stats['full_rescans']
+        }
+
+
+def get_connection_counter(kind: str = 'auto'):
+    """
+    Create a connection counter.
+    
+    Args:
+        kind: 'procfs', 'psutil', or 'auto' (procfs when /proc/net is readable)
+    
+    Returns:
+        Counter with a count(pids) method; psutil is the fallback
+    """
+    if kind in ('auto', 'procfs') and ProcNetConnectionIndex.is_supported():
+        return ProcNetConnectionIndex()
+    return PsutilConnectionCounter()
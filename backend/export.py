@@ -0,0 +1,81 @@
+"""
+Streaming exports for System Pulse.
+Rows are encoded as NDJSON or CSV in bounded chunks while they are produced,
+optionally gzip-compressed on the fly, so an export of any size is never
+materialized as a whole on the server.
+"""
+import csv
+import io
+import json
+import zlib
+from typing import Iterable, Iterator, Sequence
+
+# format -> media type of the (uncompressed) export
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8'
+}
+
+# Encoded bytes buffered before a chunk is handed to the response
+CHUNK_SIZE = 64 * 1024
+
+
+def encode_rows(rows: Iterable[Sequence], fields: Sequence[str], fmt: str,
+                chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Encode rows lazily as NDJSON (one object per line) or CSV (with a header).
+    
+    Args:
+        rows: Iterable of value tuples in `fields` order (consumed lazily)
+        fields: Column names
+        fmt: 'ndjson' or 'csv'
+        chunk_size: Approximate size of the yielded chunks in bytes
+    
+    Returns:
+        Iterator of encoded chunks
+    
+    Raises:
+        ValueError: Unknown format (raised here, not while streaming)
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}, expected one of {', '.join(EXPORT_FORMATS)}")
+    return _encode(rows, tuple(fields), fmt, chunk_size)
+
+
+def _encode(rows: Iterable[Sequence], fields: tuple, fmt: str, chunk_size: int) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    if fmt == 'csv':
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow(fields)
+        write = writer.writerow
+    else:
+        dumps = json.JSONEncoder(separators=(',', ':')).encode
+        
+        def write(row):
+            buffer.write(dumps(dict(zip(fields, row))))
+            buffer.write('\n')
+    
+    for row in rows:
+        write(row)
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """
+    Compress a chunk stream into one gzip member as it is consumed.
+    
+    Args:
+        chunks: Iterable of bytes
+        level: zlib compression level (1 = fastest, 9 = smallest)
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 16 + 15: gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
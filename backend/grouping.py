@@ -0,0 +1,249 @@
+"""
+Process grouping engine for System Pulse.
+Aggregates live processes into groups other than "same name":
+
+- tree: a process and all its descendants (rooted below init, a session
+  manager or a shell), so helpers with other names join their app and
+  unrelated processes that share a name stay apart
+- unit: the systemd unit (service or scope) of the process's cgroup
+- container: the Docker/Podman/containerd container of the cgroup, or "host"
+
+unit and container read /proc/<pid>/cgroup (Linux, cgroup v2 or v1) once
+per process; elsewhere every process falls into one default group.
+"""
+import os
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+from .records import AppRecord
+
+ProcessKey = Tuple[int, float]  # (pid, create_time)
+
+GROUP_MODES = ('name', 'tree', 'unit', 'container')
+
+# Children of these processes start a tree of their own
+ROOT_PARENT_NAMES = frozenset({
+    'systemd', 'init', 'launchd', 'kthreadd', 'wininit.exe', 'services.exe',
+    'explorer.exe', 'svchost.exe', 'sshd', 'login', 'gnome-shell', 'plasmashell',
+    'kwin_x11', 'kwin_wayland', 'xfce4-session', 'sh', 'bash', 'zsh', 'fish',
+    'dash', 'tmux: server', 'screen', 'cmd.exe', 'powershell.exe', 'pwsh',
+    'containerd-shim', 'containerd-shim-runc-v2', 'conmon'
+})
+
+# Seconds a mode keeps being computed after the last request for it
+DEMAND_SECONDS = 60.0
+
+
+class GroupingNotReady(Exception):
+    """A requested grouping was not ranked by the sampler in time."""
+    pass
+
+_UNIT = re.compile(r'[^/]+\.(?:service|scope)$')
+_CONTAINER = re.compile(r'(?:docker|libpod|cri-containerd|crio)-([0-9a-f]{12,64})\.scope'
+                        r'|/docker/([0-9a-f]{12,64})'
+                        r'|/kubepods[^/]*/.*?([0-9a-f]{64})')
+
+
+def parse_cgroup(data: str) -> str:
+    """
+    cgroup path of a process from /proc/<pid>/cgroup contents.
+    The unified (v2) hierarchy "0::/path" wins; otherwise the first v1 line.
+    """
+    fallback = ''
+    for line in data.splitlines():
+        parts = line.split(':', 2)
+        if len(parts) != 3:
+            continue
+        if parts[0] == '0' and parts[1] == '':
+            return parts[2]
+        if not fallback:
+            fallback = parts[2]
+    return fallback
+
+
+def unit_of(cgroup: str) -> str:
+    """Innermost systemd service/scope of a cgroup path, or the path itself."""
+    for part in reversed(cgroup.split('/')):
+        if _UNIT.match(part):
+            return part
+    return cgroup or 'unknown'
+
+
+def container_id(cgroup: str) -> Optional[str]:
+    """Full container id in a cgroup path (Docker, Podman, containerd, CRI-O), or None."""
+    match = _CONTAINER.search(cgroup)
+    if match is None:
+        return None
+    return next(group for group in match.groups() if group)
+
+
+def container_of(cgroup: str) -> str:
+    """Short container id of a cgroup path, or "host"."""
+    full_id = container_id(cgroup)
+    return 'container:' + full_id[:12] if full_id else 'host'
+
+
+class ProcessGrouper:
+    """
+    Incremental grouping of the process table's live processes.
+    
+    - registered as a process table listener: cgroup labels are read lazily
+      (only when unit/container grouping is in use) and cached per
+      (pid, create_time) until the process exits
+    - tree roots are resolved with a memo, so each process is walked once
+      per cycle, and every group is summed in the same single pass
+    - unchanged groups keep their previous AppRecord (and relevance score)
+    - only modes requested within DEMAND_SECONDS are computed
+    
+    Usage:
+        grouper = ProcessGrouper(logo_fn)
+        table = IncrementalProcessTable(logo_fn, process_listeners=[grouper])
+        grouper.request('tree')                       # from a request handler
+        for mode in grouper.wanted_modes():           # on the sampler thread
+            groups = grouper.group(mode, table.processes(), collector.ppids)
+    """
+    
+    def __init__(self, logo_fn: Callable[[str], str], procfs_path: str = '/proc'):
+        """
+        Args:
+            logo_fn: Returns the logo path for a process name
+            procfs_path: Location of procfs (cgroup labels are skipped without it)
+        """
+        self.logo_fn = logo_fn
+        self.procfs_path = procfs_path
+        self._has_cgroups = os.path.exists(os.path.join(procfs_path, 'self', 'cgroup'))
+        self._cgroups: Dict[ProcessKey, str] = {}
+        self._demand: Dict[str, float] = {}
+        self._previous: Dict[str, Dict[str, AppRecord]] = {}
+        self._lock = threading.Lock()
+        self._stats = {'cgroup_reads': 0, 'groupings': 0, 'last_grouping_ms': 0.0}
+    
+    def add(self, key: ProcessKey, name: str) -> None:
+        """Process table listener: labels are read on first use."""
+    
+    def remove(self, key: ProcessKey) -> None:
+        """Process table listener: forget an exited process."""
+        self._cgroups.pop(key, None)
+    
+    def request(self, mode: str) -> None:
+        """Record that a client wants a grouping (keeps it computed for a while)."""
+        if mode not in GROUP_MODES:
+            raise ValueError(f"Unknown group_by {mode!r}; expected one of {', '.join(GROUP_MODES)}")
+        with self._lock:
+            self._demand[mode] = time.monotonic()
+    
+    def wanted_modes(self) -> List[str]:
+        """Modes other than 'name' requested within DEMAND_SECONDS."""
+        now = time.monotonic()
+        with self._lock:
+            return [mode for mode, at in self._demand.items()
+                    if mode != 'name' and now - at <= DEMAND_SECONDS]
+    
+    def _cgroup(self, key: ProcessKey) -> str:
+        cgroup = self._cgroups.get(key)
+        if cgroup is None:
+            cgroup = ''
+            if self._has_cgroups:
+                try:
+                    with open(f"{self.procfs_path}/{key[0]}/cgroup") as f:
+                        cgroup = parse_cgroup(f.read())
+                except OSError:
+                    pass
+                self._stats['cgroup_reads'] += 1
+            self._cgroups[key] = cgroup
+        return cgroup
+    
+    def tree_roots(self, by_pid: Mapping[int, object], ppids: Mapping[int, int]) -> Dict[int, int]:
+        """
+        Root PID of every process's tree, each process walked once.
+        
+        Args:
+            by_pid: pid -> ProcessEntry (anything with a name)
+            ppids: pid -> parent pid
+        """
+        roots: Dict[int, int] = {}
+        for pid in by_pid:
+            path = []
+            node = pid
+            while node not in roots:
+                path.append(node)
+                parent = ppids.get(node, 0)
+                parent_entry = by_pid.get(parent)
+                if (parent <= 2 or parent_entry is None or parent in path or
+                        parent_entry.name.lower() in ROOT_PARENT_NAMES):
+                    roots[node] = node
+                    break
+                node = parent
+            root = roots[node]
+            for visited in path:
+                roots[visited] = root
+        return roots
+    
+    def group(self, mode: str, processes: Mapping[ProcessKey, object],
+              ppids: Mapping[int, int]) -> Dict[str, AppRecord]:
+        """
+        Aggregate processes by a grouping mode (call on the sampler thread).
+        
+        Args:
+            mode: 'tree', 'unit' or 'container'
+            processes: (pid, create_time) -> ProcessEntry of live processes
+            ppids: pid -> parent pid from the last collection
+        
+        Returns:
+            dict: group label -> AppRecord with summed counters; pid is the
+            tree root (tree) or the lowest member PID
+        """
+        started = time.perf_counter()
+        if mode == 'tree':
+            by_pid = {key[0]: entry for key, entry in processes.items()}
+            roots = self.tree_roots(by_pid, ppids)
+            label_of = lambda key, entry: roots[key[0]]
+        elif mode == 'unit':
+            label_of = lambda key, entry: unit_of(self._cgroup(key))
+        elif mode == 'container':
+            label_of = lambda key, entry: container_of(self._cgroup(key))
+        else:
+            raise ValueError(f"Cannot group by {mode!r} here")
+        
+        # One pass: [pid, name, incoming, outgoing, cpu, memory] per group
+        sums: Dict[object, list] = {}
+        for key, entry in processes.items():
+            label = label_of(key, entry)
+            total = sums.get(label)
+            if total is None:
+                sums[label] = [entry.pid, entry.name, entry.incoming, entry.outgoing,
+                               entry.cpu, entry.memory]
+                continue
+            if entry.pid < total[0]:
+                total[0], total[1] = entry.pid, entry.name
+            total[2] += entry.incoming
+            total[3] += entry.outgoing
+            total[4] += entry.cpu
+            total[5] += entry.memory
+        
+        previous = self._previous.get(mode, {})
+        groups = {}
+        for label, (pid, name, incoming, outgoing, cpu, memory) in sums.items():
+            if mode == 'tree':
+                pid, name = label, by_pid[label].name
+                label = f"{name} ({pid})"
+            app = previous.get(label)
+            if (app is None or app.pid != pid or app.incoming != incoming or
+                    app.outgoing != outgoing or app.cpu != cpu or app.memory != memory):
+                app = AppRecord(label, pid, app.logo if app is not None else self.logo_fn(name),
+                                incoming, outgoing, cpu, memory)
+            groups[label] = app
+        self._previous[mode] = groups
+        
+        self._stats['groupings'] += 1
+        self._stats['last_grouping_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        return groups
+    
+    def get_stats(self) -> dict:
+        """Get grouping statistics for monitoring."""
+        stats = dict(self._stats)
+        stats['cached_cgroups'] = len(self._cgroups)
+        stats['active_modes'] = self.wanted_modes()
+        return stats
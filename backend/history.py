@@ -0,0 +1,489 @@
+"""
+In-memory metric history for System Pulse.
+Per-app metrics are kept in rollup tiers of increasing resolution (by default
+1s, 10s, 1m and 1h), each a fixed-size ring buffer, so a query over a day
+reads minute or hour buckets instead of per-second data.
+
+- The finest tier stores the raw value of each slot
+- Coarser tiers store min / max / avg / p95 per bucket. A bucket is
+  accumulated while it is open (exact min/max/avg, p95 from a mergeable
+  sketch) and, once closed, merged into the open bucket of the next tier
+
+Memory is bounded up front: every tracked app owns preallocated float32
+arrays for every tier, and at most `max_apps` apps are tracked.
+"""
+import math
+import threading
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+METRICS = ('cpu', 'memory', 'incoming', 'outgoing')
+STATS = ('min', 'max', 'avg', 'p95')
+
+# Connection counts share the float32 buffers but are whole numbers: reported
+# as ints except for averages
+COUNT_METRICS = frozenset({'incoming', 'outgoing'})
+
+# (resolution, retention) in seconds: 1s for 10 min, 10s for 2 h, 1m for 12 h, 1h for 7 days
+DEFAULT_TIERS = ((1, 600), (10, 7200), (60, 43200), (3600, 604800))
+
+NAN = float('nan')
+
+
+def parse_tiers(spec: str) -> Tuple[Tuple[float, float], ...]:
+    """
+    Parse a tier list like "1:600,10:7200,60:43200,3600:604800".
+    
+    Args:
+        spec: Comma-separated resolution:retention pairs in seconds
+    
+    Returns:
+        tuple of (resolution, retention) pairs
+    """
+    tiers = []
+    for part in spec.split(','):
+        resolution, retention = part.split(':')
+        tiers.append((float(resolution), float(retention)))
+    return tuple(tiers)
+
+
+class QuantileSketch:
+    """
+    Mergeable streaming quantile sketch with relative accuracy (DDSketch-style).
+    Positive values are counted in logarithmic buckets of ratio GAMMA, so any
+    quantile is reported within ACCURACY of the true value, and two sketches
+    merge by adding their counts.
+    """
+    
+    ACCURACY = 0.02
+    GAMMA = (1 + ACCURACY) / (1 - ACCURACY)
+    _LOG_GAMMA = math.log(GAMMA)
+    
+    __slots__ = ('bins', 'zeros', 'count')
+    
+    def __init__(self):
+        self.bins: Dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+    
+    def add(self, value: float) -> None:
+        self.count += 1
+        if value <= 0:
+            self.zeros += 1
+            return
+        key = math.ceil(math.log(value) / self._LOG_GAMMA)
+        self.bins[key] = self.bins.get(key, 0) + 1
+    
+    def merge(self, other: 'QuantileSketch') -> None:
+        self.count += other.count
+        self.zeros += other.zeros
+        bins = self.bins
+        for key, count in other.bins.items():
+            bins[key] = bins.get(key, 0) + count
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate q-quantile (0..1), or None if empty."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if rank < seen:
+                return 2 * self.GAMMA ** key / (self.GAMMA + 1)
+        return 2 * self.GAMMA ** max(self.bins) / (self.GAMMA + 1)
+
+
+class Accumulator:
+    """Open rollup bucket of one metric: exact min/max/sum/count plus a p95 sketch."""
+    
+    __slots__ = ('min', 'max', 'total', 'count', 'sketch')
+    
+    def __init__(self):
+        self.min = math.inf
+        self.max = -math.inf
+        self.total = 0.0
+        self.count = 0
+        self.sketch = QuantileSketch()
+    
+    def add(self, value: float) -> None:
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.total += value
+        self.count += 1
+        self.sketch.add(value)
+    
+    def merge(self, other: 'Accumulator') -> None:
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.total += other.total
+        self.count += other.count
+        self.sketch.merge(other.sketch)
+    
+    def p95(self) -> float:
+        # Bucket midpoints can fall slightly outside the observed range
+        return min(max(self.sketch.quantile(0.95), self.min), self.max)
+
+
+class Tier:
+    """One resolution of the history: ring geometry and the newest slot number."""
+    
+    __slots__ = ('resolution', 'slots', 'retention', 'epoch', 'raw')
+    
+    def __init__(self, resolution: float, retention: float, raw: bool):
+        self.resolution = resolution
+        self.slots = max(int(math.ceil(retention / resolution)), 1)
+        self.retention = self.slots * resolution
+        self.epoch: Optional[int] = None  # Slot number (time // resolution) of the newest slot
+        self.raw = raw  # Raw values instead of min/max/avg/p95
+    
+    def position(self, epoch: int) -> int:
+        return epoch % self.slots
+    
+    def keys(self) -> List[Tuple[str, str]]:
+        """(metric, stat) buffer keys of this tier."""
+        stats = ('value',) if self.raw else STATS
+        return [(metric, stat) for metric in METRICS for stat in stats]
+    
+    def window(self, seconds: float) -> range:
+        """Slot numbers of the last `seconds` of readable slots."""
+        newest = self.epoch if self.raw else self.epoch - 1  # The open rollup bucket is not written yet
+        count = min(max(int(math.ceil(seconds / self.resolution)), 1), self.slots)
+        return range(newest - count + 1, newest + 1)
+    
+    def values(self, buffer: array, window: range) -> array:
+        """Values of a window: one array slice, or two when it wraps around."""
+        start = self.position(window.start)
+        end = start + len(window)
+        if end <= self.slots:
+            return buffer[start:end]
+        return buffer[start:] + buffer[:end - self.slots]
+
+
+class AppHistory:
+    """Ring buffers and open rollup buckets of one app."""
+    
+    __slots__ = ('buffers', 'open', 'last_seen')
+    
+    def __init__(self, tiers: Sequence[Tier]):
+        # Per tier: (metric, stat) -> preallocated float32 ring buffer
+        self.buffers = [{key: array('f', [NAN]) * tier.slots for key in tier.keys()} for tier in tiers]
+        # Per tier: metric -> Accumulator of the open bucket, None while empty
+        self.open: List[Optional[Dict[str, Accumulator]]] = [None] * len(tiers)
+        self.last_seen = 0.0
+
+
+def _present(values) -> list:
+    return [v for v in values if v == v]  # Drop gaps (NaN != NaN)
+
+
+class MetricHistory:
+    """
+    Multi-resolution history of per-app metrics.
+    
+    Slot positions are shared by all apps of a tier. When a slot opens, every
+    tracked app gets a gap (NaN) there, which is then filled for the apps
+    present; slots skipped while the sampler stalled stay gaps. In the raw
+    tier the latest sample of a slot wins.
+    
+    Queries pick the coarsest tier whose resolution is still at least as fine
+    as the requested step, among the tiers that retain the requested window.
+    
+    Usage:
+        history = MetricHistory()
+        history.record(time.time(), apps)          # once per collection cycle
+        history.series("chrome", seconds=86400, points=200)
+    """
+    
+    def __init__(self, tiers: Sequence[Tuple[float, float]] = DEFAULT_TIERS, max_apps: int = 500):
+        """
+        Args:
+            tiers: (resolution, retention) pairs in seconds, finest first; each
+                resolution must be a multiple of the previous one
+            max_apps: Maximum number of apps tracked at once
+        """
+        for (fine, _), (coarse, _) in zip(tiers, tiers[1:]):
+            if coarse <= fine or coarse % fine:
+                raise ValueError(f"Tier resolution {coarse}s is not a multiple of {fine}s")
+        self.tiers = [Tier(resolution, retention, raw=(i == 0))
+                      for i, (resolution, retention) in enumerate(tiers)]
+        self.max_apps = max_apps
+        self._apps: Dict[str, AppHistory] = {}
+        self._lock = threading.Lock()
+        self._stats = {'samples': 0, 'buckets_closed': 0, 'apps_evicted': 0, 'apps_dropped': 0}
+    
+    def _make_room(self, timestamp: float) -> bool:
+        """Evict the least recently seen absent app; False if every app is live."""
+        oldest = min(self._apps.items(), key=lambda item: item[1].last_seen, default=None)
+        if oldest is None or oldest[1].last_seen >= timestamp:
+            return False
+        del self._apps[oldest[0]]
+        self._stats['apps_evicted'] += 1
+        return True
+    
+    def _close_bucket(self, index: int) -> None:
+        """Write the open bucket of a rollup tier and merge it into the next tier."""
+        tier = self.tiers[index]
+        position = tier.position(tier.epoch)
+        next_index = index + 1 if index + 1 < len(self.tiers) else None
+        for app in self._apps.values():
+            bucket = app.open[index]
+            if bucket is None:
+                continue  # Absent for the whole bucket: stays a gap
+            buffers = app.buffers[index]
+            for metric, acc in bucket.items():
+                buffers[(metric, 'min')][position] = acc.min
+                buffers[(metric, 'max')][position] = acc.max
+                buffers[(metric, 'avg')][position] = acc.total / acc.count
+                buffers[(metric, 'p95')][position] = acc.p95()
+            if next_index is not None:
+                target = app.open[next_index]
+                if target is None:
+                    app.open[next_index] = bucket
+                else:
+                    for metric, acc in bucket.items():
+                        target[metric].merge(acc)
+            app.open[index] = None
+        self._stats['buckets_closed'] += 1
+    
+    def _open_slots(self, index: int, epoch: int) -> None:
+        """Advance a tier to `epoch`, turning the new (and skipped) slots into gaps."""
+        tier = self.tiers[index]
+        first = epoch - tier.slots + 1 if tier.epoch is None else max(tier.epoch + 1, epoch - tier.slots + 1)
+        positions = [tier.position(e) for e in range(first, epoch + 1)]
+        for app in self._apps.values():
+            for buffer in app.buffers[index].values():
+                for position in positions:
+                    buffer[position] = NAN
+        tier.epoch = epoch
+    
+    def record(self, timestamp: float, apps: Iterable) -> None:
+        """
+        Write one collection cycle.
+        
+        Args:
+            timestamp: Wall-clock time of the sample
+            apps: Objects with name, cpu, memory, incoming and outgoing attributes
+        """
+        epochs = [int(timestamp // tier.resolution) for tier in self.tiers]
+        with self._lock:
+            raw = self.tiers[0]
+            if raw.epoch is not None and epochs[0] < raw.epoch:
+                return  # Clock went backwards; keep the rings consistent
+            new_slot = epochs[0] != raw.epoch
+            
+            # Finest first: a closed bucket must reach the next tier before that one closes
+            for index, tier in enumerate(self.tiers):
+                if epochs[index] == tier.epoch:
+                    continue
+                if not tier.raw and tier.epoch is not None:
+                    self._close_bucket(index)
+                self._open_slots(index, epochs[index])
+            
+            if new_slot:
+                # Forget apps absent for longer than the longest retention
+                horizon = timestamp - self.tiers[-1].retention
+                for name in [n for n, a in self._apps.items() if a.last_seen < horizon]:
+                    del self._apps[name]
+            
+            position = raw.position(epochs[0])
+            rollup = 1 if len(self.tiers) > 1 else None
+            for app in apps:
+                history = self._apps.get(app.name)
+                if history is None:
+                    if len(self._apps) >= self.max_apps and not self._make_room(timestamp):
+                        self._stats['apps_dropped'] += 1
+                        continue
+                    history = self._apps[app.name] = AppHistory(self.tiers)
+                history.last_seen = timestamp
+                
+                values = (app.cpu, app.memory, app.incoming, app.outgoing)
+                buffers = history.buffers[0]
+                for metric, value in zip(METRICS, values):
+                    buffers[(metric, 'value')][position] = value
+                
+                if rollup is not None:
+                    bucket = history.open[rollup]
+                    if bucket is None:
+                        bucket = history.open[rollup] = {metric: Accumulator() for metric in METRICS}
+                    for metric, value in zip(METRICS, values):
+                        bucket[metric].add(value)
+            self._stats['samples'] += 1
+    
+    def pick_tier(self, seconds: float, points: int) -> Tier:
+        """
+        Coarsest tier whose resolution is at most seconds / points, among the
+        tiers retaining `seconds`; the finest retaining tier if none is fine enough.
+        """
+        step = seconds / max(points, 1)
+        covering = [tier for tier in self.tiers if tier.retention >= seconds] or [self.tiers[-1]]
+        fine_enough = [tier for tier in covering if tier.resolution <= step]
+        return fine_enough[-1] if fine_enough else covering[0]
+    
+    def _summarize(self, tier: Tier, buffers: dict, metric: str, window: range) -> Optional[tuple]:
+        """(min, max, avg, p95) of a metric over a window of one tier, or None if all gaps."""
+        if tier.raw:
+            values = sorted(_present(tier.values(buffers[(metric, 'value')], window)))
+            if not values:
+                return None
+            p95 = values[max(int(math.ceil(0.95 * len(values))) - 1, 0)]
+            return values[0], values[-1], sum(values) / len(values), p95
+        
+        averages = _present(tier.values(buffers[(metric, 'avg')], window))
+        if not averages:
+            return None
+        # Combining closed buckets: min/max stay exact, the average weighs buckets
+        # equally and the largest bucket p95 is used as an upper bound
+        return (min(_present(tier.values(buffers[(metric, 'min')], window))),
+                max(_present(tier.values(buffers[(metric, 'max')], window))),
+                sum(averages) / len(averages),
+                max(_present(tier.values(buffers[(metric, 'p95')], window))))
+    
+    def _series(self, name: str, history: AppHistory, tier: Tier, seconds: float, points: int) -> dict:
+        window = tier.window(seconds)
+        step = max(int(math.ceil(len(window) / max(points, 1))), 1)
+        chunks = [range(start, min(start + step, window.stop)) for start in range(window.start, window.stop, step)]
+        
+        result = {
+            "name": name,
+            "resolution_seconds": tier.resolution,
+            "step_seconds": step * tier.resolution,
+            "timestamps": [chunk.start * tier.resolution for chunk in chunks]
+        }
+        buffers = history.buffers[self.tiers.index(tier)]
+        for metric in METRICS:
+            columns = {stat: [] for stat in STATS}
+            whole = [metric in COUNT_METRICS and stat != 'avg' for stat in STATS]
+            for chunk in chunks:
+                summary = self._summarize(tier, buffers, metric, chunk)
+                for i, column in enumerate(columns.values()):
+                    if summary is None:
+                        column.append(None)
+                    else:
+                        column.append(int(round(summary[i])) if whole[i] else round(summary[i], 2))
+            result[metric] = columns
+        return result
+    
+    def series(self, name: str, seconds: float = 600.0, points: int = 120) -> Optional[dict]:
+        """
+        Downsampled history of one app from the most suitable tier.
+        Only the requested window of that tier is read.
+        
+        Args:
+            name: App name
+            seconds: How far back to look (capped at the longest retention)
+            points: Maximum number of points returned
+        
+        Returns:
+            dict with resolution_seconds, step_seconds, timestamps and, per
+            metric, min/max/avg/p95 lists (None where the app was not running),
+            or None if the app is unknown
+        """
+        tier = self.pick_tier(seconds, points)
+        with self._lock:
+            history = self._apps.get(name)
+            if history is None or tier.epoch is None:
+                return None
+            return self._series(name, history, tier, seconds, points)
+    
+    def top(self, metric: str = 'cpu', seconds: float = 300.0, limit: int = 10,
+            points: int = 60) -> List[dict]:
+        """
+        Apps with the highest average of a metric over a window, with their series.
+        
+        Args:
+            metric: One of METRICS
+            seconds: Window to average over (capped at the longest retention)
+            limit: Number of apps returned
+            points: Maximum points per returned series
+        
+        Returns:
+            list of series dicts (see series()) with an added "average"
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric {metric!r}, expected one of {', '.join(METRICS)}")
+        tier = self.pick_tier(seconds, points)
+        with self._lock:
+            if tier.epoch is None:
+                return []
+            index = self.tiers.index(tier)
+            window = tier.window(seconds)
+            key = (metric, 'value' if tier.raw else 'avg')
+            horizon = window.start * tier.resolution
+            averages = []
+            for name, history in self._apps.items():
+                if history.last_seen < horizon:
+                    continue
+                values = _present(tier.values(history.buffers[index][key], window))
+                if values:
+                    averages.append((sum(values) / len(values), name))
+            averages.sort(reverse=True)
+            
+            result = []
+            for mean, name in averages[:limit]:
+                series = self._series(name, self._apps[name], tier, seconds, points)
+                series["average"] = round(mean, 2)
+                result.append(series)
+            return result
+    
+    def export_rows(self, seconds: float = 600.0, names: Optional[Iterable[str]] = None) -> Iterator[tuple]:
+        """
+        Stream the finest tier retaining `seconds` as rows, app by app.
+        Only one app's window is copied at a time (under the lock), so the
+        lock is never held while the consumer encodes or sends rows.
+        
+        Args:
+            seconds: How far back to export (capped at the longest retention)
+            names: Apps to export (None = every tracked app)
+        
+        Yields:
+            tuple: (timestamp, name, cpu, memory, incoming, outgoing), raw
+            values in the finest tier (connection counts as ints) and bucket
+            averages in rollup tiers; slots where the app was not running are
+            skipped
+        """
+        tier = ([t for t in self.tiers if t.retention >= seconds] or [self.tiers[-1]])[0]
+        index = self.tiers.index(tier)
+        stat = 'value' if tier.raw else 'avg'
+        whole = [tier.raw and metric in COUNT_METRICS for metric in METRICS]
+        with self._lock:
+            selected = list(self._apps) if names is None else [n for n in names if n in self._apps]
+        
+        for name in selected:
+            with self._lock:
+                history = self._apps.get(name)
+                if history is None or tier.epoch is None:
+                    continue
+                window = tier.window(seconds)
+                columns = [tier.values(history.buffers[index][(metric, stat)], window)
+                           for metric in METRICS]
+            for offset, epoch in enumerate(window):
+                values = [column[offset] for column in columns]
+                if values[0] != values[0]:
+                    continue  # Gap (NaN)
+                yield (epoch * tier.resolution, name,
+                       *(int(v) if is_count else round(v, 2) for v, is_count in zip(values, whole)))
+    
+    def get_stats(self) -> dict:
+        """Get history statistics for monitoring."""
+        with self._lock:
+            tracked = len(self._apps)
+        itemsize = array('f').itemsize
+        bytes_per_app = sum(tier.slots * len(tier.keys()) * itemsize for tier in self.tiers)
+        return {
+            'tracked_apps': tracked,
+            'max_apps': self.max_apps,
+            'tiers': [{'resolution_seconds': tier.resolution,
+                       'retention_seconds': tier.retention,
+                       'slots': tier.slots} for tier in self.tiers],
+            'approx_bytes': tracked * bytes_per_app,
+            'max_bytes': self.max_apps * bytes_per_app,
+            'samples': self._stats['samples'],
+            'buckets_closed': self._stats['buckets_closed'],
+            'apps_evicted': self._stats['apps_evicted'],
+            'apps_dropped': self._stats['apps_dropped']
+        }
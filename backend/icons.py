@@ -0,0 +1,117 @@
+"""
+Process name -> app icon resolution for System Pulse.
+The app source tables are compiled once into a normalized lookup table, and
+resolutions are memoized per raw process name, so resolving a name costs
+one dict hit after its first sighting.
+"""
+import re
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+# Executable suffixes and release channels stripped while normalizing
+STRIP_SUFFIXES = ('.exe', '.bin', '.appimage', '.sh', '-bin', '-wrapped', '-stable', '-beta',
+                  '-dev', '-esr', '-nightly')
+
+# One trailing version component: python3.11 -> python3 -> python, gcc-12 -> gcc
+VERSION_SUFFIX = re.compile(r'[-_.]?v?\d+$')
+
+# Process names whose app is listed under another executable name (first known target wins)
+DEFAULT_ALIASES: Dict[str, Tuple[str, ...]] = {
+    'chrome': ('google-chrome', 'chrome'),
+    'chromium-browser': ('chromium',),
+    'msedge': ('microsoft-edge', 'msedge'),
+    'microsoft-edge': ('msedge',),
+    'code-oss': ('code',),
+    'codium': ('code',),
+    'nodejs': ('node',),
+    'telegram-desktop': ('telegram',),
+    'mysqld': ('mysql',),
+    'mariadbd': ('mariadb', 'mysql'),
+    'redis': ('redis-server',),
+    'postmaster': ('postgres',),
+    'dockerd': ('docker',),
+    'httpd': ('apache2',),
+    'sshd': ('ssh',),
+    'systemd': ('systemctl',),
+    'pwsh': ('powershell',),
+}
+
+
+def strip_once(name: str) -> str:
+    """Remove one executable suffix, channel suffix or version component (or nothing)."""
+    for suffix in STRIP_SUFFIXES:
+        if name.endswith(suffix) and len(name) > len(suffix):
+            return name[:-len(suffix)]
+    return VERSION_SUFFIX.sub('', name, count=1) or name
+
+
+def normalize(name: str) -> str:
+    """Lowercase, trimmed name without the leading dot of wrapper scripts (.firefox-wrapped)."""
+    return name.strip().lower().lstrip('.')
+
+
+class IconResolver:
+    """
+    Resolve process names to app icons with normalization and aliases.
+    
+    - exact (case-insensitive) names hit first, then the name is stripped one
+      suffix or version component at a time until a known name is found
+    - table keys are normalized the same way, so "chrome.exe" also serves "chrome"
+    - results are memoized per raw name (LRU), so the string work runs once
+      per distinct name
+    
+    Usage:
+        resolver = IconResolver(APP_ICONS)
+        resolver.resolve("python3.11")   # icon of "python3"
+    """
+    
+    def __init__(self, icons: Dict[str, str], aliases: Optional[Dict[str, Tuple[str, ...]]] = None,
+                 default: str = "", memo_size: int = 4096):
+        """
+        Args:
+            icons: Executable name -> icon path (empty paths are ignored)
+            aliases: Process name -> executable names (DEFAULT_ALIASES if None)
+            default: Icon returned for unknown names
+            memo_size: Maximum number of memoized raw names
+        """
+        self.default = default
+        self._table: Dict[str, str] = {}
+        names = [(normalize(key), icon) for key, icon in icons.items() if icon]
+        # Exact names first, so a stripped alias ("python3" -> "python") never
+        # takes the slot of a listed name, whatever the table order
+        for name, icon in names:
+            self._table.setdefault(name, icon)
+        for name, icon in names:
+            self._table.setdefault(strip_once(name), icon)
+        for alias, targets in (DEFAULT_ALIASES if aliases is None else aliases).items():
+            for target in targets:
+                icon = self._table.get(target)
+                if icon is not None:
+                    self._table.setdefault(alias, icon)
+                    break
+        self._unmatched = 0
+        self.resolve = lru_cache(maxsize=memo_size)(self._resolve)
+    
+    def _resolve(self, name: str) -> str:
+        candidate = normalize(name)
+        while candidate:
+            icon = self._table.get(candidate)
+            if icon is not None:
+                return icon
+            stripped = strip_once(candidate)
+            if stripped == candidate:
+                break
+            candidate = stripped
+        self._unmatched += 1
+        return self.default
+    
+    def get_stats(self) -> dict:
+        """Get resolver statistics for monitoring."""
+        info = self.resolve.cache_info()
+        return {
+            'compiled_names': len(self._table),
+            'memo_hits': info.hits,
+            'memo_misses': info.misses,
+            'memo_size': info.currsize,
+            'unmatched_names': self._unmatched
+        }
@@ -0,0 +1,232 @@
+"""
+Incremental process aggregation for System Pulse.
+Keeps a persistent PID table between collection cycles, updates only the
+per-app (per-name) aggregates that changed, and reports them each cycle,
+together with a columnar table of all apps (backend.columnar).
+"""
+from typing import Callable, Dict, Iterable, NamedTuple, Optional, Set, Tuple
+
+from .columnar import AppColumns, AppColumnTable
+from .records import AppRecord
+from .scoring import calculate_relevance_scores
+
+ProcessKey = Tuple[int, float]  # (pid, create_time)
+
+BYTES_PER_MB = 1024 * 1024
+
+
+class ChangeSet(NamedTuple):
+    """
+    App-level changes produced by one collection cycle.
+    
+    Attributes:
+        added: Names of apps that appeared
+        removed: Names of apps that disappeared
+        updated: Names of apps whose values changed
+        births: Number of processes that started
+        exits: Number of processes that exited
+    """
+    added: tuple = ()
+    removed: tuple = ()
+    updated: tuple = ()
+    births: int = 0
+    exits: int = 0
+    
+    def is_empty(self) -> bool:
+        """True if no app was added, removed or updated."""
+        return not (self.added or self.removed or self.updated)
+
+
+class ProcessEntry:
+    """Volatile counters of one live process."""
+    
+    __slots__ = ('pid', 'name', 'cpu', 'memory', 'incoming', 'outgoing')
+    
+    def __init__(self, pid: int, name: str, cpu: float, memory: float,
+                 incoming: int, outgoing: int):
+        self.pid = pid
+        self.name = name
+        self.cpu = cpu
+        self.memory = memory
+        self.incoming = incoming
+        self.outgoing = outgoing
+
+
+class IncrementalProcessTable:
+    """
+    Persistent process table keyed by (pid, create_time).
+    
+    Each update():
+    - births and exits are found by key lookup / set difference
+    - survivors only have their volatile counters compared and refreshed
+    - only apps whose members changed are re-aggregated; every other app keeps
+      its previously published AppRecord, so published records are never
+      mutated and can be shared by consecutive snapshots
+    - the changed apps' rows of a columnar app table are rewritten and scored
+      in one batch, and each cycle publishes a copy of it (columns)
+    
+    Optional process listeners (e.g. backend.autocomplete.ProcessPrefixIndex)
+    are told about every process joining or leaving an app, so they are
+    maintained from births, exits and renames only.
+    
+    Usage:
+        table = IncrementalProcessTable(logo_fn=lambda name: APP_ICONS.get(name.lower(), ""))
+        changes = table.update(rows, connection_counts)
+        apps = table.apps  # {name: AppRecord}
+        ranking = RankedIndex(table.columns)
+    """
+    
+    def __init__(self, logo_fn: Callable[[str], str], process_listeners: Iterable = ()):
+        """
+        Args:
+            logo_fn: Returns the logo path for an app name
+            process_listeners: Objects with add(key, name) and remove(key)
+        """
+        self.logo_fn = logo_fn
+        self.process_listeners = tuple(process_listeners)
+        self._procs: Dict[ProcessKey, ProcessEntry] = {}
+        self._pids: Dict[int, ProcessKey] = {}
+        self._members: Dict[str, Set[ProcessKey]] = {}
+        self._apps: Dict[str, AppRecord] = {}
+        self._table = AppColumnTable()
+        self._columns = self._table.snapshot(calculate_relevance_scores)
+    
+    @property
+    def apps(self) -> Dict[str, AppRecord]:
+        """Current per-app aggregates ({name: AppRecord}); treat as read-only."""
+        return self._apps
+    
+    @property
+    def columns(self) -> AppColumns:
+        """Columnar table of the current apps, scored (a copy: stays valid after the next cycle)."""
+        return self._columns
+    
+    def __len__(self) -> int:
+        return len(self._procs)
+    
+    def processes(self) -> Dict[ProcessKey, ProcessEntry]:
+        """Live processes ({key: ProcessEntry}); read-only, only valid on the updating thread."""
+        return self._procs
+    
+    def lookup(self, pid: int) -> Optional[Tuple[ProcessKey, ProcessEntry]]:
+        """
+        Live process with this PID as of the last update.
+        
+        Returns:
+            tuple: (key, ProcessEntry), or None if the PID was not seen
+        """
+        key = self._pids.get(pid)
+        if key is None:
+            return None
+        entry = self._procs.get(key)
+        return (key, entry) if entry is not None else None
+    
+    def _join(self, key: ProcessKey, name: str, dirty: Set[str]) -> None:
+        self._members.setdefault(name, set()).add(key)
+        dirty.add(name)
+        for listener in self.process_listeners:
+            listener.add(key, name)
+    
+    def _leave(self, key: ProcessKey, name: str, dirty: Set[str]) -> None:
+        members = self._members.get(name)
+        if members is not None:
+            members.discard(key)
+        dirty.add(name)
+        for listener in self.process_listeners:
+            listener.remove(key)
+    
+    def update(self, rows: Iterable[tuple], connection_counts: Dict[int, Tuple[int, int]]) -> ChangeSet:
+        """
+        Apply one collection cycle.
+        
+        Args:
+            rows: Collector rows (pid, create_time, name, cpu_percent, rss_bytes)
+            connection_counts: pid -> (incoming, outgoing)
+        
+        Returns:
+            ChangeSet describing which apps were added, removed or updated
+            (the new columnar table is then in `columns`)
+        """
+        procs = self._procs
+        seen = set()
+        dirty = set()
+        births = 0
+        
+        for pid, create_time, name, cpu, rss in rows:
+            key = (pid, create_time)
+            seen.add(key)
+            memory = rss / BYTES_PER_MB
+            incoming, outgoing = connection_counts.get(pid, (0, 0))
+            
+            entry = procs.get(key)
+            if entry is None:
+                procs[key] = ProcessEntry(pid, name, cpu, memory, incoming, outgoing)
+                self._pids[pid] = key
+                self._join(key, name, dirty)
+                births += 1
+                continue
+            
+            if entry.name != name:
+                # exec() changed the process name: move it to the other app
+                self._leave(key, entry.name, dirty)
+                entry.name = name
+                self._join(key, name, dirty)
+            elif (entry.cpu != cpu or entry.memory != memory or
+                  entry.incoming != incoming or entry.outgoing != outgoing):
+                dirty.add(name)
+            else:
+                continue
+            entry.cpu = cpu
+            entry.memory = memory
+            entry.incoming = incoming
+            entry.outgoing = outgoing
+        
+        exited = procs.keys() - seen
+        for key in exited:
+            self._leave(key, procs.pop(key).name, dirty)
+            if self._pids.get(key[0]) == key:
+                del self._pids[key[0]]
+        
+        changes = self._reaggregate(dirty, births, len(exited))
+        self._columns = self._table.snapshot(calculate_relevance_scores)
+        return changes
+    
+    def _reaggregate(self, dirty: Set[str], births: int, exits: int) -> ChangeSet:
+        """Recompute totals of changed apps, replacing (never mutating) their records."""
+        added, removed, updated = [], [], []
+        procs = self._procs
+        
+        for name in dirty:
+            members = self._members.get(name)
+            previous = self._apps.get(name)
+            if not members:
+                self._members.pop(name, None)
+                if previous is not None:
+                    del self._apps[name]
+                    self._table.remove(name)
+                    removed.append(name)
+                continue
+            
+            # Summing members (instead of applying deltas) avoids float drift
+            entries = [procs[key] for key in members]
+            app = AppRecord(
+                name,
+                min(e.pid for e in entries),
+                previous.logo if previous is not None else self.logo_fn(name),
+                sum(e.incoming for e in entries),
+                sum(e.outgoing for e in entries),
+                sum(e.cpu for e in entries),
+                sum(e.memory for e in entries)
+            )
+            if previous is None:
+                added.append(name)
+            elif (app.pid != previous.pid or app.incoming != previous.incoming or
+                  app.outgoing != previous.outgoing or app.cpu != previous.cpu or
+                  app.memory != previous.memory):
+                updated.append(name)
+            else:
+                continue
+            self._apps[name] = app
+            self._table.set(app)
+        
+        return ChangeSet(tuple(added), tuple(removed), tuple(updated), births, exits)
@@ -0,0 +1,202 @@
+"""
+Per-process detail cache for System Pulse.
+Keeps one psutil.Process per live process and caches each detail field for
+as long as it can change: static fields (name, exe, cmdline, create time,
+parent) for the lifetime of the process, volatile ones for a short TTL.
+Entries are dropped when the process table reports the process gone.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+import psutil
+
+from .timeout import deadline_expired
+
+ProcessKey = Tuple[int, float]  # (pid, create_time) as defined by the collector
+
+BYTES_PER_MB = 1024 * 1024
+
+# Read once per process: they cannot change without an exec (which renames
+# the process, so the table reports it and the entry is dropped)
+STATIC_FIELDS = ('name', 'exe', 'cmdline', 'create_time', 'ppid')
+
+# Seconds each volatile field is reused; connections and open files walk
+# /proc/<pid>/fd and are the expensive ones
+DEFAULT_TTLS = {
+    'status': 1.0,
+    'rss': 1.0,
+    'num_threads': 2.0,
+    'num_connections': 5.0,
+    'open_files': 5.0
+}
+
+_FETCHERS: Dict[str, Callable[[psutil.Process], object]] = {
+    'name': lambda proc: proc.name(),
+    'exe': lambda proc: proc.exe(),
+    'cmdline': lambda proc: ' '.join(proc.cmdline()),
+    'create_time': lambda proc: proc.create_time(),
+    'ppid': lambda proc: proc.ppid(),
+    'status': lambda proc: proc.status(),
+    'rss': lambda proc: proc.memory_info().rss,
+    'num_threads': lambda proc: proc.num_threads(),
+    'num_connections': lambda proc: len(proc.net_connections(kind='inet')),
+    'open_files': lambda proc: len(proc.open_files())
+}
+
+# Value reported when a field is not readable (e.g. another user's process)
+_DENIED = {'name': '', 'exe': '', 'cmdline': '', 'create_time': None, 'ppid': 0,
+           'status': 'unknown', 'rss': 0, 'num_threads': 0, 'num_connections': 0,
+           'open_files': 0}
+
+
+class DetailEntry:
+    """Cached fields of one process."""
+    
+    __slots__ = ('proc', 'values', 'fetched_at')
+    
+    def __init__(self, proc: psutil.Process):
+        self.proc = proc
+        self.values: Dict[str, object] = {}
+        self.fetched_at: Dict[str, float] = {}
+
+
+class ProcessDetailCache:
+    """
+    Lazily populated detail cache keyed by (pid, create_time).
+    
+    - get() only reads fields that are missing or past their TTL, all inside
+      one psutil oneshot() block; a repeated view of a process usually reads
+      nothing at all (peek() answers it without touching /proc)
+    - CPU percent is not measured here: the caller passes the value the
+      background sampler computed on its last tick
+    - remove(key) is called by IncrementalProcessTable when the process exits
+      or is renamed by exec(), so stale entries never outlive their process
+    
+    Usage:
+        details = ProcessDetailCache()
+        table = IncrementalProcessTable(logo_fn, process_listeners=[details])
+        info = details.get(key, pid)
+    """
+    
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, max_entries: int = 256):
+        """
+        Args:
+            ttls: Seconds per volatile field (defaults to DEFAULT_TTLS)
+            max_entries: Processes kept (least recently viewed evicted first)
+        """
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[ProcessKey, DetailEntry]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._total_memory: Optional[int] = None
+        # Bumped by every remove(), so get() can tell that an exit was
+        # reported while it was reading /proc
+        self._removals = 0
+        self._stats = {'hits': 0, 'partial_hits': 0, 'misses': 0, 'field_reads': 0, 'invalidations': 0,
+                       'stale_on_deadline': 0}
+    
+    def add(self, key: ProcessKey, name: str) -> None:
+        """Process table listener: nothing to do until the process is viewed."""
+    
+    def remove(self, key: ProcessKey) -> None:
+        """Process table listener: drop the entry of an exited/renamed process."""
+        with self._lock:
+            self._removals += 1
+            if self._entries.pop(key, None) is not None:
+                self._stats['invalidations'] += 1
+    
+    def _stale_fields(self, entry: DetailEntry, now: float):
+        stale = [field for field in STATIC_FIELDS if field not in entry.values]
+        for field, ttl in self.ttls.items():
+            fetched_at = entry.fetched_at.get(field)
+            if fetched_at is None or now - fetched_at > ttl:
+                stale.append(field)
+        return stale
+    
+    def peek(self, key: ProcessKey) -> Optional[Dict[str, object]]:
+        """Cached fields if none of them is stale, without any system call."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._stale_fields(entry, time.time()):
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return dict(entry.values)
+    
+    def get(self, key: Optional[ProcessKey], pid: int) -> Dict[str, object]:
+        """
+        Detail fields of a process, reading only what is missing or stale.
+        Blocking (reads /proc): call from a worker thread.
+        
+        Args:
+            key: Process table key, or None to read without caching
+            pid: Process ID
+        
+        Returns:
+            dict of STATIC_FIELDS and the volatile fields
+        
+        Raises:
+            psutil.NoSuchProcess: The process is gone (its entry is dropped)
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key) if key is not None else None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                stale = self._stale_fields(entry, now)
+                self._stats['hits' if not stale else 'partial_hits'] += 1
+            else:
+                self._stats['misses'] += 1
+            removals = self._removals
+        if entry is None:
+            entry = DetailEntry(psutil.Process(pid))
+            stale = self._stale_fields(entry, now)
+        
+        updates = {}
+        skipped = 0
+        if stale:
+            try:
+                with entry.proc.oneshot():
+                    for field in stale:
+                        if field in entry.values and deadline_expired():
+                            # Out of time: serve the previous value of this field
+                            skipped += 1
+                            continue
+                        try:
+                            updates[field] = _FETCHERS[field](entry.proc)
+                        except (psutil.AccessDenied, psutil.ZombieProcess):
+                            updates[field] = _DENIED[field]
+            except psutil.NoSuchProcess:
+                if key is not None:
+                    self.remove(key)
+                raise
+        
+        with self._lock:
+            # Updated under the lock: peek() may copy the values concurrently
+            entry.values.update(updates)
+            entry.fetched_at.update(dict.fromkeys(updates, now))
+            self._stats['field_reads'] += len(updates)
+            self._stats['stale_on_deadline'] += skipped
+            # Cache only if no exit was reported meanwhile: a process removed
+            # while /proc was read must not come back until LRU eviction
+            if key is not None and (self._entries.get(key) is entry or self._removals == removals):
+                self._entries[key] = entry
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return dict(entry.values)
+    
+    def memory_percent(self, rss: int) -> float:
+        """RSS as a percentage of physical memory (total read once)."""
+        if self._total_memory is None:
+            self._total_memory = psutil.virtual_memory().total
+        return rss / self._total_memory * 100 if self._total_memory else 0.0
+    
+    def get_stats(self) -> dict:
+        """Get detail cache statistics for monitoring."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['cached_processes'] = len(self._entries)
+            stats['ttls'] = dict(self.ttls)
+            return stats
@@ -0,0 +1,48 @@
+"""
+Compact app records for System Pulse.
+Apps are carried from aggregation through scoring and streaming as slotted
+AppRecord objects instead of dicts, and converted to the JSON shape only at
+the API boundary (to_dict).
+"""
+
+# JSON field order of an app, also the record's slots
+APP_FIELDS = ('name', 'pid', 'logo', 'incoming', 'outgoing', 'cpu', 'memory', 'relevance_score')
+
+
+class AppRecord:
+    """
+    Aggregated metrics of one app (all processes sharing a name) in one sample.
+    
+    Records are not modified once published: a changed app gets a new record,
+    so consecutive samples can share the records of unchanged apps.
+    relevance_score is None until backend.scoring.RankedIndex fills it in.
+    """
+    
+    __slots__ = APP_FIELDS
+    
+    def __init__(self, name: str, pid: int, logo: str, incoming: int, outgoing: int,
+                 cpu: float, memory: float, relevance_score: float = None):
+        self.name = name
+        self.pid = pid
+        self.logo = logo
+        self.incoming = incoming
+        self.outgoing = outgoing
+        self.cpu = cpu
+        self.memory = memory
+        self.relevance_score = relevance_score
+    
+    def __repr__(self):
+        return f"AppRecord(name={self.name!r}, pid={self.pid}, cpu={self.cpu}, memory={self.memory:.1f})"
+    
+    def to_dict(self) -> dict:
+        """The app in its API (JSON) shape."""
+        return {
+            "name": self.name,
+            "pid": self.pid,
+            "logo": self.logo,
+            "incoming": self.incoming,
+            "outgoing": self.outgoing,
+            "cpu": self.cpu,
+            "memory": self.memory,
+            "relevance_score": self.relevance_score
+        }
@@ -0,0 +1,171 @@
+"""
+Pre-encoded JSON responses for System Pulse's polling endpoints.
+Response bodies are encoded once per (endpoint, params, sample version) and
+served with a strong ETag, so repeated polls within one sample interval
+skip serialization and conditional polls get an empty 304.
+
+Clients sending `Accept: application/vnd.system-pulse.columns` get the
+binary columnar encoding of the same payload (backend.wire); JSON stays
+the default.
+
+A request that runs out of time (backend.timeout) can be answered with the
+last body encoded for its key, from an older sample, instead of a 504.
+"""
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, NamedTuple, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from .timeout import set_stale_fallback
+from .wire import COLUMNS_MEDIA_TYPE, encode_columns
+
+try:
+    import orjson
+except ImportError:  # Optional: falls back to the standard library encoder
+    orjson = None
+
+
+def encode_json(payload: Any) -> bytes:
+    """Compact JSON bytes (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(',', ':')).encode()
+
+
+def wants_columns(request: Request) -> bool:
+    """True if the client asked for the binary columnar encoding."""
+    return COLUMNS_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def negotiated_response(request: Request, payload: Any) -> Response:
+    """Encode a payload as JSON or, if accepted, in the columnar wire format (not cached)."""
+    if wants_columns(request):
+        return Response(content=encode_columns(payload), media_type=COLUMNS_MEDIA_TYPE,
+                        headers={"Vary": "Accept"})
+    return Response(content=encode_json(payload), media_type="application/json",
+                    headers={"Vary": "Accept"})
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison, as for GET)."""
+    if if_none_match.strip() == '*':
+        return True
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+class EncodedBody(NamedTuple):
+    """Encoded response body of one sample version."""
+    version: int
+    body: bytes
+    etag: str
+    media_type: str
+
+
+class EncodedResponseCache:
+    """
+    Latest encoded body per (endpoint, params), reused while the sample
+    version is unchanged.
+    
+    ETags hash the body, so a new sample with identical content for a query
+    (e.g. an idle system's later pages) still answers conditional polls
+    with 304.
+    
+    Usage:
+        responses = EncodedResponseCache()
+        return responses.respond(request, ("dashboard", page), sample.version,
+                                 lambda: build_payload(page))
+    """
+    
+    def __init__(self, max_entries: int = 256):
+        """
+        Args:
+            max_entries: Distinct (endpoint, params) keys kept (least recently used dropped)
+        """
+        self.max_entries = max_entries
+        self._bodies = OrderedDict()   # key -> EncodedBody
+        self._stats = {'hits': 0, 'misses': 0, 'not_modified': 0, 'bytes_encoded': 0,
+                       'stale_served': 0}
+    
+    def encoded(self, key: Hashable, version: int, build: Callable[[], Any],
+                columns: bool = False) -> EncodedBody:
+        """
+        Encoded body of a key at a sample version, building it on a miss.
+        
+        Args:
+            key: Endpoint name and normalized query parameters
+            version: Sample version the payload is derived from
+            build: Returns the JSON-serializable payload
+            columns: Use the binary columnar encoding instead of JSON
+        """
+        key = (key, columns)
+        cached = self._bodies.get(key)
+        if cached is not None and cached.version == version:
+            self._bodies.move_to_end(key)
+            self._stats['hits'] += 1
+            return cached
+        
+        if columns:
+            body, media_type = encode_columns(build()), COLUMNS_MEDIA_TYPE
+        else:
+            body, media_type = encode_json(build()), "application/json"
+        entry = EncodedBody(version, body, '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"',
+                            media_type)
+        self._bodies[key] = entry
+        self._bodies.move_to_end(key)
+        while len(self._bodies) > self.max_entries:
+            self._bodies.popitem(last=False)
+        self._stats['misses'] += 1
+        self._stats['bytes_encoded'] += len(body)
+        return entry
+    
+    def respond(self, request: Request, key: Hashable, version: int, build: Callable[[], Any]) -> Response:
+        """
+        JSON (or negotiated columnar) response for a key at a sample version,
+        or 304 if the client's If-None-Match already names this body.
+        """
+        entry = self.encoded(key, version, build, columns=wants_columns(request))
+        headers = {"ETag": entry.etag, "Cache-Control": "no-cache", "Vary": "Accept"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, entry.etag):
+            self._stats['not_modified'] += 1
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type=entry.media_type, headers=headers)
+    
+    def offer_stale(self, request: Request, key: Hashable) -> None:
+        """
+        Let the current request fall back to the last body encoded for its key
+        (whatever its sample version) if it times out before a fresh one is
+        built. The stale body's version is sent in X-Stale-Sample-Version.
+        """
+        set_stale_fallback(lambda: self.stale_response(request, key))
+    
+    def stale_response(self, request: Request, key: Hashable) -> Optional[Response]:
+        """
+        Last body encoded for a key (whatever its sample version), with its
+        version in X-Stale-Sample-Version, or None if it was never encoded.
+        """
+        entry = self._bodies.get((key, wants_columns(request)))
+        if entry is None:
+            return None
+        self._stats['stale_served'] += 1
+        return Response(content=entry.body, media_type=entry.media_type, headers={
+            "ETag": entry.etag, "Cache-Control": "no-cache", "Vary": "Accept",
+            "X-Stale-Sample-Version": str(entry.version)
+        })
+    
+    def get_stats(self) -> dict:
+        """Get response cache statistics for monitoring."""
+        stats = dict(self._stats)
+        stats['entries'] = len(self._bodies)
+        stats['encoder'] = 'orjson' if orjson is not None else 'json'
+        return stats
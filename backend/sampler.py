@@ -0,0 +1,203 @@
+"""
+Background sampler for System Pulse.
+Collects process data on a fixed interval in the thread pool and publishes
+an immutable snapshot, so request handlers only read memory.
+"""
+import asyncio
+import time
+from typing import Any, Callable, NamedTuple, Optional
+
+from .async_ops import dedicated_executor, run_in_executor
+from .timeout import clear_deadline
+
+
+class Sample(NamedTuple):
+    """
+    Immutable result of one collection cycle.
+    
+    Attributes:
+        version: Monotonic sample counter (1 for the first sample)
+        timestamp: Wall-clock time the sample was published
+        duration: Seconds spent collecting the sample
+        apps: Relevance ranking of all apps, e.g. backend.scoring.RankedIndex
+            (treat as read-only)
+        changes: What changed since the previous sample (collector-defined,
+            e.g. backend.incremental.ChangeSet), or None if unknown (also
+            after a failed collection, whose changes were never published)
+        groups: Rankings of other groupings computed in the same cycle
+            ({mode: RankedIndex}, treat as read-only), published together
+            with `apps` so both always belong to the same version
+    """
+    version: int
+    timestamp: float
+    duration: float
+    apps: Any
+    changes: Any = None
+    groups: Any = None
+
+
+class BackgroundSampler:
+    """
+    Periodically runs a blocking collection function on a worker thread.
+    
+    Usage:
+        sampler = BackgroundSampler(collect_sorted_processes, interval=1.0)
+        sampler.start()                 # on app startup
+        sample = await sampler.get_sample()
+        await sampler.stop()            # on app shutdown
+    """
+    
+    def __init__(self, collect_fn: Callable[[], Any], interval: float = 1.0):
+        """
+        Args:
+            collect_fn: Blocking function returning (ranked apps, changes, group rankings)
+            interval: Seconds between the start of two collections
+        """
+        self.collect_fn = collect_fn
+        self.interval = interval
+        # Collections never wait behind request work (or compaction) for a thread
+        self._executor = dedicated_executor("sampler")
+        self._sample: Optional[Sample] = None
+        self._inflight: Optional[asyncio.Future] = None
+        self._task: Optional[asyncio.Task] = None
+        # Set (and replaced) whenever a sample is published; created lazily so
+        # it belongs to the server's event loop
+        self._published: Optional[asyncio.Event] = None
+        # A collection failed since the last published sample: its changes
+        # are lost, so the next sample cannot claim to describe the difference
+        self._changes_lost = False
+        self._stats = {
+            'collections': 0,
+            'errors': 0,
+            'last_duration_ms': 0.0
+        }
+    
+    @property
+    def latest(self) -> Optional[Sample]:
+        """Most recently published sample, or None before the first one."""
+        return self._sample
+    
+    async def get_sample(self) -> Sample:
+        """
+        Get the latest sample, collecting one first if none exists yet.
+        Only blocks (without blocking the event loop) before the first sample.
+        """
+        if self._sample is not None:
+            return self._sample
+        return await self.refresh()
+    
+    async def refresh(self) -> Sample:
+        """
+        Collect and publish a new sample now.
+        Concurrent callers share the collection that is already in flight.
+        """
+        if self._inflight is None:
+            if self._executor is None:
+                raise RuntimeError("Sampler is stopped")
+            self._inflight = asyncio.ensure_future(self._collect())
+        return await asyncio.shield(self._inflight)
+    
+    async def _collect(self) -> Sample:
+        # Shared by every waiting request: not bound by the one that started it
+        clear_deadline()
+        started = time.time()
+        try:
+            apps, changes, groups = await run_in_executor(self.collect_fn, executor=self._executor)
+        except Exception:
+            self._stats['errors'] += 1
+            self._changes_lost = True
+            raise
+        finally:
+            self._inflight = None
+        
+        duration = time.time() - started
+        version = self._sample.version + 1 if self._sample else 1
+        if self._changes_lost:
+            changes = None
+            self._changes_lost = False
+        self._sample = Sample(version, time.time(), duration, apps, changes, groups)
+        self._stats['collections'] += 1
+        self._stats['last_duration_ms'] = round(duration * 1000, 2)
+        
+        # Wake everyone waiting in wait_for_newer()
+        published, self._published = self._published, None
+        if published is not None:
+            published.set()
+        return self._sample
+    
+    async def wait_for_newer(self, version: int, timeout: Optional[float] = None) -> Optional[Sample]:
+        """
+        Wait until a sample newer than `version` is published.
+        
+        Args:
+            version: Version the caller already has (0 for none)
+            timeout: Maximum seconds to wait (None = forever)
+        
+        Returns:
+            The latest sample, or None if the timeout elapsed first
+        """
+        while self._sample is None or self._sample.version <= version:
+            if self._published is None:
+                self._published = asyncio.Event()
+            try:
+                await asyncio.wait_for(self._published.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self._sample
+    
+    async def _run(self) -> None:
+        """Sampling loop: collect, then sleep for the rest of the interval."""
+        while True:
+            started = time.monotonic()
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Warning: Background sampling failed: {str(e)}")
+            elapsed = time.monotonic() - started
+            await asyncio.sleep(max(self.interval - elapsed, 0.0))
+    
+    def start(self) -> None:
+        """Start the sampling loop on the running event loop."""
+        if self._executor is None:
+            self._executor = dedicated_executor("sampler")
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    async def stop(self) -> None:
+        """
+        Cancel the sampling loop, wait for a collection still in flight and
+        shut down the sampler's executor. Once this returns, collect_fn no
+        longer runs, so what it writes to (stores, sinks) can be closed.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        inflight = self._inflight
+        if inflight is not None:
+            # Shielded from the loop's cancellation: let it finish
+            try:
+                await inflight
+            except Exception:
+                pass
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            await run_in_executor(executor.shutdown, True)
+    
+    def get_stats(self) -> dict:
+        """Get sampler statistics for monitoring."""
+        sample = self._sample
+        return {
+            'running': self._task is not None and not self._task.done(),
+            'interval_seconds': self.interval,
+            'collections': self._stats['collections'],
+            'errors': self._stats['errors'],
+            'last_duration_ms': self._stats['last_duration_ms'],
+            'sample_version': sample.version if sample else 0,
+            'sample_age_seconds': round(time.time() - sample.timestamp, 3) if sample else None
+        }
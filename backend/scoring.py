@@ -2,7 +2,18 @@
 Process relevance scoring system.
 Combines CPU, memory, and network activity into a single relevance score.
 Higher score = more important/relevant process to monitor.
+
+Batch functions work on columns of values and are vectorized with NumPy when
+it is installed (optional), with a pure-Python fallback otherwise.
 """
+from operator import attrgetter
+
+from .columnar import AppColumns
+
+try:
+    import numpy as np
+except ImportError:  # Optional: batch scoring falls back to pure Python
+    np = None
 
 
 def calculate_relevance_score(cpu_percent, memory_mb, incoming_connections, outgoing_connections):
@@ -45,6 +56,35 @@ def calculate_relevance_score(cpu_percent, memory_mb, incoming_connections, outg
     return total_score
 
 
+def calculate_relevance_scores(cpu, memory, incoming, outgoing):
+    """
+    Batch version of calculate_relevance_score over columns.
+    
+    With NumPy the whole batch is scored in one vectorized pass; the
+    operations are the same as the scalar version, so results are identical.
+    
+    Args:
+        cpu: CPU usage percentages (sequence or array)
+        memory: Memory usage in MB
+        incoming: Incoming connection counts
+        outgoing: Outgoing connection counts
+    
+    Returns:
+        numpy.ndarray of float64 with NumPy, list of floats otherwise
+    """
+    if np is None:
+        return [calculate_relevance_score(c, m, i, o)
+                for c, m, i, o in zip(cpu, memory, incoming, outgoing)]
+    
+    cpu = np.asarray(cpu, dtype=np.float64)
+    memory = np.asarray(memory, dtype=np.float64)
+    connections = np.asarray(incoming, dtype=np.float64) + np.asarray(outgoing, dtype=np.float64)
+    cpu_score = np.minimum(cpu / 2.5, 40)
+    memory_score = np.minimum((memory / 1000) * 30, 30)
+    network_score = np.minimum((connections / 20) * 30, 30)
+    return cpu_score + memory_score + network_score
+
+
 def sort_processes_by_relevance(processes):
     """
     Sort processes by relevance score.
@@ -69,3 +109,116 @@ def sort_processes_by_relevance(processes):
     
     # Sort by relevance score descending
     return sorted(scored_processes, key=lambda x: x['relevance_score'], reverse=True)
+
+
+_score_key = attrgetter('relevance_score')
+
+
+class RankedIndex:
+    """
+    Relevance ranking of one sample's apps, shared by every endpoint.
+    
+    Works on the sample's columnar table (backend.columnar.AppColumns):
+    - Each AppRecord is scored once, in the batch of its cycle: records
+      carried over unchanged from the previous sample keep their score
+    - Nothing is sorted up front. The first pages come from a partial
+      selection over the score column (np.partition, or a heap without
+      NumPy) and the largest top-k computed so far is reused
+    - The full ranking is one stable argsort of the score column, on first
+      use, and cached
+    
+    Ties keep row order, so partial pages and the full ranking agree.
+    
+    Usage:
+        ranking = RankedIndex(process_table.columns)   # or any AppRecords
+        first_page = ranking.page(1, per_page=20)
+    """
+    
+    # Partial selection only pays off while k is small compared to n
+    HEAP_MAX_FRACTION = 0.25
+    
+    def __init__(self, apps):
+        """
+        Args:
+            apps: AppColumns of the sample, or an iterable of
+                backend.records.AppRecord (put into columns; relevance_score
+                is filled in for records that have none yet)
+        """
+        if not isinstance(apps, AppColumns):
+            apps = AppColumns.from_records(apps, calculate_relevance_scores)
+        self.columns = apps
+        self._top = []
+        self._ranked = None
+    
+    def __len__(self):
+        return len(self.columns)
+    
+    def __iter__(self):
+        return iter(self.ranked())
+    
+    def unordered(self):
+        """All apps in row order (no sorting cost)."""
+        return self.columns.records
+    
+    def ranked(self):
+        """All apps sorted by relevance score, highest first (cached)."""
+        if self._ranked is None:
+            records = self.columns.records
+            self._ranked = [records[i] for i in self.columns.order('relevance_score', True)]
+        return self._ranked
+    
+    def top(self, k):
+        """
+        The k most relevant apps, highest first.
+        
+        Args:
+            k: Number of apps to return
+        
+        Returns:
+            list: At most k AppRecords
+        """
+        if k <= 0:
+            return []
+        if self._ranked is not None:
+            return self._ranked[:k]
+        if k <= len(self._top):
+            return self._top[:k]
+        if k > len(self.columns) * self.HEAP_MAX_FRACTION:
+            return self.ranked()[:k]
+        records = self.columns.records
+        self._top = [records[i] for i in self.columns.top(k)]
+        return self._top
+    
+    def page(self, page, per_page):
+        """
+        One page of the ranking.
+        
+        Args:
+            page: Page number (1-indexed)
+            per_page: Items per page
+        
+        Returns:
+            list: AppRecords of that page (empty past the end, and for
+            pages below 1)
+        """
+        if page < 1:
+            return []
+        start = (page - 1) * per_page
+        return self.top(start + per_page)[start:]
+    
+    def filter(self, predicate):
+        """
+        Apps matching a predicate, sorted by relevance.
+        Only the matches are sorted unless the full ranking already exists.
+        
+        Args:
+            predicate: Function app -> bool
+        
+        Returns:
+            list: Matching AppRecords, highest score first
+        """
+        if self._ranked is not None:
+            return [app for app in self._ranked if predicate(app)]
+        matches = [app for app in self.columns.records if predicate(app)]
+        matches.sort(key=_score_key, reverse=True)
+        return matches
@@ -0,0 +1,205 @@
+"""
+Per-sample query index for the /api/snapshot endpoint.
+Answers CPU and memory thresholds with one mask over the sample's columnar
+table, name searches from an n-gram index, and sorts/paginates on any
+column by argsort, so interactive filtering does not visit or re-sort every
+AppRecord on each keystroke.
+"""
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Columns the snapshot can be sorted by
+SORT_FIELDS = ('relevance_score', 'name', 'pid', 'cpu', 'memory', 'incoming', 'outgoing')
+
+# Names are indexed by every substring of up to GRAM_SIZE characters
+GRAM_SIZE = 3
+
+
+def name_grams(lowered: str) -> Set[str]:
+    """All substrings of 1..GRAM_SIZE characters of a lowercased name."""
+    return {lowered[i:i + n] for n in range(1, GRAM_SIZE + 1) for i in range(len(lowered) - n + 1)}
+
+
+class NameIndex:
+    """
+    Substring index over app names (case-insensitive).
+    
+    Terms of up to GRAM_SIZE characters are answered straight from the
+    postings; longer terms intersect the postings of their trigrams and
+    verify the few candidates. The index is updated in place with the names
+    added/removed between samples, so only their grams are touched.
+    """
+    
+    def __init__(self, names: Iterable[str] = ()):
+        self._postings: Dict[str, Set[str]] = {}
+        self._lowered: Dict[str, str] = {}
+        self.update(names, ())
+    
+    @property
+    def names(self):
+        """Indexed names (a read-only view)."""
+        return self._lowered.keys()
+    
+    def update(self, added: Iterable[str], removed: Iterable[str]) -> None:
+        """Add and remove names."""
+        postings = self._postings
+        for name in removed:
+            lower = self._lowered.pop(name, None)
+            if lower is None:
+                continue
+            for gram in name_grams(lower):
+                posting = postings[gram]
+                posting.discard(name)
+                if not posting:
+                    del postings[gram]
+        for name in added:
+            if name in self._lowered:
+                continue
+            lower = self._lowered[name] = name.lower()
+            for gram in name_grams(lower):
+                posting = postings.get(gram)
+                if posting is None:
+                    posting = postings[gram] = set()
+                posting.add(name)
+    
+    def search(self, term: str) -> Set[str]:
+        """Names containing term (case-insensitive)."""
+        term = term.lower()
+        if not term:
+            return set(self._lowered)
+        if len(term) <= GRAM_SIZE:
+            return set(self._postings.get(term, ()))
+        
+        trigrams = sorted((self._postings.get(term[i:i + GRAM_SIZE], set())
+                           for i in range(len(term) - GRAM_SIZE + 1)), key=len)
+        candidates = set(trigrams[0])
+        for posting in trigrams[1:]:
+            if not candidates:
+                break
+            candidates &= posting
+        return {name for name in candidates if term in self._lowered[name]}
+
+
+class SnapshotIndex:
+    """
+    Query index over one sample's apps (a backend.scoring.RankedIndex).
+    
+    - min_cpu/min_memory are one vectorized mask over the cpu and memory
+      columns (backend.columnar.AppColumns); name matches are intersected
+      with it by row
+    - full orderings per column are argsorted lazily, once per sample, and
+      shared by all queries; small result sets argsort only their rows,
+      large ones are read in order from the full ordering
+    - the name index is taken over from the previous sample's index and
+      updated with the names that appeared or disappeared (the previous
+      index must not be queried afterwards)
+    
+    Usage:
+        index = SnapshotIndex.build(ranking, previous=index)
+        total, apps = index.query(min_cpu=5.0, search="chr", sort="memory", page=1, per_page=50)
+    """
+    
+    def __init__(self, ranking, names: NameIndex):
+        """
+        Args:
+            ranking: RankedIndex of the sample
+            names: NameIndex of exactly the sample's app names
+        """
+        self.ranking = ranking
+        self.columns = ranking.columns
+        self.names = names
+        self._by_name = {app.name: row for row, app in enumerate(self.columns.records)}
+        self._ordered: Dict[Tuple[str, bool], list] = {}
+    
+    @classmethod
+    def build(cls, ranking, previous: Optional['SnapshotIndex'] = None) -> 'SnapshotIndex':
+        """
+        Index a sample, taking over the name index of a previous sample's index.
+        
+        Args:
+            ranking: RankedIndex of the sample
+            previous: Index of an earlier sample, or None
+        """
+        current = {app.name for app in ranking.unordered()}
+        if previous is None:
+            return cls(ranking, NameIndex(current))
+        names = previous.names
+        indexed = names.names
+        names.update(current - indexed, indexed - current)
+        return cls(ranking, names)
+    
+    def __len__(self) -> int:
+        return len(self._by_name)
+    
+    def ordered(self, field: str, descending: bool) -> list:
+        """All apps ordered by a column (relevance order matches the dashboard)."""
+        key = (field, descending)
+        cached = self._ordered.get(key)
+        if cached is None:
+            if field == 'relevance_score':
+                cached = self.ranking.ranked()
+                if not descending:
+                    cached = cached[::-1]
+            elif field == 'name':
+                cached = sorted(self.ranking.unordered(), key=lambda app: app.name.lower(),
+                                reverse=descending)
+            else:
+                records = self.columns.records
+                cached = [records[i] for i in self.columns.order(field, descending)]
+            self._ordered[key] = cached
+        return cached
+    
+    def query(self, min_cpu: float = 0.0, min_memory: float = 0.0, search: str = "",
+              sort: str = 'relevance_score', descending: bool = True,
+              page: int = 1, per_page: int = 0) -> Tuple[int, List]:
+        """
+        Filter, sort and paginate the sample's apps.
+        
+        Args:
+            min_cpu: Minimum CPU usage % (0 = no filter)
+            min_memory: Minimum memory usage MB (0 = no filter)
+            search: Case-insensitive substring of the app name
+            sort: One of SORT_FIELDS
+            descending: Sort order
+            page: Page number (1-indexed)
+            per_page: Items per page (0 = all matches)
+        
+        Returns:
+            tuple: (number of matches, AppRecords of the requested page)
+        """
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"Cannot sort by {sort!r}; expected one of {', '.join(SORT_FIELDS)}")
+        start = max(page - 1, 0) * per_page
+        end = start + per_page if per_page else None
+        
+        rows = None
+        if min_cpu > 0 or min_memory > 0:
+            rows = self.columns.at_least(min_cpu if min_cpu > 0 else None,
+                                         min_memory if min_memory > 0 else None)
+        if search:
+            by_name = self._by_name
+            named = {by_name[name] for name in self.names.search(search)}
+            rows = sorted(named) if rows is None else [row for row in rows if row in named]
+        
+        if rows is None:
+            if sort == 'relevance_score' and descending and per_page:
+                return len(self), self.ranking.page(max(page, 1), per_page)
+            return len(self), self.ordered(sort, descending)[start:end]
+        
+        records = self.columns.records
+        if len(rows) * 4 <= len(self):
+            if sort == 'name':
+                matches = sorted((records[row] for row in rows), key=lambda app: app.name.lower(),
+                                 reverse=descending)
+                return len(rows), matches[start:end]
+            return len(rows), [records[row] for row in self.columns.order(sort, descending, rows)[start:end]]
+        
+        # Most apps match: walk the presorted column instead of sorting them,
+        # stopping once the requested page is complete
+        selected = set(map(id, (records[row] for row in rows)))
+        page_apps = []
+        for app in self.ordered(sort, descending):
+            if id(app) in selected:
+                page_apps.append(app)
+                if end is not None and len(page_apps) == end:
+                    break
+        return len(rows), page_apps[start:]
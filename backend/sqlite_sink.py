@@ -0,0 +1,317 @@
+"""
+SQLite snapshot sink for System Pulse.
+Persists sampled app snapshots for ad-hoc analysis without slowing down
+collection: the sampler only enqueues rows, and a dedicated writer thread
+batches them into WAL-mode SQLite with executemany.
+"""
+import queue
+import sqlite3
+import threading
+import time
+from typing import Iterable, List, Optional
+
+from .timeout import deadline_expired
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    ts REAL PRIMARY KEY,
+    total INTEGER NOT NULL,
+    first_id INTEGER NOT NULL,
+    last_id INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    name TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    cpu REAL NOT NULL,
+    memory REAL NOT NULL,
+    incoming INTEGER NOT NULL,
+    outgoing INTEGER NOT NULL,
+    relevance_score REAL
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_name_ts ON snapshots (name, ts);
+CREATE INDEX IF NOT EXISTS idx_snapshots_pid_ts ON snapshots (pid, ts);
+"""
+
+ROW_COLUMNS = ('name', 'pid', 'cpu', 'memory', 'incoming', 'outgoing', 'relevance_score')
+
+# SQLite VM instructions between two deadline checks of a reader query
+PROGRESS_STEPS = 10000
+
+_STOP = object()
+
+
+def _like_pattern(search: str) -> str:
+    """Escape a search term for a case-insensitive substring LIKE."""
+    escaped = search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+
+class SnapshotSink:
+    """
+    Optional SQLite sink for app snapshots.
+    
+    - submit() never blocks: it drops the snapshot when the queue is full
+    - the writer thread drains every queued snapshot into one transaction
+    - rows get consecutive ids and each sample records its id range, so a
+      whole snapshot is read by rowid range without an index on ts
+    - at most one snapshot per min_interval seconds is kept, and rows older
+      than retention are pruned by the writer thread
+    - queries use their own per-thread connections (WAL lets them run while
+      the writer commits)
+    
+    Usage:
+        sink = SnapshotSink("data/snapshots.db")
+        sink.start()
+        sink.submit(time.time(), ranking.unordered())   # from the sampler thread
+        sink.query_snapshot(min_cpu=5.0)
+        sink.stop()
+    """
+    
+    def __init__(self, path: str, min_interval: float = 10.0, retention: float = 7 * 86400.0,
+                 max_queue: int = 64):
+        """
+        Args:
+            path: SQLite database file (created if missing)
+            min_interval: Minimum seconds between two persisted snapshots
+            retention: Seconds of snapshots to keep (0 = keep everything)
+            max_queue: Snapshots waiting for the writer before new ones are dropped
+        """
+        self.path = path
+        self.min_interval = min_interval
+        self.retention = retention
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._local = threading.local()
+        self._last_submit = 0.0
+        self._last_prune = 0.0
+        self._next_id = 1
+        self._error: Optional[str] = None  # Why the writer thread stopped, if it failed
+        self._stats = {
+            'snapshots_queued': 0,
+            'snapshots_dropped': 0,
+            'snapshots_written': 0,
+            'rows_written': 0,
+            'batches': 0,
+            'write_errors': 0,
+            'last_batch_ms': 0.0
+        }
+    
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+    
+    def _reader(self) -> sqlite3.Connection:
+        """Connection of the calling (query) thread."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+            conn.row_factory = sqlite3.Row
+            # Abort the running query ("interrupted") once the request's deadline passed
+            conn.set_progress_handler(deadline_expired, PROGRESS_STEPS)
+        return conn
+    
+    def start(self) -> None:
+        """
+        Create the schema and start the writer thread.
+        
+        Raises:
+            sqlite3.Error: The database cannot be opened or initialized
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        conn = self._connect()
+        try:
+            conn.executescript(SCHEMA)
+            self._next_id = (conn.execute("SELECT MAX(id) FROM snapshots").fetchone()[0] or 0) + 1
+        finally:
+            conn.close()
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="snapshot-sink", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: float = 5.0) -> None:
+        """Flush queued snapshots and stop the writer thread."""
+        if self._thread is None:
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        self._thread = None
+    
+    def submit(self, timestamp: float, apps: Iterable) -> bool:
+        """
+        Queue one snapshot for writing (called on the collection path).
+        
+        Args:
+            timestamp: Wall-clock time of the sample
+            apps: AppRecord-like objects with the ROW_COLUMNS attributes
+        
+        Returns:
+            True if queued, False if skipped (min_interval) or dropped (queue full)
+        """
+        if timestamp - self._last_submit < self.min_interval:
+            return False
+        if self._thread is None or not self._thread.is_alive():
+            # No writer would ever drain the queue
+            self._stats['snapshots_dropped'] += 1
+            return False
+        rows = [(timestamp, app.name, app.pid, app.cpu, app.memory, app.incoming,
+                 app.outgoing, app.relevance_score) for app in apps]
+        try:
+            self._queue.put_nowait((timestamp, rows))
+        except queue.Full:
+            self._stats['snapshots_dropped'] += 1
+            return False
+        self._last_submit = timestamp
+        self._stats['snapshots_queued'] += 1
+        return True
+    
+    def _run(self) -> None:
+        """Writer thread: batch everything queued into one transaction."""
+        try:
+            conn = self._connect()
+        except sqlite3.Error as e:
+            self._error = str(e)
+            print(f"Warning: SQLite snapshot writer for {self.path} could not start: {str(e)}")
+            return
+        try:
+            stopping = False
+            while not stopping:
+                batch = [self._queue.get()]
+                while True:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if any(item is _STOP for item in batch):
+                    stopping = True
+                    batch = [item for item in batch if item is not _STOP]
+                if batch:
+                    self._write(conn, batch)
+                self._prune(conn)
+        finally:
+            conn.close()
+    
+    def _write(self, conn: sqlite3.Connection, batch: List[tuple]) -> None:
+        started = time.perf_counter()
+        next_id = self._next_id
+        samples, rows = [], []
+        for ts, sample_rows in batch:
+            samples.append((ts, len(sample_rows), next_id, next_id + len(sample_rows) - 1))
+            rows.extend((next_id + i,) + row for i, row in enumerate(sample_rows))
+            next_id += len(sample_rows)
+        try:
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO samples VALUES (?, ?, ?, ?)", samples)
+                conn.executemany("INSERT INTO snapshots VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        except sqlite3.Error as e:
+            self._stats['write_errors'] += 1
+            print(f"Warning: Failed to write snapshots to {self.path}: {str(e)}")
+            return
+        self._next_id = next_id
+        self._stats['batches'] += 1
+        self._stats['snapshots_written'] += len(batch)
+        self._stats['rows_written'] += len(rows)
+        self._stats['last_batch_ms'] = round((time.perf_counter() - started) * 1000, 2)
+    
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        """
+        Delete snapshots older than the retention (at most once a minute).
+        Rows are removed by id range: every row before the first kept sample
+        (found through the samples primary key), so no ts index is scanned.
+        """
+        now = time.time()
+        if not self.retention or now - self._last_prune < 60.0:
+            return
+        self._last_prune = now
+        cutoff = now - self.retention
+        try:
+            with conn:
+                # Without a kept sample every written row is older than the cutoff
+                conn.execute("DELETE FROM snapshots WHERE id < COALESCE("
+                             "(SELECT MIN(first_id) FROM samples WHERE ts >= ?), ?)",
+                             (cutoff, self._next_id))
+                conn.execute("DELETE FROM samples WHERE ts < ?", (cutoff,))
+        except sqlite3.Error as e:
+            print(f"Warning: Failed to prune snapshots in {self.path}: {str(e)}")
+    
+    def query_snapshot(self, timestamp: Optional[float] = None, min_cpu: float = 0.0,
+                       min_memory: float = 0.0, search: str = "", limit: int = 1000) -> dict:
+        """
+        Filtered apps of one stored snapshot, like /api/snapshot (filters run in SQL).
+        
+        Args:
+            timestamp: Latest snapshot taken at or before this time (None = latest)
+            min_cpu: Minimum CPU usage %
+            min_memory: Minimum memory usage MB
+            search: Case-insensitive substring of the app name
+            limit: Maximum number of apps returned
+        
+        Returns:
+            dict with timestamp, total, filtered (matches before the limit) and
+            processes (by relevance);
+            timestamp is None if nothing is stored
+        """
+        conn = self._reader()
+        if timestamp is None:
+            sample = conn.execute("SELECT * FROM samples ORDER BY ts DESC LIMIT 1").fetchone()
+        else:
+            sample = conn.execute("SELECT * FROM samples WHERE ts <= ? ORDER BY ts DESC LIMIT 1",
+                                  (timestamp,)).fetchone()
+        if sample is None:
+            return {"timestamp": None, "total": 0, "filtered": 0, "processes": []}
+        
+        where = " FROM snapshots WHERE id BETWEEN ? AND ?"
+        params: list = [sample['first_id'], sample['last_id']]
+        if min_cpu > 0:
+            where += " AND cpu >= ?"
+            params.append(min_cpu)
+        if min_memory > 0:
+            where += " AND memory >= ?"
+            params.append(min_memory)
+        if search:
+            where += " AND name LIKE ? ESCAPE '\\'"
+            params.append(_like_pattern(search))
+        
+        filtered = conn.execute("SELECT COUNT(*)" + where, params).fetchone()[0]
+        sql = "SELECT " + ", ".join(ROW_COLUMNS) + where + " ORDER BY relevance_score DESC LIMIT ?"
+        processes = [dict(row) for row in conn.execute(sql, params + [limit])]
+        return {
+            "timestamp": sample['ts'],
+            "total": sample['total'],
+            "filtered": filtered,
+            "processes": processes
+        }
+    
+    def query_app(self, name: str, start: float, end: float, limit: int = 1000) -> List[dict]:
+        """Stored rows of one app between two timestamps (uses the (name, ts) index)."""
+        rows = self._reader().execute(
+            "SELECT ts, " + ", ".join(ROW_COLUMNS) + " FROM snapshots"
+            " WHERE name = ? AND ts BETWEEN ? AND ? ORDER BY ts LIMIT ?",
+            (name, start, end, limit))
+        return [dict(row) for row in rows]
+    
+    def query_pid(self, pid: int, start: float, end: float, limit: int = 1000) -> List[dict]:
+        """Stored rows of one PID between two timestamps (uses the (pid, ts) index)."""
+        rows = self._reader().execute(
+            "SELECT ts, " + ", ".join(ROW_COLUMNS) + " FROM snapshots"
+            " WHERE pid = ? AND ts BETWEEN ? AND ? ORDER BY ts LIMIT ?",
+            (pid, start, end, limit))
+        return [dict(row) for row in rows]
+    
+    def get_stats(self) -> dict:
+        """Get sink statistics for monitoring."""
+        stats = dict(self._stats)
+        stats['path'] = self.path
+        stats['running'] = self._thread is not None and self._thread.is_alive()
+        stats['error'] = self._error
+        stats['queue_size'] = self._queue.qsize()
+        stats['min_interval_seconds'] = self.min_interval
+        stats['retention_seconds'] = self.retention
+        return stats
@@ -0,0 +1,578 @@
+"""
+Persistent metric store for System Pulse.
+Append-only, memory-mapped segment files that keep per-app samples across
+restarts, with old data compacted into coarser rollups.
+
+Segment file layout (little-endian):
+    header (64 bytes): magic, level, capacity, count, first_ts, last_ts, resolution
+    one fixed-width column per field, each preallocated for `capacity` values
+
+Columns are written at record index i, then the header count is bumped, so a
+crash never exposes a half-written record. The timestamp column is sorted and
+doubles as the segment's time index (bisect over a zero-copy memoryview).
+Restart recovery only reads segment headers.
+
+Levels: 0 holds raw samples; each further level holds rollups (count plus
+min/max/avg/p95 per metric) at its resolution. Segments older than their
+level's retention are rolled up into the next level and deleted.
+"""
+import asyncio
+import bisect
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .async_ops import dedicated_executor, run_in_executor
+from .timeout import check_deadline
+
+try:
+    import numpy as np
+except ImportError:  # Optional: name filtering falls back to a Python scan
+    np = None
+
+METRICS = ('cpu', 'memory', 'incoming', 'outgoing')
+STATS = ('min', 'max', 'avg', 'p95')
+
+RAW_COLUMNS = (('ts', 'd'), ('name', 'I'), ('pid', 'I'), ('cpu', 'f'), ('memory', 'f'),
+               ('incoming', 'I'), ('outgoing', 'I'))
+ROLLUP_COLUMNS = (('ts', 'd'), ('name', 'I'), ('count', 'I')) + tuple(
+    (f"{metric}_{stat}", 'f') for metric in METRICS for stat in STATS)
+
+MAGIC = b'SPSEG001'
+HEADER = struct.Struct('<8sB3xIIddd')
+HEADER_SIZE = 64
+
+# (resolution, retention) in seconds per level: raw for 1 h, 1m for 2 days, 1h for 30 days
+DEFAULT_LEVELS = ((0, 3600), (60, 172800), (3600, 2592000))
+
+
+class Segment:
+    """One memory-mapped segment file."""
+    
+    def __init__(self, path: str, mm: mmap.mmap, fileobj, level: int, resolution: float,
+                 capacity: int, count: int, first_ts: float, last_ts: float):
+        self.path = path
+        self.level = level
+        self.resolution = resolution
+        self.capacity = capacity
+        self.count = count
+        self.first_ts = first_ts
+        self.last_ts = last_ts
+        self._mm = mm
+        self._file = fileobj
+        # Readers currently using the segment, and whether compaction has
+        # removed it (it is closed once the last reader lets go)
+        self.pins = 0
+        self.retired = False
+        self.columns = RAW_COLUMNS if level == 0 else ROLLUP_COLUMNS
+        self._offsets: Dict[str, Tuple[int, str]] = {}
+        offset = HEADER_SIZE
+        for name, code in self.columns:
+            self._offsets[name] = (offset, code)
+            offset += struct.calcsize(code) * capacity
+        self.size = offset
+    
+    @classmethod
+    def create(cls, path: str, level: int, resolution: float, capacity: int) -> 'Segment':
+        columns = RAW_COLUMNS if level == 0 else ROLLUP_COLUMNS
+        size = HEADER_SIZE + sum(struct.calcsize(code) for _, code in columns) * capacity
+        fileobj = open(path, 'w+b')
+        fileobj.truncate(size)  # Sparse on most filesystems: pages are allocated when written
+        mm = mmap.mmap(fileobj.fileno(), size)
+        segment = cls(path, mm, fileobj, level, resolution, capacity, 0, 0.0, 0.0)
+        segment._write_header()
+        return segment
+    
+    @classmethod
+    def open(cls, path: str) -> 'Segment':
+        fileobj = open(path, 'r+b')
+        mm = mmap.mmap(fileobj.fileno(), 0)
+        magic, level, capacity, count, first_ts, last_ts, resolution = HEADER.unpack_from(mm, 0)
+        if magic != MAGIC:
+            mm.close()
+            fileobj.close()
+            raise ValueError(f"{path} is not a segment file")
+        return cls(path, mm, fileobj, level, resolution, capacity, count, first_ts, last_ts)
+    
+    def _write_header(self) -> None:
+        HEADER.pack_into(self._mm, 0, MAGIC, self.level, self.capacity, self.count,
+                         self.first_ts, self.last_ts, self.resolution)
+    
+    @property
+    def full(self) -> bool:
+        return self.count >= self.capacity
+    
+    def append_many(self, rows: Sequence[tuple]) -> int:
+        """
+        Append rows (one value per column, timestamps not decreasing).
+        
+        Returns:
+            Number of rows written (fewer than given when the segment fills up)
+        """
+        rows = rows[:self.capacity - self.count]
+        if not rows:
+            return 0
+        mm = self._mm
+        for column, (name, code) in enumerate(self.columns):
+            offset, _ = self._offsets[name]
+            size = struct.calcsize(code)
+            values = [row[column] for row in rows]
+            struct.pack_into(f"<{len(values)}{code}", mm, offset + self.count * size, *values)
+        if self.count == 0:
+            self.first_ts = rows[0][0]
+        self.count += len(rows)
+        self.last_ts = rows[-1][0]
+        self._write_header()  # Commit point: records become visible
+        return len(rows)
+    
+    def column(self, name: str) -> memoryview:
+        """Zero-copy view of one column's committed values (release() it after use)."""
+        offset, code = self._offsets[name]
+        size = struct.calcsize(code)
+        return memoryview(self._mm)[offset:offset + self.count * size].cast(code)
+    
+    def rows_for(self, name_id: int, start: float, end: float) -> List[int]:
+        """Indices of records of one app with start <= ts <= end."""
+        ts = self.column('ts')
+        try:
+            lo = bisect.bisect_left(ts, start)
+            hi = bisect.bisect_right(ts, end)
+        finally:
+            ts.release()
+        if lo >= hi:
+            return []
+        if np is not None:
+            offset, _ = self._offsets['name']
+            names = np.frombuffer(self._mm, dtype='<u4', count=hi - lo, offset=offset + lo * 4)
+            indices = (np.flatnonzero(names == name_id) + lo).tolist()
+            del names  # Drop the buffer export so the mmap can be closed
+            return indices
+        names = self.column('name')
+        try:
+            return [i for i in range(lo, hi) if names[i] == name_id]
+        finally:
+            names.release()
+    
+    def read(self, indices: List[int], fields: Sequence[str]) -> Dict[str, list]:
+        """Values of some columns at the given record indices."""
+        result = {}
+        for field in fields:
+            view = self.column(field)
+            try:
+                result[field] = [view[i] for i in indices]
+            finally:
+                view.release()
+        return result
+    
+    def flush(self) -> None:
+        self._mm.flush()
+    
+    def close(self) -> None:
+        self._mm.flush()
+        self._mm.close()
+        self._file.close()
+
+
+class NameTable:
+    """
+    Append-only app name dictionary (one name per line, id = line number).
+    The file is read and written without newline translation, so a name
+    containing a carriage return stays one line and keeps its id on restart.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._ids: Dict[str, int] = {}
+        self.names: List[str] = []
+        if os.path.exists(path):
+            with open(path, encoding='utf-8', newline='\n') as f:
+                for line in f:
+                    self._register(line[:-1] if line.endswith('\n') else line)
+        self._file = open(path, 'a', encoding='utf-8', newline='\n')
+    
+    def _register(self, name: str) -> int:
+        self._ids[name] = len(self.names)
+        self.names.append(name)
+        return self._ids[name]
+    
+    def get(self, name: str) -> Optional[int]:
+        return self._ids.get(name)
+    
+    def intern(self, name: str) -> int:
+        """Id of a name, appending it to the file if new."""
+        name_id = self._ids.get(name)
+        if name_id is None:
+            name = name.replace('\n', ' ')
+            name_id = self._ids.get(name)
+            if name_id is None:
+                name_id = self._register(name)
+                self._file.write(name + '\n')
+                self._file.flush()
+        return name_id
+    
+    def close(self) -> None:
+        self._file.close()
+
+
+def _rollup(records: Iterable[tuple], bucket_fn: Callable[[float], float]) -> List[tuple]:
+    """
+    Aggregate (ts, name_id, count, *16 stats) records per (bucket_fn(ts), name_id).
+    min/max are exact, avg is count-weighted; p95 is exact when the bucket holds
+    only raw values and the largest input p95 otherwise.
+    """
+    buckets: Dict[Tuple[float, int], list] = {}
+    for record in records:
+        key = (bucket_fn(record[0]), record[1])
+        buckets.setdefault(key, []).append(record)
+    
+    result = []
+    for (ts, name_id), group in sorted(buckets.items()):
+        total = sum(r[2] for r in group)
+        row = [ts, name_id, total]
+        for m in range(len(METRICS)):
+            base = 3 + m * len(STATS)
+            mins = [r[base] for r in group]
+            maxs = [r[base + 1] for r in group]
+            avg = sum(r[base + 2] * r[2] for r in group) / total
+            if total == len(group):  # All raw values: exact nearest-rank p95
+                values = sorted(r[base + 2] for r in group)
+                p95 = values[max(int(math.ceil(0.95 * len(values))) - 1, 0)]
+            else:
+                p95 = max(r[base + 3] for r in group)
+            row.extend((min(mins), max(maxs), avg, p95))
+        result.append(tuple(row))
+    return result
+
+
+class MetricStore:
+    """
+    Persistent per-app metric store made of memory-mapped segments.
+    
+    Usage:
+        store = MetricStore("data/metrics")
+        store.append(time.time(), apps)              # once per collection cycle
+        store.query("chrome", start, end, points=200)
+        store.compact()                              # periodically, off the event loop
+    """
+    
+    def __init__(self, directory: str, levels: Sequence[Tuple[float, float]] = DEFAULT_LEVELS,
+                 raw_capacity: int = 262144, rollup_capacity: int = 65536,
+                 segment_span: float = 3600.0):
+        """
+        Args:
+            directory: Directory holding the segment files (created if missing)
+            levels: (resolution, retention) per level in seconds; level 0 is raw
+                (resolution 0); data older than the last retention is deleted
+            raw_capacity: Records per raw segment
+            rollup_capacity: Records per rollup segment
+            segment_span: Maximum seconds covered by one raw segment, so that
+                compaction can release raw data in small steps
+        """
+        self.directory = directory
+        self.levels = tuple(levels)
+        self.raw_capacity = raw_capacity
+        self.rollup_capacity = rollup_capacity
+        self.segment_span = segment_span
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # Queries and exports read pinned segments outside the lock; a pinned
+        # segment removed by compaction is only closed once it is unpinned
+        self._pinned = 0
+        self._idle = threading.Condition(self._lock)
+        self._names = NameTable(os.path.join(directory, 'names.txt'))
+        self._segments: List[List[Segment]] = [[] for _ in self.levels]
+        self._next_id = 0
+        self._compactor: Optional[asyncio.Task] = None
+        # A long compaction only delays the next one, not sampling or queries
+        self._compact_executor = dedicated_executor("compactor")
+        self._stats = {'records_written': 0, 'segments_compacted': 0, 'segments_deleted': 0}
+        self._recover()
+    
+    def _recover(self) -> None:
+        """Reopen existing segments; only their headers are read."""
+        for filename in sorted(os.listdir(self.directory)):
+            if not filename.endswith('.seg'):
+                continue
+            path = os.path.join(self.directory, filename)
+            try:
+                segment = Segment.open(path)
+            except (OSError, ValueError, struct.error) as e:
+                print(f"Warning: Skipping unreadable segment {filename}: {str(e)}")
+                continue
+            if segment.level >= len(self.levels):
+                segment.close()
+                continue
+            self._segments[segment.level].append(segment)
+            self._next_id = max(self._next_id, int(filename.split('-')[1].split('.')[0]) + 1)
+        for segments in self._segments:
+            segments.sort(key=lambda s: s.first_ts)
+    
+    def _new_segment(self, level: int) -> Segment:
+        path = os.path.join(self.directory, f"L{level}-{self._next_id:08d}.seg")
+        self._next_id += 1
+        capacity = self.raw_capacity if level == 0 else self.rollup_capacity
+        segment = Segment.create(path, level, self.levels[level][0], capacity)
+        self._segments[level].append(segment)
+        return segment
+    
+    def _append(self, level: int, rows: List[tuple], span: Optional[float] = None) -> None:
+        while rows:
+            segments = self._segments[level]
+            active = segments[-1] if segments else None
+            if (active is None or active.full or
+                    (span is not None and active.count and rows[0][0] - active.first_ts >= span)):
+                active = self._new_segment(level)
+            written = active.append_many(rows)
+            rows = rows[written:]
+    
+    def append(self, timestamp: float, apps: Iterable) -> None:
+        """
+        Append one collection cycle as raw records.
+        
+        Args:
+            timestamp: Wall-clock time of the sample
+            apps: Objects with name, pid, cpu, memory, incoming and outgoing attributes
+        """
+        with self._lock:
+            intern = self._names.intern
+            rows = [(timestamp, intern(app.name), app.pid, app.cpu, app.memory,
+                     app.incoming, app.outgoing) for app in apps]
+            self._append(0, rows, span=self.segment_span)
+            self._stats['records_written'] += len(rows)
+    
+    def compact(self, now: float) -> None:
+        """
+        Roll segments older than their level's retention into the next level
+        and delete them; the last level's expired segments are just deleted.
+        Meant to run on a worker thread.
+        """
+        for level, (_, retention) in enumerate(self.levels):
+            cutoff = now - retention
+            with self._lock:
+                # The active raw segment is still being appended to
+                candidates = self._segments[level][:-1] if level == 0 else self._segments[level]
+                expired = [s for s in candidates if s.last_ts < cutoff]
+            for segment in expired:
+                if level + 1 < len(self.levels):
+                    resolution = self.levels[level + 1][0]
+                    rows = _rollup(self._records(segment),
+                                   lambda ts: math.floor(ts / resolution) * resolution)
+                    with self._lock:
+                        self._append(level + 1, rows)
+                        self._stats['segments_compacted'] += 1
+                with self._lock:
+                    self._segments[level].remove(segment)
+                    if segment.pins:
+                        segment.retired = True
+                    else:
+                        self._delete(segment)
+        with self._lock:
+            for segments in self._segments:
+                for segment in segments[-1:]:
+                    segment.flush()
+    
+    def _delete(self, segment: Segment) -> None:
+        """Close and remove a segment file (caller holds the lock)."""
+        segment.close()
+        os.remove(segment.path)
+        self._stats['segments_deleted'] += 1
+    
+    def _pin(self, segments: List[Segment]) -> None:
+        """Keep segments open while they are read without the lock (caller holds the lock)."""
+        for segment in segments:
+            segment.pins += 1
+        self._pinned += len(segments)
+    
+    def _unpin(self, segments: List[Segment]) -> None:
+        """Release pinned segments, deleting those compacted away meanwhile."""
+        with self._lock:
+            for segment in segments:
+                segment.pins -= 1
+                if segment.retired and not segment.pins:
+                    self._delete(segment)
+            self._pinned -= len(segments)
+            if not self._pinned:
+                self._idle.notify_all()
+    
+    def _records(self, segment: Segment, indices: Optional[List[int]] = None) -> List[tuple]:
+        """Records of a segment in rollup shape (ts, name_id, count, *16 stats)."""
+        if indices is None:
+            indices = list(range(segment.count))
+        if segment.level > 0:
+            values = segment.read(indices, [name for name, _ in ROLLUP_COLUMNS])
+            return list(zip(*(values[name] for name, _ in ROLLUP_COLUMNS)))
+        values = segment.read(indices, ['ts', 'name'] + list(METRICS))
+        records = []
+        for i in range(len(indices)):
+            row = [values['ts'][i], values['name'][i], 1]
+            for metric in METRICS:
+                value = values[metric][i]
+                row.extend((value, value, value, value))
+            records.append(tuple(row))
+        return records
+    
+    def query(self, name: str, start: float, end: float, points: int = 200) -> Optional[dict]:
+        """
+        Stored history of one app between two timestamps, in at most `points` buckets.
+        
+        Returns:
+            dict with step_seconds, timestamps and min/max/avg/p95 lists per
+            metric (None for empty buckets), or None if the app was never stored
+        """
+        with self._lock:
+            name_id = self._names.get(name)
+            if name_id is None:
+                return None
+            overlapping = [segment for segments in self._segments for segment in segments
+                           if segment.count and segment.first_ts <= end and segment.last_ts >= start]
+            self._pin(overlapping)
+        
+        # Scanned without the lock, so appends are not held up by long queries;
+        # records appended meanwhile are only visible once committed (count)
+        records = []
+        try:
+            for segment in overlapping:
+                check_deadline()
+                records.extend(self._records(segment, segment.rows_for(name_id, start, end)))
+        finally:
+            self._unpin(overlapping)
+        
+        step = max((end - start) / max(points, 1), 1.0)
+        count = max(int(math.ceil((end - start) / step)), 1)
+        buckets = {int(row[0]): row for row in _rollup(
+            records, lambda ts: min(int((ts - start) // step), count - 1))}
+        
+        result = {"name": name, "step_seconds": round(step, 3),
+                  "timestamps": [round(start + i * step, 3) for i in range(count)]}
+        for m, metric in enumerate(METRICS):
+            columns = {}
+            for s, stat in enumerate(STATS):
+                field = 3 + m * len(STATS) + s
+                columns[stat] = [round(buckets[i][field], 2) if i in buckets else None
+                                 for i in range(count)]
+            result[metric] = columns
+        return result
+    
+    def export_rows(self, start: float, end: float, names: Optional[Iterable[str]] = None,
+                    batch_size: int = 4096) -> Iterator[tuple]:
+        """
+        Stream stored records between two timestamps, oldest level first.
+        The segments overlapping the range are pinned for the whole export
+        and read up to the record count they had when it started, so a
+        compaction running meanwhile neither drops nor duplicates rows.
+        Records are read in batches of `batch_size` without the lock, so
+        memory stays constant and appends or compaction are not delayed.
+        
+        Args:
+            start: Unix time of the first record
+            end: Unix time of the last record
+            names: Apps to export (None = all)
+            batch_size: Records read at a time
+        
+        Yields:
+            tuple: (timestamp, name, resolution, cpu, memory, incoming,
+            outgoing); resolution is 0 for raw samples, rollups give averages
+        """
+        with self._lock:
+            name_ids = None
+            if names is not None:
+                name_ids = {self._names.get(name) for name in names} - {None}
+            segments = [(level, segment, segment.count)
+                        for level in reversed(range(len(self.levels)))
+                        for segment in self._segments[level]
+                        if segment.count and segment.first_ts <= end and segment.last_ts >= start]
+            self._pin([segment for _, segment, _ in segments])
+        
+        try:
+            for level, segment, count in segments:
+                yield from self._export_segment(level, segment, count, start, end, name_ids, batch_size)
+        finally:
+            self._unpin([segment for _, segment, _ in segments])
+    
+    def _export_segment(self, level: int, segment: Segment, count: int, start: float, end: float,
+                        name_ids: Optional[set], batch_size: int) -> Iterator[tuple]:
+        """Export rows of one pinned segment among its first `count` records."""
+        resolution = self.levels[level][0]
+        fields = ['ts', 'name'] + (list(METRICS) if level == 0 else [f"{m}_avg" for m in METRICS])
+        ts = segment.column('ts')
+        try:
+            lo = bisect.bisect_left(ts, start, 0, count)
+            hi = bisect.bisect_right(ts, end, lo, count)
+        finally:
+            ts.release()
+        
+        for batch_start in range(lo, hi, batch_size):
+            values = segment.read(list(range(batch_start, min(batch_start + batch_size, hi))), fields)
+            with self._lock:
+                table = self._names.names
+            columns = [values[field] for field in fields[2:]]
+            for i, (ts, name_id) in enumerate(zip(values['ts'], values['name'])):
+                if name_ids is not None and name_id not in name_ids:
+                    continue
+                yield (ts, table[name_id], resolution, *(round(column[i], 2) for column in columns))
+    
+    async def _compact_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await run_in_executor(self.compact, time.time(), executor=self._compact_executor)
+            except Exception as e:
+                print(f"Warning: Metric store compaction failed: {str(e)}")
+    
+    def start_compactor(self, interval: float = 300.0) -> None:
+        """Periodically run compact() on the store's own worker thread."""
+        if self._compactor is None or self._compactor.done():
+            self._compactor = asyncio.get_running_loop().create_task(self._compact_loop(interval))
+    
+    async def stop_compactor(self) -> None:
+        """Cancel the periodic compaction."""
+        if self._compactor is None:
+            return
+        self._compactor.cancel()
+        try:
+            await self._compactor
+        except asyncio.CancelledError:
+            pass
+        self._compactor = None
+    
+    def close(self) -> None:
+        """
+        Flush and close every segment (after a compaction still running, and
+        after readers release their segments, for at most 5 seconds).
+        Blocks meanwhile: call it on a worker thread.
+        """
+        self._compact_executor.shutdown(wait=True)
+        with self._lock:
+            # Give queries and exports still reading a moment to let go
+            self._idle.wait_for(lambda: not self._pinned, timeout=5.0)
+            for segments in self._segments:
+                for segment in segments:
+                    segment.close()
+                segments.clear()
+            self._names.close()
+    
+    def get_stats(self) -> dict:
+        """Get store statistics for monitoring."""
+        with self._lock:
+            levels = []
+            for (resolution, retention), segments in zip(self.levels, self._segments):
+                levels.append({
+                    'resolution_seconds': resolution,
+                    'retention_seconds': retention,
+                    'segments': len(segments),
+                    'records': sum(s.count for s in segments),
+                    'bytes': sum(s.size for s in segments),
+                    'oldest': min((s.first_ts for s in segments if s.count), default=None)
+                })
+            return {
+                'directory': self.directory,
+                'levels': levels,
+                'app_names': len(self._names.names),
+                'records_written': self._stats['records_written'],
+                'segments_compacted': self._stats['segments_compacted'],
+                'segments_deleted': self._stats['segments_deleted']
+            }
@@ -0,0 +1,202 @@
+"""
+Server-Sent Events stream of dashboard samples for System Pulse.
+Each client receives one full snapshot, then only per-app deltas at the
+sampler cadence. Payloads are encoded once per (base, target) sample pair
+and shared by every client that is up to date. Payloads use the same
+compact JSON encoder as the polling endpoints (backend.responses).
+"""
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from .records import APP_FIELDS, AppRecord
+from .responses import encode_json
+from .sampler import BackgroundSampler, Sample
+
+# Fields compared when diffing two versions of the same app
+DIFF_FIELDS = tuple(field for field in APP_FIELDS if field != "name")
+
+
+def sse_event(event: str, data: bytes) -> bytes:
+    """Format one Server-Sent Event (data must be single-line JSON)."""
+    return b"event: " + event.encode() + b"\ndata: " + data + b"\n\n"
+
+
+def diff_app(old: AppRecord, new: AppRecord) -> Optional[dict]:
+    """
+    Fields of an app that changed between two samples.
+    
+    Returns:
+        dict with "name" plus changed fields, or None if nothing changed
+    """
+    changed = {k: getattr(new, k) for k in DIFF_FIELDS if getattr(old, k) != getattr(new, k)}
+    if not changed:
+        return None
+    changed["name"] = new.name
+    return changed
+
+
+class SampleStream:
+    """
+    Fan-out of sampler snapshots to streaming clients.
+    
+    Backpressure: a client's generator only resumes once its previous event was
+    sent, and then jumps straight to the latest sample (drop-to-latest). A slow
+    client therefore skips intermediate samples and receives one delta against
+    the last sample it actually got, never a growing queue.
+    
+    Usage:
+        stream = SampleStream(sampler, monitor_fn=build_self_monitor)
+        return StreamingResponse(stream.events(request), media_type="text/event-stream")
+    """
+    
+    def __init__(self, sampler: BackgroundSampler, monitor_fn: Optional[Callable[[], dict]] = None,
+                 monitor_interval: float = 5.0, keepalive_interval: float = 15.0,
+                 max_cached_payloads: int = 8):
+        """
+        Args:
+            sampler: Background sampler publishing the samples
+            monitor_fn: Optional function building the self-monitor payload
+            monitor_interval: Minimum seconds between monitor events
+            keepalive_interval: Seconds without data before a keepalive comment
+            max_cached_payloads: Encoded payloads kept for reuse across clients
+        """
+        self.sampler = sampler
+        self.monitor_fn = monitor_fn
+        self.monitor_interval = monitor_interval
+        self.keepalive_interval = keepalive_interval
+        self.max_cached_payloads = max_cached_payloads
+        self._payloads = OrderedDict()   # (kind, base_version, version) -> bytes
+        self._app_maps = OrderedDict()   # version -> {name: AppRecord}
+        self._monitor_payload: Optional[bytes] = None
+        self._monitor_at = 0.0
+        self._stats = {
+            'active_clients': 0,
+            'total_clients': 0,
+            'snapshots_sent': 0,
+            'deltas_sent': 0,
+            'samples_skipped': 0,
+            'payloads_encoded': 0
+        }
+    
+    def _remember(self, cache: OrderedDict, key, value):
+        cache[key] = value
+        while len(cache) > self.max_cached_payloads:
+            cache.popitem(last=False)
+        return value
+    
+    def _app_map(self, sample: Sample) -> Dict[str, AppRecord]:
+        cached = self._app_maps.get(sample.version)
+        if cached is None:
+            cached = self._remember(self._app_maps, sample.version,
+                                    {app.name: app for app in sample.apps.unordered()})
+        return cached
+    
+    def snapshot_payload(self, sample: Sample) -> bytes:
+        """Encoded full snapshot event for a sample (shared by all clients)."""
+        key = ('snapshot', 0, sample.version)
+        payload = self._payloads.get(key)
+        if payload is None:
+            self._stats['payloads_encoded'] += 1
+            payload = self._remember(self._payloads, key, sse_event('snapshot', encode_json({
+                "version": sample.version,
+                "timestamp": sample.timestamp,
+                "apps": [app.to_dict() for app in sample.apps.ranked()]
+            })))
+        return payload
+    
+    def delta_payload(self, base: Sample, sample: Sample) -> Optional[bytes]:
+        """
+        Encoded delta event turning `base` into `sample`, or None if nothing changed.
+        Consecutive samples use the collector's change set; otherwise both
+        samples are diffed in full (for clients that fell behind, and after a
+        failed collection, whose sample has no change set).
+        """
+        key = ('delta', base.version, sample.version)
+        if key in self._payloads:
+            return self._payloads[key]
+        
+        old_apps = self._app_map(base)
+        new_apps = self._app_map(sample)
+        changes = sample.changes
+        if changes is not None and sample.version == base.version + 1:
+            added_names = [n for n in changes.added if n in new_apps]
+            removed_names = [n for n in changes.removed if n in old_apps]
+            candidates = changes.updated
+        else:
+            added_names = [n for n in new_apps if n not in old_apps]
+            removed_names = [n for n in old_apps if n not in new_apps]
+            candidates = [n for n in new_apps if n in old_apps]
+        
+        updated = []
+        for name in candidates:
+            old, new = old_apps.get(name), new_apps.get(name)
+            if old is None or new is None or old is new:
+                continue
+            changed = diff_app(old, new)
+            if changed is not None:
+                updated.append(changed)
+        
+        payload = None
+        if added_names or removed_names or updated:
+            self._stats['payloads_encoded'] += 1
+            payload = sse_event('delta', encode_json({
+                "version": sample.version,
+                "base": base.version,
+                "timestamp": sample.timestamp,
+                "total": len(sample.apps),
+                "added": [new_apps[n].to_dict() for n in added_names],
+                "removed": removed_names,
+                "updated": updated
+            }))
+        return self._remember(self._payloads, key, payload)
+    
+    def monitor_payload(self) -> Optional[bytes]:
+        """Encoded self-monitor event, rebuilt at most every monitor_interval."""
+        if self.monitor_fn is None:
+            return None
+        now = time.monotonic()
+        if self._monitor_payload is None or now - self._monitor_at >= self.monitor_interval:
+            self._monitor_at = now
+            self._monitor_payload = sse_event('monitor', encode_json(self.monitor_fn()))
+        return self._monitor_payload
+    
+    async def events(self, request):
+        """
+        Async generator of SSE bytes for one client.
+        
+        Args:
+            request: Starlette request, polled for client disconnects
+        """
+        self._stats['active_clients'] += 1
+        self._stats['total_clients'] += 1
+        try:
+            sample = await self.sampler.get_sample()
+            yield b"retry: 3000\n\n" + self.snapshot_payload(sample)
+            self._stats['snapshots_sent'] += 1
+            sent = sample
+            monitor_sent_at = None
+            
+            while not await request.is_disconnected():
+                monitor = self.monitor_payload()
+                if monitor is not None and monitor_sent_at != self._monitor_at:
+                    monitor_sent_at = self._monitor_at
+                    yield monitor
+                
+                latest = await self.sampler.wait_for_newer(sent.version, timeout=self.keepalive_interval)
+                if latest is None:
+                    yield b": keepalive\n\n"
+                    continue
+                
+                self._stats['samples_skipped'] += latest.version - sent.version - 1
+                payload = self.delta_payload(sent, latest)
+                sent = latest
+                if payload is not None:
+                    self._stats['deltas_sent'] += 1
+                    yield payload
+        finally:
+            self._stats['active_clients'] -= 1
+    
+    def get_stats(self) -> dict:
+        """Get stream statistics for monitoring."""
+        return dict(self._stats)
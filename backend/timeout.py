@@ -1,11 +1,22 @@
 """
-Request timeout protection.
+Request timeout protection and deadline propagation.
 Prevents requests from hanging indefinitely and consuming resources.
+
+Every timed request gets a Deadline, held in a context variable, so the
+handler, the work it runs through backend.async_ops.run_in_executor (the
+context is copied into the worker thread) and the collectors it calls can
+check how much time is left and stop early. When the budget runs out, queued
+executor work is dropped and running work is told to stop at its next
+check_deadline(). The client receives the handler's stale fallback if it
+registered one, and a 504 otherwise.
 """
 import asyncio
+import contextvars
+import json
+import time
 from fastapi import Request
 from fastapi.responses import JSONResponse
-from typing import Callable
+from typing import Callable, Dict, Optional
 
 
 class TimeoutError(Exception):
@@ -13,6 +24,147 @@ class TimeoutError(Exception):
     pass
 
 
+class DeadlineExceeded(TimeoutError):
+    """The current request's deadline passed (raised by cooperative checks)."""
+    pass
+
+
+_stats = {
+    'requests': 0,
+    'timeouts': 0,
+    'stale_responses': 0,
+    'executor_cancelled': 0,
+    'executor_abandoned': 0,
+    'cooperative_aborts': 0
+}
+
+
+class Deadline:
+    """
+    Time budget of one request.
+    
+    Attributes:
+        budget: Seconds the request was given
+        expires_at: time.monotonic() value at which the budget runs out
+        cancelled: Set once the request timed out (or its work was cancelled)
+        fallback: Optional callable returning a stale Response to serve
+            instead of a 504 (see set_stale_fallback)
+    """
+    
+    __slots__ = ('budget', 'expires_at', 'cancelled', 'fallback')
+    
+    def __init__(self, budget: float):
+        self.budget = budget
+        self.expires_at = time.monotonic() + budget
+        self.cancelled = False
+        self.fallback: Optional[Callable] = None
+    
+    def remaining(self) -> float:
+        """Seconds left (0.0 once expired or cancelled)."""
+        if self.cancelled:
+            return 0.0
+        return max(self.expires_at - time.monotonic(), 0.0)
+    
+    def expired(self) -> bool:
+        """True once the budget ran out or the request was cancelled."""
+        return self.cancelled or time.monotonic() >= self.expires_at
+    
+    def check(self) -> None:
+        """
+        Cooperative cancellation point.
+        
+        Raises:
+            DeadlineExceeded: The budget ran out or the request was cancelled
+        """
+        if self.expired():
+            _stats['cooperative_aborts'] += 1
+            raise DeadlineExceeded(f"Request exceeded its {self.budget:g} second budget")
+    
+    def cancel_work(self, future) -> None:
+        """
+        Cancel executor work of this request: drop it if it is still queued,
+        otherwise let it stop at its next check().
+        
+        Args:
+            future: concurrent.futures.Future of the work
+        """
+        self.cancelled = True
+        if future.cancel():
+            _stats['executor_cancelled'] += 1
+        elif not future.done():
+            _stats['executor_abandoned'] += 1
+
+
+_current: contextvars.ContextVar = contextvars.ContextVar('system_pulse_deadline', default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Deadline of the request being served, or None outside timed requests."""
+    return _current.get()
+
+
+def clear_deadline() -> None:
+    """
+    Detach the current context from its request's deadline.
+    For shared work (e.g. a sampler collection started by a request) that
+    must not be cut short by that one request's budget.
+    """
+    _current.set(None)
+
+
+def time_remaining(default: Optional[float] = None, reserve: float = 0.0) -> Optional[float]:
+    """
+    Seconds left for the current request.
+    
+    Args:
+        default: Returned when there is no deadline
+        reserve: Seconds kept back for building the response
+    
+    Returns:
+        Remaining seconds minus `reserve` (at least 0.0), or `default`
+    """
+    deadline = _current.get()
+    if deadline is None:
+        return default
+    return max(deadline.remaining() - reserve, 0.0)
+
+
+def deadline_expired() -> bool:
+    """True if the current request's deadline passed (False without a deadline)."""
+    deadline = _current.get()
+    return deadline is not None and deadline.expired()
+
+
+def check_deadline() -> None:
+    """
+    Cooperative cancellation point for handlers and blocking work.
+    
+    Raises:
+        DeadlineExceeded: The current request's deadline passed
+    """
+    deadline = _current.get()
+    if deadline is not None:
+        deadline.check()
+
+
+def set_stale_fallback(fallback: Callable) -> None:
+    """
+    Register what to serve if the current request runs out of time.
+    
+    Args:
+        fallback: Returns a Response with stale (or partial) data, or None
+            if there is nothing to fall back to (the client then gets a 504)
+    """
+    deadline = _current.get()
+    if deadline is not None:
+        deadline.fallback = fallback
+
+
+def get_timeout_stats() -> dict:
+    """Get request timeout and cancellation counters for monitoring."""
+    return dict(_stats)
+
+
 async def timeout_middleware(request: Request, call_next: Callable, timeout_seconds: float = 5.0):
     """
     Middleware to enforce request timeouts.
@@ -50,12 +202,35 @@ class RequestTimeoutMiddleware:
     """
     ASGI middleware for request timeout protection.
     Usage in main.py:
-        app.add_middleware(RequestTimeoutMiddleware, timeout_seconds=5.0)
+        app.add_middleware(RequestTimeoutMiddleware, timeout_seconds=5.0,
+                           route_budgets={"/api/dashboard": 3.0})
+    
+    Paths starting with any of `exclude_prefixes` are not timed out
+    (static files, long-lived streaming responses). Other paths get the
+    budget of their longest matching `route_budgets` prefix, or
+    `timeout_seconds`.
+    
+    A request is never run twice: errors propagate to the normal error
+    handling. An error raised after the deadline passed counts as a timeout,
+    because cancelled work fails in whatever way it was interrupted.
     """
     
-    def __init__(self, app, timeout_seconds: float = 5.0):
+    def __init__(self, app, timeout_seconds: float = 5.0, exclude_prefixes: tuple = ("/static/",),
+                 route_budgets: Optional[Dict[str, float]] = None):
         self.app = app
         self.timeout_seconds = timeout_seconds
+        self.exclude_prefixes = tuple(exclude_prefixes)
+        # Longest prefix first, so the most specific budget wins
+        self.route_budgets = sorted((route_budgets or {}).items(), key=lambda item: -len(item[0]))
+    
+    def budget_for(self, path: str) -> Optional[float]:
+        """Seconds a path may take, or None if it is not timed out."""
+        if path.startswith(self.exclude_prefixes):
+            return None
+        for prefix, seconds in self.route_budgets:
+            if path.startswith(prefix):
+                return seconds
+        return self.timeout_seconds
     
     async def __call__(self, scope, receive, send):
         if scope["type"] != "http":
@@ -63,29 +238,58 @@ class RequestTimeoutMiddleware:
             await self.app(scope, receive, send)
             return
         
-        # Skip timeout for static files (they should load quickly)
-        path = scope.get("path", "")
-        if path.startswith("/static/"):
+        # Skip timeout for static files (they should load quickly) and streams
+        budget = self.budget_for(scope.get("path", ""))
+        if budget is None:
             await self.app(scope, receive, send)
             return
         
+        deadline = Deadline(budget)
+        response_started = False
+        
+        async def send_tracked(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+        
+        _stats['requests'] += 1
+        token = _current.set(deadline)
         try:
-            # Wrap the app call with timeout
-            await asyncio.wait_for(
-                self.app(scope, receive, send),
-                timeout=self.timeout_seconds
-            )
-        except asyncio.TimeoutError:
-            # Send timeout response
-            await send({
-                "type": "http.response.start",
-                "status": 504,
-                "headers": [[b"content-type", b"application/json"]],
-            })
-            await send({
-                "type": "http.response.body",
-                "body": b'{"error":"Request timeout","message":"Request exceeded timeout limit"}',
-            })
+            # The handler task copies the context, so it sees the deadline
+            await asyncio.wait_for(self.app(scope, receive, send_tracked), timeout=budget)
+            return
+        except (asyncio.TimeoutError, DeadlineExceeded):
+            pass
         except Exception:
-            # Let other exceptions be handled by normal error handling
-            await self.app(scope, receive, send)
+            if not deadline.expired() or response_started:
+                raise
+        finally:
+            _current.reset(token)
+        
+        deadline.cancelled = True
+        _stats['timeouts'] += 1
+        if response_started:
+            # Headers are already out: the response can only be cut short
+            return
+        
+        if deadline.fallback is not None:
+            response = deadline.fallback()
+            if response is not None:
+                _stats['stale_responses'] += 1
+                await response(scope, receive, send)
+                return
+        
+        await send({
+            "type": "http.response.start",
+            "status": 504,
+            "headers": [[b"content-type", b"application/json"]],
+        })
+        await send({
+            "type": "http.response.body",
+            "body": json.dumps({
+                "error": "Request timeout",
+                "message": f"Request exceeded its {budget:g} second budget",
+                "timeout_seconds": budget
+            }).encode(),
+        })
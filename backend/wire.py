@@ -0,0 +1,153 @@
+"""
+Binary columnar wire format for System Pulse (media type COLUMNS_MEDIA_TYPE).
+A JSON payload's row lists and value lists are sent as typed columns that
+the browser maps straight onto TypedArrays (see static/js/wire.js); strings
+are replaced by indices into one shared string table.
+
+Layout (little-endian):
+    magic b'SPC1', uint32 header length, header (UTF-8 JSON), padding to 8
+    column bodies, each starting at an 8-byte aligned offset
+    string table: uint32 offsets (count + 1), then the UTF-8 bytes
+
+Header:
+    {"meta": {scalar fields},
+     "tables": {field: {"rows": n, "columns": {column: {"type", "offset"}}}},
+     "arrays": {field or "field.key": {"type", "offset", "count"}},
+     "strings": {"count", "offsets", "data", "length"}}
+Offsets are relative to the first byte after the header padding.
+
+Column types: u8 (booleans), u32, i32, f32, f64 (None becomes NaN) and str
+(uint32 string indices, 0xFFFFFFFF for None).
+"""
+import json
+import struct
+import sys
+from array import array
+from itertools import accumulate
+from operator import itemgetter
+from typing import Any, Dict, List, Sequence, Tuple
+
+COLUMNS_MEDIA_TYPE = "application/vnd.system-pulse.columns"
+
+MAGIC = b'SPC1'
+NULL_STRING = 0xFFFFFFFF
+# Largest magnitude stored as float32 (integers up to 2^24 stay exact)
+F32_LIMIT = float(1 << 24)
+
+_ARRAY_CODES = {'u8': 'B', 'u32': 'I', 'i32': 'i', 'f32': 'f', 'f64': 'd'}
+NAN = float('nan')
+NoneType = type(None)
+
+
+def column_type(values: Sequence) -> str:
+    """Narrowest column type holding every value of a column."""
+    kinds = set(map(type, values))
+    nullable = NoneType in kinds
+    kinds.discard(NoneType)
+    if kinds == {str}:
+        return 'str'
+    if kinds == {bool}:
+        return 'f64' if nullable else 'u8'
+    if kinds == {int} and not nullable:
+        low, high = min(values), max(values)
+        if low >= 0 and high <= 0xFFFFFFFF:
+            return 'u32'
+        if low >= -0x80000000 and high <= 0x7FFFFFFF:
+            return 'i32'
+        return 'f64'
+    if kinds <= {int, float, bool}:
+        present = [v for v in values if v is not None] if nullable else values
+        if not present:
+            return 'f32'
+        magnitude = max(max(present), -min(present))  # NaN here only widens to f64
+        return 'f32' if magnitude < F32_LIMIT else 'f64'
+    raise TypeError(f"Cannot encode a column of {', '.join(sorted(k.__name__ for k in kinds))}")
+
+
+class _Writer:
+    """Accumulates aligned column bodies and the shared string table."""
+    
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.size = 0
+        self.strings: Dict[str, int] = {}
+    
+    def _append(self, data: bytes) -> int:
+        padding = -self.size % 8
+        if padding:
+            self.chunks.append(b'\0' * padding)
+            self.size += padding
+        offset = self.size
+        self.chunks.append(data)
+        self.size += len(data)
+        return offset
+    
+    def column(self, values: Sequence) -> Tuple[str, int]:
+        """Append one column; returns (type, offset)."""
+        kind = column_type(values)
+        if kind == 'str':
+            strings = self.strings
+            distinct = dict.fromkeys(values)
+            for value in distinct:
+                if value is not None and value not in strings:
+                    strings[value] = len(strings)
+            lookup = {**strings, None: NULL_STRING} if None in distinct else strings
+            data = array('I', map(lookup.__getitem__, values))
+        elif kind in ('f32', 'f64'):
+            data = array(_ARRAY_CODES[kind], [NAN if v is None else v for v in values])
+        else:
+            data = array(_ARRAY_CODES[kind], values)
+        if sys.byteorder != 'little':
+            data.byteswap()
+        return kind, self._append(data.tobytes())
+    
+    def string_table(self) -> dict:
+        encoded = [s.encode('utf-8') for s in self.strings]
+        offsets = array('I', [0])
+        offsets.extend(accumulate(map(len, encoded)))
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+        offsets_at = self._append(offsets.tobytes())
+        data = b''.join(encoded)
+        return {"count": len(encoded), "offsets": offsets_at, "data": self._append(data),
+                "length": len(data)}
+
+
+def encode_columns(payload: Dict[str, Any]) -> bytes:
+    """
+    Encode a JSON-shaped payload in the columnar wire format.
+    
+    - lists of dicts become tables (columns taken from the first row)
+    - lists of scalars become arrays; dicts of lists become "field.key" arrays
+    - every other value is kept in the header's meta
+    
+    Raises:
+        TypeError: A column mixes strings and numbers
+    """
+    writer = _Writer()
+    meta, tables, arrays = {}, {}, {}
+    for field, value in payload.items():
+        if isinstance(value, list) and value and isinstance(value[0], dict):
+            columns = {}
+            for column in value[0]:
+                try:
+                    values = list(map(itemgetter(column), value))
+                except KeyError:
+                    values = [row.get(column) for row in value]
+                kind, offset = writer.column(values)
+                columns[column] = {"type": kind, "offset": offset}
+            tables[field] = {"rows": len(value), "columns": columns}
+        elif isinstance(value, list):
+            kind, offset = writer.column(value)
+            arrays[field] = {"type": kind, "offset": offset, "count": len(value)}
+        elif isinstance(value, dict) and value and all(isinstance(v, list) for v in value.values()):
+            for key, values in value.items():
+                kind, offset = writer.column(values)
+                arrays[f"{field}.{key}"] = {"type": kind, "offset": offset, "count": len(values)}
+        else:
+            meta[field] = value
+    
+    header = json.dumps({"meta": meta, "tables": tables, "arrays": arrays,
+                         "strings": writer.string_table()}, separators=(',', ':')).encode()
+    prefix = MAGIC + struct.pack('<I', len(header)) + header
+    return prefix + b'\0' * (-len(prefix) % 8) + b''.join(writer.chunks)
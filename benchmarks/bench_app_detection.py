@@ -0,0 +1,106 @@
+"""
+Benchmark: Linux app detection with one `which` subprocess per app vs the
+PATH index (one os.scandir per PATH directory), and app info built with a
+mappings file read per app vs the memoized mappings loader.
+
+Usage:
+    python benchmarks/bench_app_detection.py --rounds 5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app_detector  # noqa: E402
+
+
+def which_all(names) -> dict:
+    """The previous detection: one `which` fork/exec per app."""
+    found = {}
+    for name in names:
+        result = subprocess.run(['which', name], capture_output=True, text=True, timeout=2)
+        if result.returncode == 0:
+            found[name] = result.stdout.strip()
+    return found
+
+
+def index_all(names) -> dict:
+    found = {}
+    for name in names:
+        path = app_detector.find_executable(name)
+        if path is not None:
+            found[name] = path
+    return found
+
+
+def app_info_reparsing(sources) -> list:
+    """The previous get_app_info(): the mappings file is parsed once per app."""
+    apps = []
+    for exe_name, info in sources.items():
+        with open(app_detector.APP_MAPPINGS_FILE) as f:
+            icons = {k: v.get("logo", "") for k, v in json.load(f).items()}
+        apps.append({"exe_name": exe_name, "display_name": info["name"],
+                     "logo": icons.get(exe_name, ""), "logo_url": info["url"]})
+    return apps
+
+
+def best_ms(fn, rounds: int, reset=None) -> tuple:
+    timings = []
+    result = None
+    for _ in range(rounds):
+        if reset is not None:
+            reset()
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    
+    names = list(app_detector.APP_LOGO_SOURCES_LINUX)
+    directories = app_detector._path_directories()
+    print(f"{len(names)} apps, {len(directories)} PATH directories, {args.rounds} rounds (best of)")
+    print("=" * 60)
+    
+    def reset_index():
+        app_detector._PATH_INDEX["key"] = None
+    
+    which_ms, which_found = best_ms(lambda: which_all(names), args.rounds)
+    cold_ms, cold_found = best_ms(lambda: index_all(names), args.rounds, reset=reset_index)
+    warm_ms, _ = best_ms(lambda: index_all(names), args.rounds)
+    print(f"  which subprocesses   {which_ms:9.2f} ms   found {len(which_found)}")
+    print(f"  PATH index (cold)    {cold_ms:9.2f} ms   found {len(cold_found)}")
+    print(f"  PATH index (cached)  {warm_ms:9.2f} ms")
+    if which_found != cold_found:
+        print(f"  Mismatch: {sorted(set(which_found.items()) ^ set(cold_found.items()))}")
+    
+    # Mappings: write a cache file shaped like build_app_icons_dict()'s if there is none
+    sources = app_detector.ACTIVE_APP_SOURCES
+    created = not app_detector.APP_MAPPINGS_FILE.exists()
+    if created:
+        app_detector.ensure_logo_dir()
+        with open(app_detector.APP_MAPPINGS_FILE, 'w') as f:
+            json.dump({k: {"name": v["name"], "logo": "", "source": "fallback"}
+                       for k, v in sources.items()}, f, indent=2)
+    try:
+        reparse_ms, _ = best_ms(lambda: app_info_reparsing(sources), args.rounds)
+        memo_ms, _ = best_ms(app_detector.get_app_info, args.rounds)
+    finally:
+        if created:
+            os.remove(app_detector.APP_MAPPINGS_FILE)
+    print(f"  app info, parse per app  {reparse_ms:7.2f} ms")
+    print(f"  app info, memoized       {memo_ms:7.2f} ms")
+    print("=" * 60)
+    print(f"  Detection speedup: {which_ms / cold_ms:.0f}x cold, {which_ms / max(warm_ms, 1e-6):.0f}x cached")
+
+
+if __name__ == "__main__":
+    main()
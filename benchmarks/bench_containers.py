@@ -0,0 +1,85 @@
+"""
+Benchmark: per-container totals from cgroup v2 files vs per-process aggregation.
+The cgroup collector reads 4 files per container; the per-process path reads
+/proc/<pid>/stat for every process and groups them by /proc/<pid>/cgroup.
+
+Usage:
+    python benchmarks/bench_containers.py --containers 50 --procs 40 --rounds 5
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.collectors import ProcfsCollector  # noqa: E402
+from backend.containers import CgroupCollector  # noqa: E402
+from backend.grouping import ProcessGrouper  # noqa: E402
+from backend.incremental import IncrementalProcessTable  # noqa: E402
+from benchmarks.cgroupfs_fixture import advance_counters, build_fake_cgroupfs  # noqa: E402
+
+
+def time_rounds(fn, rounds: int) -> list:
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--containers", type=int, default=50)
+    parser.add_argument("--procs", type=int, default=40, help="Processes per container")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        cgroupfs = os.path.join(tmp, "cgroup")
+        procfs = os.path.join(tmp, "proc")
+        containers = build_fake_cgroupfs(cgroupfs, args.containers, args.procs, procfs_root=procfs)
+        os.makedirs(os.path.join(procfs, "self"), exist_ok=True)
+        with open(os.path.join(procfs, "self", "cgroup"), "w") as f:
+            f.write("0::/\n")
+        
+        cgroup_collector = CgroupCollector(cgroupfs, docker_root=os.path.join(tmp, "docker"))
+        cgroup_collector.collect()
+        advance_counters(cgroupfs, containers)
+        samples = []
+        
+        def cgroup_cycle():
+            samples[:] = cgroup_collector.collect()
+        
+        cgroup_timings = time_rounds(cgroup_cycle, args.rounds)
+        
+        # Per-process path, in steady state (cgroup paths already cached)
+        procfs_collector = ProcfsCollector(procfs)
+        grouper = ProcessGrouper(logo_fn=lambda name: "", procfs_path=procfs)
+        table = IncrementalProcessTable(logo_fn=lambda name: "", process_listeners=[grouper])
+        groups = {}
+        
+        def process_cycle():
+            table.update(procfs_collector.collect(), {})
+            groups.clear()
+            groups.update(grouper.group("container", table.processes(), procfs_collector.ppids))
+        
+        process_cycle()
+        process_timings = time_rounds(process_cycle, args.rounds)
+    
+    total = args.containers * args.procs
+    print(f"{args.containers} containers x {args.procs} processes ({total} processes), {args.rounds} rounds")
+    print("=" * 60)
+    for label, timings, count in (("cgroup", cgroup_timings, len(samples)),
+                                  ("per-process", process_timings, len(groups))):
+        best = min(timings) * 1000
+        mean = sum(timings) / len(timings) * 1000
+        print(f"  {label:12} best {best:8.2f} ms   mean {mean:8.2f} ms   groups {count}")
+    print("=" * 60)
+    print(f"  Speedup (best): {min(process_timings) / min(cgroup_timings):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark: full sort per request vs the shared RankedIndex.
+Ranks synthetic apps the way one sampler cycle plus dashboard requests would.
+
+Usage:
+    python benchmarks/bench_ranking.py --apps 10000 --requests 50
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.records import AppRecord  # noqa: E402
+from backend.scoring import RankedIndex, sort_processes_by_relevance  # noqa: E402
+
+PER_PAGE = 20
+
+
+def make_apps(n: int, seed: int = 42) -> list:
+    """Synthetic app records with a realistic long tail of idle processes."""
+    rng = random.Random(seed)
+    apps = []
+    for i in range(n):
+        busy = rng.random() < 0.1
+        apps.append(AppRecord(
+            name=f"app-{i}",
+            pid=1000 + i,
+            logo="",
+            incoming=rng.randint(0, 5) if busy else 0,
+            outgoing=rng.randint(0, 20) if busy else 0,
+            cpu=round(rng.uniform(0, 150), 1) if busy else round(rng.uniform(0, 0.5), 1),
+            memory=rng.uniform(1, 2000) if busy else rng.uniform(0.5, 50)
+        ))
+    return apps
+
+
+def next_cycle(apps: list, changed_fraction: float, rng: random.Random) -> list:
+    """Copy-on-write update of a fraction of the apps, like IncrementalProcessTable."""
+    result = list(apps)
+    for i in rng.sample(range(len(apps)), int(len(apps) * changed_fraction)):
+        old = apps[i]
+        result[i] = AppRecord(old.name, old.pid, old.logo, old.incoming, old.outgoing,
+                              round(rng.uniform(0, 100), 1), old.memory)
+    return result
+
+
+def best_ms(fn, rounds: int, make_cycle) -> float:
+    """Best time of fn(cycle) over `rounds` fresh cycles (built outside the timing)."""
+    timings = []
+    for _ in range(rounds):
+        cycle = make_cycle()
+        started = time.perf_counter()
+        fn(cycle)
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--apps", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=50, help="page-1 requests per sample")
+    parser.add_argument("--changed", type=float, default=0.05, help="fraction of apps changed per cycle")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    
+    rng = random.Random(7)
+    base = make_apps(args.apps)
+    RankedIndex(base)  # Score every app once, as the first cycle does
+    
+    def make_cycle():
+        return next_cycle(base, args.changed, rng)
+    
+    def make_dict_cycle():
+        # The previous pipeline: one dict per app, every dict scored per call
+        return [app.to_dict() for app in make_cycle()]
+    
+    def full_sort_per_request(cycle):
+        for _ in range(args.requests):
+            sort_processes_by_relevance(list(cycle))[:PER_PAGE]
+    
+    def ranked_index(cycle):
+        ranking = RankedIndex(cycle)
+        for _ in range(args.requests):
+            ranking.page(1, PER_PAGE)
+    
+    def single_full_sort(cycle):
+        sort_processes_by_relevance(list(cycle))
+    
+    def single_top_k(cycle):
+        RankedIndex(cycle).page(1, PER_PAGE)
+    
+    # Both approaches must agree on every page
+    cycle = make_cycle()
+    expected = [app["name"] for app in sort_processes_by_relevance([app.to_dict() for app in cycle])]
+    ranking = RankedIndex(cycle)
+    for page in (1, 2, 3):
+        names = [app.name for app in ranking.page(page, PER_PAGE)]
+        assert names == expected[(page - 1) * PER_PAGE:page * PER_PAGE]
+    
+    print(f"{args.apps} apps, {args.changed:.0%} changed per cycle, "
+          f"{args.requests} page-1 requests per sample, best of {args.rounds}")
+    print("=" * 60)
+    print(f"  score all + full sort, once     {best_ms(single_full_sort, args.rounds, make_dict_cycle):8.2f} ms")
+    print(f"  score changed + heap top-20     {best_ms(single_top_k, args.rounds, make_cycle):8.2f} ms")
+    old = best_ms(full_sort_per_request, args.rounds, make_dict_cycle)
+    new = best_ms(ranked_index, args.rounds, make_cycle)
+    print(f"  full sort per request           {old:8.2f} ms")
+    print(f"  shared RankedIndex              {new:8.2f} ms")
+    print("=" * 60)
+    print(f"  Speedup per sample: {old / new:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
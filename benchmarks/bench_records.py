@@ -0,0 +1,80 @@
+"""
+Benchmark: memory of one snapshot stored as dicts vs AppRecords, and
+allocations of one steady-state collection cycle (table update + ranking).
+
+Usage:
+    python benchmarks/bench_records.py --apps 10000 --changed 0.05
+"""
+import argparse
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.incremental import IncrementalProcessTable  # noqa: E402
+from backend.records import AppRecord  # noqa: E402
+from backend.scoring import RankedIndex  # noqa: E402
+
+
+def make_rows(n: int, rng: random.Random) -> list:
+    """Synthetic collector rows, one process per app."""
+    return [(1000 + i, 0.0, f"app-{i}", round(rng.uniform(0, 50), 1), rng.randint(1, 512) * 1024 * 1024)
+            for i in range(n)]
+
+
+def measure(fn) -> tuple:
+    """Bytes still allocated after fn() (its result is kept alive) and blocks allocated."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = fn()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, 'filename')
+    size = sum(stat.size_diff for stat in stats)
+    blocks = sum(stat.count_diff for stat in stats)
+    del result
+    return size, blocks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--apps", type=int, default=10000)
+    parser.add_argument("--changed", type=float, default=0.05, help="fraction of processes changed per cycle")
+    args = parser.parse_args()
+    
+    rng = random.Random(42)
+    rows = make_rows(args.apps, rng)
+    table = IncrementalProcessTable(logo_fn=lambda name: "")
+    table.update(rows, {})
+    RankedIndex(table.apps.values())
+    records = list(table.apps.values())
+    
+    dict_size, dict_blocks = measure(lambda: [app.to_dict() for app in records])
+    record_size, record_blocks = measure(lambda: [
+        AppRecord(a.name, a.pid, a.logo, a.incoming, a.outgoing, a.cpu, a.memory, a.relevance_score)
+        for a in records])
+    
+    def cycle():
+        changed = list(rows)
+        for i in rng.sample(range(len(rows)), int(len(rows) * args.changed)):
+            pid, create_time, name, _, rss = rows[i]
+            changed[i] = (pid, create_time, name, round(rng.uniform(0, 50), 1), rss)
+        table.update(changed, {})
+        return RankedIndex(table.apps.values())
+    
+    cycle()  # Warm up so the measured cycle is a steady-state one
+    cycle_size, cycle_blocks = measure(cycle)
+    
+    print(f"{args.apps} apps, {args.changed:.0%} changed per cycle")
+    print("=" * 60)
+    print(f"  snapshot as dicts         {dict_size / 1024:10.1f} KB  {dict_blocks:8d} blocks")
+    print(f"  snapshot as AppRecords    {record_size / 1024:10.1f} KB  {record_blocks:8d} blocks")
+    print(f"  per app: {dict_size / args.apps:.0f} B (dict) vs {record_size / args.apps:.0f} B (record)")
+    print("=" * 60)
+    print(f"  steady-state cycle retains {cycle_size / 1024:.1f} KB in {cycle_blocks} blocks")
+
+
+if __name__ == "__main__":
+    main()
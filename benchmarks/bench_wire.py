@@ -0,0 +1,77 @@
+"""
+Benchmark: /api/snapshot payload encoded as JSON vs the binary columnar wire
+format (size, gzip size and encode time), plus JSON decode time in Python
+as a rough stand-in for client-side parsing.
+
+Usage:
+    python benchmarks/bench_wire.py --rows 1000 10000 --rounds 5
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.records import AppRecord  # noqa: E402
+from backend.wire import encode_columns  # noqa: E402
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+NAMES = ["chrome", "firefox", "python3", "node", "code", "postgres", "dockerd", "systemd",
+         "kworker/0:1", "bash", "sshd", "java", "slack", "spotify", "nginx", "redis-server"]
+
+
+def make_payload(n: int, rng: random.Random) -> dict:
+    """Snapshot payload shaped like /api/snapshot (names repeat, as real apps with suffixes do)."""
+    apps = [AppRecord(f"{rng.choice(NAMES)}-{i % 500}", rng.randint(1, 4000000),
+                      f"/static/logo/linux/{rng.choice(NAMES)}.svg" if rng.random() < 0.3 else "",
+                      rng.randint(0, 40), rng.randint(0, 40), round(rng.uniform(0, 100), 1),
+                      round(rng.uniform(1, 4000), 1), round(rng.uniform(0, 1000), 2))
+            for i in range(n)]
+    return {"total": n, "filtered": n, "processes": [app.to_dict() for app in apps],
+            "page": 1, "per_page": 0, "has_more": False}
+
+
+def best_ms(fn, rounds: int) -> tuple:
+    timings = []
+    result = None
+    for _ in range(rounds):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    
+    encoders = [("json", lambda p: json.dumps(p, separators=(',', ':')).encode())]
+    if orjson is not None:
+        encoders.append(("orjson", orjson.dumps))
+    encoders.append(("columnar", encode_columns))
+    
+    rng = random.Random(42)
+    for n in args.rows:
+        payload = make_payload(n, rng)
+        print(f"{n} rows, {args.rounds} rounds (best of)")
+        print("=" * 68)
+        print(f"  {'encoding':10} {'bytes':>10} {'gzip bytes':>11} {'encode ms':>10} {'decode ms':>10}")
+        for label, encode in encoders:
+            encode_ms, body = best_ms(lambda: encode(payload), args.rounds)
+            decode = f"{best_ms(lambda: json.loads(body), args.rounds)[0]:10.2f}" if label != "columnar" else f"{'-':>10}"
+            print(f"  {label:10} {len(body):10d} {len(gzip.compress(body, 6)):11d} {encode_ms:10.2f} {decode}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
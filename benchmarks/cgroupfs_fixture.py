@@ -0,0 +1,77 @@
+"""
+Synthetic cgroup v2 fixture trees for benchmarks.
+Writes the cgroupfs files read by backend.containers.CgroupCollector, and
+optionally matching /proc/<pid>/{stat,cgroup} entries via procfs_fixture.
+"""
+import os
+import random
+
+from benchmarks.procfs_fixture import PROCESS_NAMES, write_process
+
+
+def write_container(root: str, relative: str, pids: list, usage_usec: int = 0,
+                    memory_bytes: int = 0, rbytes: int = 0, wbytes: int = 0) -> None:
+    """Write cpu.stat, memory.current, io.stat and cgroup.procs for one cgroup."""
+    directory = root + relative
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, "cpu.stat"), "w") as f:
+        f.write(f"usage_usec {usage_usec}\nuser_usec {usage_usec * 3 // 4}\n"
+                f"system_usec {usage_usec // 4}\nnr_periods 0\nnr_throttled 0\n")
+    with open(os.path.join(directory, "memory.current"), "w") as f:
+        f.write(f"{memory_bytes}\n")
+    with open(os.path.join(directory, "io.stat"), "w") as f:
+        f.write(f"8:0 rbytes={rbytes} wbytes={wbytes} rios=10 wios=5 dbytes=0 dios=0\n"
+                f"259:0 rbytes={rbytes // 2} wbytes={wbytes // 2} rios=3 wios=1 dbytes=0 dios=0\n")
+    with open(os.path.join(directory, "cgroup.procs"), "w") as f:
+        f.write("".join(f"{pid}\n" for pid in pids))
+
+
+def build_fake_cgroupfs(root: str, num_containers: int, procs_per_container: int,
+                        procfs_root: str = None, seed: int = 42) -> dict:
+    """
+    Build a cgroup v2 tree with Docker-style container scopes, plus some
+    non-container system cgroups that the collector must skip.
+    
+    Args:
+        root: cgroupfs root to create
+        num_containers: Number of container cgroups
+        procs_per_container: Processes in each container
+        procfs_root: If set, also write a fake /proc with those processes
+    
+    Returns:
+        dict: container cgroup path (relative) -> list of PIDs
+    """
+    rng = random.Random(seed)
+    os.makedirs(root, exist_ok=True)
+    with open(os.path.join(root, "cgroup.controllers"), "w") as f:
+        f.write("cpuset cpu io memory pids\n")
+    for unit in ("/system.slice/sshd.service", "/system.slice/dockerd.service", "/init.scope"):
+        write_container(root, unit, [])
+    
+    containers = {}
+    pid = 1000
+    for _ in range(num_containers):
+        full_id = "%064x" % rng.getrandbits(256)
+        relative = f"/system.slice/docker-{full_id}.scope"
+        pids = list(range(pid, pid + procs_per_container))
+        pid += procs_per_container
+        write_container(root, relative, pids, usage_usec=rng.randint(0, 10 ** 9),
+                        memory_bytes=rng.randint(10, 2000) * 1024 * 1024,
+                        rbytes=rng.randint(0, 10 ** 9), wbytes=rng.randint(0, 10 ** 9))
+        containers[relative] = pids
+        if procfs_root is not None:
+            for member in pids:
+                write_process(procfs_root, member, rng.choice(PROCESS_NAMES),
+                              utime=rng.randint(0, 100000), rss_pages=rng.randint(100, 20000))
+                with open(os.path.join(procfs_root, str(member), "cgroup"), "w") as f:
+                    f.write(f"0::{relative}\n")
+    return containers
+
+
+def advance_counters(root: str, containers: dict, seed: int = 7) -> None:
+    """Bump CPU usage and I/O bytes of every container so rates are non-zero."""
+    rng = random.Random(seed)
+    for relative, pids in containers.items():
+        write_container(root, relative, pids, usage_usec=10 ** 9 + rng.randint(0, 10 ** 6),
+                        memory_bytes=512 * 1024 * 1024,
+                        rbytes=10 ** 9 + rng.randint(0, 10 ** 6), wbytes=10 ** 9 + rng.randint(0, 10 ** 6))
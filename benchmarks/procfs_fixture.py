@@ -0,0 +1,81 @@
+"""
+Synthetic /proc-like fixture trees for benchmarks.
+Writes just enough of the Linux procfs layout for both psutil (via
+psutil.PROCFS_PATH) and backend.collectors.ProcfsCollector to read it.
+"""
+import os
+import random
+
+PROCESS_NAMES = [
+    "chrome", "firefox", "code", "python3", "node", "java", "postgres",
+    "redis-server", "nginx", "dockerd", "containerd-shim", "bash", "sshd",
+    "systemd", "kworker/0:1", "Web Content", "gnome-shell-calendar-server",
+]
+
+
+def write_process(root: str, pid: int, name: str, ppid: int = 1,
+                  utime: int = 0, stime: int = 0, rss_pages: int = 1024) -> None:
+    """Write /proc/<pid>/{stat,statm,status,cmdline} for one fake process."""
+    proc_dir = os.path.join(root, str(pid))
+    os.makedirs(proc_dir, exist_ok=True)
+    comm = name[:15]
+    starttime = 1000 + pid
+    stat = (
+        f"{pid} ({comm}) S {ppid} {pid} {pid} 0 -1 4194304 100 0 0 0 "
+        f"{utime} {stime} 0 0 20 0 1 0 {starttime} {rss_pages * 4096 * 4} {rss_pages} "
+        "18446744073709551615 0 0 0 0 0 0 0 0 0 0 0 0 17 0 0 0 0 0 0\n"
+    )
+    with open(os.path.join(proc_dir, "stat"), "w") as f:
+        f.write(stat)
+    with open(os.path.join(proc_dir, "statm"), "w") as f:
+        f.write(f"{rss_pages * 4} {rss_pages} 100 5 0 {rss_pages} 0\n")
+    with open(os.path.join(proc_dir, "status"), "w") as f:
+        f.write(f"Name:\t{comm}\nState:\tS (sleeping)\nPid:\t{pid}\nPPid:\t{ppid}\n"
+                "Uid:\t1000\t1000\t1000\t1000\nGid:\t1000\t1000\t1000\t1000\n"
+                f"Threads:\t1\nVmRSS:\t{rss_pages * 4} kB\n")
+    with open(os.path.join(proc_dir, "cmdline"), "wb") as f:
+        f.write(f"/usr/bin/{name}\0--flag\0".encode())
+
+
+def build_fake_procfs(root: str, num_processes: int, seed: int = 42) -> list:
+    """
+    Build a fake procfs tree with num_processes processes.
+    
+    Returns:
+        list: PIDs that were written
+    """
+    rng = random.Random(seed)
+    os.makedirs(root, exist_ok=True)
+    with open(os.path.join(root, "stat"), "w") as f:
+        f.write("cpu  1000 0 500 100000 0 0 0 0 0 0\nbtime 1700000000\n")
+    with open(os.path.join(root, "uptime"), "w") as f:
+        f.write("100000.00 90000.00\n")
+    os.makedirs(os.path.join(root, "self"), exist_ok=True)
+    with open(os.path.join(root, "self", "stat"), "w") as f:
+        f.write("1 (self) S 0 1 1 0 -1 0 0 0 0 0 0 0 0 0 20 0 1 0 1 0 0\n")
+    
+    pids = []
+    for pid in range(100, 100 + num_processes):
+        write_process(
+            root, pid, rng.choice(PROCESS_NAMES),
+            ppid=rng.choice(pids) if pids else 1,
+            utime=rng.randint(0, 100000), stime=rng.randint(0, 10000),
+            rss_pages=rng.randint(100, 200000),
+        )
+        pids.append(pid)
+    return pids
+
+
+def advance_cpu_times(root: str, pids: list, seed: int = 7) -> None:
+    """Bump utime/stime of every fake process so CPU deltas are non-zero."""
+    rng = random.Random(seed)
+    for pid in pids:
+        path = os.path.join(root, str(pid), "stat")
+        with open(path) as f:
+            data = f.read()
+        head, rest = data.rsplit(") ", 1)
+        fields = rest.split(" ")
+        fields[11] = str(int(fields[11]) + rng.randint(0, 50))
+        fields[12] = str(int(fields[12]) + rng.randint(0, 5))
+        with open(path, "w") as f:
+            f.write(head + ") " + " ".join(fields))
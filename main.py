@@ -1,20 +1,74 @@
 import psutil
 from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, StreamingResponse
 import os
 import time
+from contextlib import asynccontextmanager
 from datetime import datetime
+from operator import attrgetter
 from app_detector import get_detected_apps, get_app_info
-from backend.scoring import sort_processes_by_relevance
+from backend.async_ops import run_in_executor
+from backend.autocomplete import ProcessPrefixIndex
+from backend.scoring import RankedIndex
+from backend.snapshot_index import SnapshotIndex
 from backend.cache import get_cache
-from backend.timeout import RequestTimeoutMiddleware
+from backend.collectors import get_collector
+from backend.connections import get_connection_counter
+from backend.containers import CgroupCollector
+from backend.export import EXPORT_FORMATS, encode_rows, gzip_chunks
+from backend.history import DEFAULT_TIERS, MetricHistory, parse_tiers
+from backend.icons import IconResolver
+from backend.grouping import GroupingNotReady, ProcessGrouper
+from backend.incremental import IncrementalProcessTable
+from backend.process_details import ProcessDetailCache
+from backend.responses import EncodedResponseCache, negotiated_response
+from backend.sampler import BackgroundSampler
+from backend.sqlite_sink import SnapshotSink
+from backend.storage import MetricStore
+from backend.stream import SampleStream
+from backend.timeout import RequestTimeoutMiddleware, get_timeout_stats, time_remaining
 
-app = FastAPI(title="System Pulse API")
 
-# Add request timeout protection (10 seconds maximum)
-# Static file requests are excluded to prevent unnecessary timeouts on asset loads
-app.add_middleware(RequestTimeoutMiddleware, timeout_seconds=10.0)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the background sampler, cache sweeper and store compactor for the lifetime of the server."""
+    if snapshot_sink is not None:
+        snapshot_sink.start()
+    sampler.start()
+    cache.start_sweeper(interval=30.0)
+    if store is not None:
+        store.start_compactor(interval=300.0)
+    yield
+    if store is not None:
+        await store.stop_compactor()
+    await cache.stop_sweeper()
+    # Waits for a collection in flight, so nothing writes to the store or sink below
+    await sampler.stop()
+    if store is not None:
+        # Waits for a running compaction: keep it off the event loop
+        await run_in_executor(store.close)
+    if snapshot_sink is not None:
+        await run_in_executor(snapshot_sink.stop)
+
+
+app = FastAPI(title="System Pulse API", lifespan=lifespan)
+
+# Add request timeout protection (10 seconds maximum, less for routes served from
+# memory; SQLite queries get more). Handlers see their deadline, so executor
+# work is cancelled cooperatively, and polling endpoints fall back to stale data.
+# Static file requests are excluded to prevent unnecessary timeouts on asset loads,
+# and the long-lived dashboard stream and streaming exports must not be cut off
+app.add_middleware(RequestTimeoutMiddleware, timeout_seconds=10.0,
+                   exclude_prefixes=("/static/", "/api/stream", "/api/export/"),
+                   route_budgets={
+                       "/api/dashboard": 3.0,
+                       "/api/snapshot": 3.0,
+                       "/api/all-apps": 3.0,
+                       "/api/process-search": 2.0,
+                       "/api/process-details/": 3.0,
+                       "/api/stored-snapshot": 15.0
+                   })
 
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -25,11 +79,65 @@ APP_ICONS = get_detected_apps()
 DEFAULT_ICON = "" 
 ITEMS_PER_PAGE = 20
 
-# Get cache instance
+# Process name -> icon with suffix/version normalization and aliases, memoized per name
+icon_resolver = IconResolver(APP_ICONS, default=DEFAULT_ICON)
+
+# Seconds between background collections (override with SYSTEM_PULSE_SAMPLE_INTERVAL)
+SAMPLE_INTERVAL = float(os.environ.get("SYSTEM_PULSE_SAMPLE_INTERVAL", "1.0"))
+
+# Process collector: 'auto' (Linux /proc fast path when available), 'procfs' or 'psutil'
+COLLECTOR = os.environ.get("SYSTEM_PULSE_COLLECTOR", "auto")
+collector = get_collector(COLLECTOR)
+connection_counter = get_connection_counter(COLLECTOR)
+# Autocomplete index, detail cache and grouping engine of live processes, all
+# kept in sync by the process table (births, exits and renames)
+process_index = ProcessPrefixIndex(exe_fn=lambda pid: psutil.Process(pid).exe())
+detail_cache = ProcessDetailCache()
+grouper = ProcessGrouper(logo_fn=icon_resolver.resolve)
+process_table = IncrementalProcessTable(logo_fn=icon_resolver.resolve,
+                                        process_listeners=(process_index, detail_cache, grouper))
+
+# Per-container totals read from cgroup v2 files: 'auto' (when a unified
+# hierarchy is mounted) or 'off' (override with SYSTEM_PULSE_CONTAINERS)
+CONTAINERS = os.environ.get("SYSTEM_PULSE_CONTAINERS", "auto")
+container_collector = (CgroupCollector() if CONTAINERS != "off" and CgroupCollector.is_supported()
+                       else None)
+# (timestamp, [ContainerSample]) of the latest collection cycle
+container_view = (0.0, [])
+
+# Per-app metric history in rollup tiers (1s/10s/1m/1h by default), fixed-size
+# ring buffers bounded by max apps. SYSTEM_PULSE_HISTORY_TIERS takes
+# "resolution:retention" pairs in seconds, e.g. "1:600,10:7200,60:43200,3600:604800"
+HISTORY_TIERS = os.environ.get("SYSTEM_PULSE_HISTORY_TIERS")
+history = MetricHistory(
+    tiers=parse_tiers(HISTORY_TIERS) if HISTORY_TIERS else DEFAULT_TIERS,
+    max_apps=int(os.environ.get("SYSTEM_PULSE_HISTORY_MAX_APPS", "500"))
+)
+
+# Optional persistent history (memory-mapped segment files) that survives
+# restarts: raw samples for 1 hour, 1-minute rollups for 2 days, 1-hour
+# rollups for 30 days. Enabled by setting SYSTEM_PULSE_DATA_DIR.
+DATA_DIR = os.environ.get("SYSTEM_PULSE_DATA_DIR")
+store = MetricStore(os.path.join(DATA_DIR, "metrics")) if DATA_DIR else None
+
+# Optional SQLite copy of dashboard snapshots for ad-hoc analysis, written by
+# its own thread (one snapshot every SYSTEM_PULSE_SQLITE_INTERVAL seconds).
+# Enabled by setting SYSTEM_PULSE_SQLITE_PATH.
+SQLITE_PATH = os.environ.get("SYSTEM_PULSE_SQLITE_PATH")
+snapshot_sink = SnapshotSink(
+    SQLITE_PATH,
+    min_interval=float(os.environ.get("SYSTEM_PULSE_SQLITE_INTERVAL", "10.0"))
+) if SQLITE_PATH else None
+
+# Shared cache of the history queries (coalesced, stale-while-revalidate):
+# they scan many buffers or segment files, so concurrent clients share one run
 cache = get_cache()
+HISTORY_TOP_TTL = SAMPLE_INTERVAL
+STORED_HISTORY_TTL = 10.0
 
 # Self-monitoring tracking
 APP_START_TIME = time.time()
+SELF_PROCESS = psutil.Process(os.getpid())
 LAST_DEVIATION = {
     "process_name": "None",
     "metric": "N/A",
@@ -38,185 +146,551 @@ LAST_DEVIATION = {
 }
 
 
+def track_deviations(rows):
+    """
+    Record the last process using excessive resources in LAST_DEVIATION.
+    One pass over the collector rows; only the last offender is recorded.
+    
+    Args:
+        rows: Collector rows (pid, create_time, name, cpu_percent, rss_bytes)
+    """
+    global LAST_DEVIATION
+    rss_limit = 500 * 1024 * 1024
+    offender = None
+    for row in rows:
+        if row[3] > 70 or row[4] > rss_limit:  # Extreme resource use
+            offender = row
+    if offender is None:
+        return
+    _, _, name, cpu, rss = offender
+    memory = rss / (1024 * 1024)  # MB
+    severity = "critical" if (cpu > 90 or memory > 800) else "warning"
+    LAST_DEVIATION = {
+        "process_name": name,
+        "metric": f"CPU: {cpu}%" if cpu > 70 else f"Memory: {memory}MB",
+        "value": round(cpu, 1) if cpu > 70 else round(memory, 1),
+        "severity": severity,
+        "timestamp": datetime.now().isoformat()
+    }
+
+
 def collect_process_data():
     """
     Expensive operation: Collect all process and connection data.
-    This is called once and cached for 1 second to avoid redundant lookups.
+    Runs on a worker thread from the background sampler, never in a request.
     Also tracks process deviations (excessive resource use).
     
+    Processes are grouped by name to aggregate multi-process apps (like Chrome).
+    The persistent process table only re-aggregates apps whose processes
+    changed since the previous cycle, and only those are scored again (one
+    batch over the rows of its columnar app table).
+    
     Returns:
-        dict: Aggregated process data with connection info
+        tuple: (AppColumns of all apps, ChangeSet)
     """
-    global LAST_DEVIATION
-    apps = {}
+    # One row per process: (pid, create_time, name, cpu_percent, rss_bytes)
+    rows = collector.collect()
     
-    # Get network connections once (expensive call)
-    try:
-        connections = psutil.net_connections(kind='inet')
-    except (psutil.AccessDenied, OSError):
-        connections = []
+    # Connections are counted for every PID, so all processes of an app count
+    connection_counts = connection_counter.count([row[0] for row in rows])
     
-    # Pre-fetch all processes with limited scope
-    try:
-        for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_info']):
-            try:
-                pinfo = proc.info
-                name = pinfo['name']
-                pid = pinfo['pid']
-                cpu = pinfo['cpu_percent'] or 0.0
-                memory = (pinfo['memory_info'].rss / (1024 * 1024)) if pinfo['memory_info'] else 0  # MB
-                
-                # Track deviations - processes using excessive resources
-                if cpu > 70 or memory > 500:  # Extreme resource use
-                    severity = "critical" if (cpu > 90 or memory > 800) else "warning"
-                    LAST_DEVIATION = {
-                        "process_name": name,
-                        "metric": f"CPU: {cpu}%" if cpu > 70 else f"Memory: {memory}MB",
-                        "value": round(cpu, 1) if cpu > 70 else round(memory, 1),
-                        "severity": severity,
-                        "timestamp": datetime.now().isoformat()
-                    }
-                
-                # Grouping by name to aggregate stats if multi-process (like Chrome)
-                if name not in apps:
-                    apps[name] = {
-                        "name": name,
-                        "pid": pid,
-                        "logo": APP_ICONS.get(name.lower(), DEFAULT_ICON),
-                        "incoming": 0,
-                        "outgoing": 0,
-                        "cpu": cpu,
-                        "memory": memory
-                    }
-                else:
-                    # Aggregate for multi-process apps
-                    apps[name]["cpu"] += cpu
-                    apps[name]["memory"] += memory
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                pass
-    except Exception as e:
-        print(f"Warning: Error iterating processes: {str(e)}")
+    track_deviations(rows)
     
-    # Map connections to our aggregated apps
-    # Create PID -> name map first for faster lookups
-    pid_to_name = {}
-    for name, data in apps.items():
-        pid_to_name[data['pid']] = name
+    changes = process_table.update(rows, connection_counts)
+    return process_table.columns, changes
+
+
+def collect_sorted_processes():
+    """
+    Collect process data, build its relevance ranking and record it in the history
+    (and the persistent store and SQLite sink, if enabled).
+    Also ranks the process groupings that clients requested recently and
+    reads per-container totals (if enabled).
+    Called by the background sampler on a worker thread once per interval.
+    Only apps that changed since the previous cycle are scored again.
     
-    for conn in connections:
-        if conn.pid and conn.pid in pid_to_name:
-            name = pid_to_name[conn.pid]
-            if conn.status == 'LISTEN':
-                apps[name]["incoming"] += 1
-            elif conn.status == 'ESTABLISHED' and conn.raddr:
-                apps[name]["outgoing"] += 1
+    Returns:
+        tuple: (RankedIndex of all apps, ChangeSet, {mode: RankedIndex} of
+        the groupings clients asked for recently); the sampler publishes
+        them together as one Sample
+    """
+    global container_view
+    columns, changes = collect_process_data()
+    ranking = RankedIndex(columns)
+    groups = {
+        mode: RankedIndex(grouper.group(mode, process_table.processes(), collector.ppids).values())
+        for mode in grouper.wanted_modes()
+    }
+    timestamp = time.time()
+    if container_collector is not None:
+        try:
+            container_view = (timestamp, container_collector.collect())
+        except OSError as e:
+            print(f"Warning: Failed to read container cgroups: {str(e)}")
+    history.record(timestamp, ranking.unordered())
+    if store is not None:
+        try:
+            store.append(timestamp, ranking.unordered())
+        except OSError as e:
+            print(f"Warning: Failed to persist sample: {str(e)}")
+    if snapshot_sink is not None:
+        snapshot_sink.submit(timestamp, ranking.unordered())  # Never blocks
+    return ranking, changes, groups
+
+
+# Background sampler publishes a fresh ranked snapshot every SAMPLE_INTERVAL
+sampler = BackgroundSampler(collect_sorted_processes, interval=SAMPLE_INTERVAL)
+
+
+async def get_sorted_processes():
+    """
+    Get the relevance ranking from the latest background sample.
+    Only waits (off the event loop) if no sample has been published yet.
     
-    return apps
+    Returns:
+        RankedIndex: Shared ranking of all apps (treat as read-only)
+    """
+    sample = await sampler.get_sample()
+    return sample.apps
 
 
-def get_sorted_processes():
+async def get_ranking(group_by: str = "name"):
     """
-    Get sorted process list from cache or compute if needed.
-    Cached for 1 second to avoid redundant collection.
+    Get the relevance ranking of the latest sample for a grouping mode.
+    "name" is the sampler's app ranking; other modes are computed by the
+    sampler while requested, so the first request of a mode waits (off the
+    event loop) for the first collection that ranks it. That may be the one
+    after next, if the collection in flight already chose its modes.
+    
+    Args:
+        group_by: name, tree, unit or container
     
     Returns:
-        list: Sorted process list by relevance
+        tuple: (RankedIndex of the groups (treat as read-only), version of
+        the sample it belongs to)
+    
+    Raises:
+        ValueError: Unknown grouping mode
+        GroupingNotReady: The mode was not ranked within the request's budget
+            (or 3 sample intervals)
     """
-    apps = cache.get_or_compute(
-        'dashboard_processes',
-        compute_fn=collect_process_data,
-        ttl=1.0  # Cache for 1 second
-    )
-    return sort_processes_by_relevance(list(apps.values()))
+    if group_by != "name":
+        grouper.request(group_by)
+    sample = await sampler.get_sample()
+    if group_by == "name":
+        return sample.apps, sample.version
+    # Give up early enough to answer within the request's budget
+    give_up_at = time.monotonic() + time_remaining(SAMPLE_INTERVAL * 3, reserve=0.25)
+    while group_by not in sample.groups:
+        newer = await sampler.wait_for_newer(sample.version,
+                                             timeout=max(give_up_at - time.monotonic(), 0.0))
+        if newer is None:
+            raise GroupingNotReady(f"Grouping {group_by!r} is not ranked yet, retry shortly")
+        sample = newer
+    return sample.groups[group_by], sample.version
+
+
+# Query index of the most recent sample per grouping mode, used by /api/snapshot
+snapshot_indexes = {}
+
+
+async def get_snapshot_index(group_by: str = "name"):
+    """
+    Get the query index of the latest background sample.
+    Built on first use per sample; its name index is carried over from the
+    previous sample's index, so only added/removed app names are indexed.
+    
+    Args:
+        group_by: name, tree, unit or container
+    
+    Returns:
+        tuple: (SnapshotIndex of all apps (treat as read-only), sample version)
+    """
+    ranking, version = await get_ranking(group_by)
+    index = snapshot_indexes.get(group_by)
+    if index is None or index.ranking is not ranking:
+        index = snapshot_indexes[group_by] = SnapshotIndex.build(ranking, previous=index)
+    return index, version
+
+
+# Encoded bodies of the polling endpoints per (endpoint, params, sample version)
+json_responses = EncodedResponseCache()
+
+
+def grouping_not_ready(request: Request, key, error: GroupingNotReady):
+    """
+    Answer for a grouping the sampler has not ranked yet: the last body of
+    the same query if there is one, else 503 with Retry-After (never an
+    empty result cached as if it were current).
+    """
+    stale = json_responses.stale_response(request, key)
+    if stale is not None:
+        return stale
+    return JSONResponse(status_code=503, content={"error": str(error)},
+                        headers={"Retry-After": str(max(int(SAMPLE_INTERVAL), 1))})
+
+
+def sample_version() -> int:
+    """Version of the latest published sample (0 before the first one)."""
+    sample = sampler.latest
+    return sample.version if sample is not None else 0
 
 
 @app.get("/api/dashboard")
-async def get_dashboard_data(page: int = 1):
+async def get_dashboard_data(request: Request, page: int = 1, group_by: str = "name"):
     """
     Get paginated process list sorted by relevance score.
-    Results are cached for 1 second to avoid redundant computation.
-    On cache miss, computation runs in a thread pool to avoid blocking.
+    Served from the latest background sample's ranking: the first pages are
+    a heap top-k selection computed once per sample and shared by all clients.
+    The encoded page is reused until the next sample (ETag / 304 supported).
     
     Args:
         page: Page number (1-indexed). Each page has 20 items.
+        group_by: Aggregate processes by name (default), tree, unit or container
     
     Returns:
         Paginated list with metadata
     """
-    sorted_apps = get_sorted_processes()
+    key = ("dashboard", page, group_by)
+    json_responses.offer_stale(request, key)
+    try:
+        ranking, version = await get_ranking(group_by)
+    except GroupingNotReady as e:
+        return grouping_not_ready(request, key, e)
+    except ValueError as e:
+        return {"items": [], "page": page, "items_per_page": ITEMS_PER_PAGE,
+                "total_items": 0, "has_more": False, "error": str(e)}
     
-    # Paginate results (20 per page)
-    start_idx = (page - 1) * ITEMS_PER_PAGE
-    end_idx = start_idx + ITEMS_PER_PAGE
-    paginated_apps = sorted_apps[start_idx:end_idx]
+    def build():
+        # Paginate results (20 per page)
+        end_idx = page * ITEMS_PER_PAGE
+        return {
+            "items": [app.to_dict() for app in ranking.page(page, ITEMS_PER_PAGE)],
+            "page": page,
+            "items_per_page": ITEMS_PER_PAGE,
+            "total_items": len(ranking),
+            "has_more": end_idx < len(ranking)
+        }
     
-    return {
-        "items": paginated_apps,
-        "page": page,
-        "items_per_page": ITEMS_PER_PAGE,
-        "total_items": len(sorted_apps),
-        "has_more": end_idx < len(sorted_apps)
-    }
+    return json_responses.respond(request, key, version, build)
 
 
 @app.get("/api/snapshot")
-async def get_snapshot(min_cpu: float = 0.0, min_memory: float = 0.0, search: str = ""):
+async def get_snapshot(request: Request, min_cpu: float = 0.0, min_memory: float = 0.0,
+                       search: str = "", sort: str = "relevance_score", order: str = "desc",
+                       page: int = 1, per_page: int = 0, group_by: str = "name"):
     """
     Get complete system snapshot with all running processes.
-    Optional filtering by CPU%, memory (MB), and process name search.
-    Fresh data (not cached) to ensure accuracy for analysis.
+    Optional filtering by CPU%, memory (MB), and process name search, with
+    sorting on any column and pagination.
+    Served from the latest background sample's SnapshotIndex (at most one
+    interval old), so filters are index lookups rather than full scans; the
+    encoded result is reused until the next sample (ETag / 304 supported).
     
     Args:
         min_cpu: Minimum CPU usage % to include (default 0.0 = no filter)
         min_memory: Minimum memory usage MB to include (default 0.0 = no filter)
         search: Search term to filter process names (case-insensitive)
+        sort: relevance_score, name, pid, cpu, memory, incoming or outgoing
+        order: "desc" or "asc"
+        page: Page number (1-indexed)
+        per_page: Items per page (default 0 = all matches)
+        group_by: Aggregate processes by name (default), tree, unit or container
     
     Returns:
         List of all processes with full details
     """
-    # Get fresh data from collect_process_data (not cached)
-    app_data = collect_process_data()
-    apps_list = list(app_data.values())
-    
-    # Apply relevance scoring
-    sorted_apps = sort_processes_by_relevance(apps_list)
-    
-    # Apply filters
-    filtered_apps = []
-    search_lower = search.lower()
-    
-    for app in sorted_apps:
-        # CPU filter
-        if app['cpu'] < min_cpu:
-            continue
-        # Memory filter
-        if app['memory'] < min_memory:
-            continue
-        # Search filter
-        if search and search_lower not in app['name'].lower():
-            continue
-        
-        filtered_apps.append(app)
+    key = ("snapshot", min_cpu, min_memory, search, sort, order, page, per_page, group_by)
+    json_responses.offer_stale(request, key)
+    try:
+        index, version = await get_snapshot_index(group_by)
+    except GroupingNotReady as e:
+        return grouping_not_ready(request, key, e)
+    except ValueError as e:
+        return {"total": 0, "filtered": 0, "processes": [], "error": str(e)}
     
-    return {
-        "total": len(sorted_apps),
-        "filtered": len(filtered_apps),
-        "processes": filtered_apps
-    }
+    def build():
+        try:
+            filtered, apps = index.query(min_cpu, min_memory, search, sort, order != "asc",
+                                         page, max(per_page, 0))
+        except ValueError as e:
+            return {"total": len(index), "filtered": 0, "processes": [], "error": str(e)}
+        return {
+            "total": len(index),
+            "filtered": filtered,
+            "processes": [app.to_dict() for app in apps],
+            "page": page,
+            "per_page": per_page,
+            "has_more": per_page > 0 and page * per_page < filtered
+        }
+    
+    return json_responses.respond(request, key, version, build)
+
+
+def export_response(rows, fields, fmt: str, filename: str, compress: bool) -> StreamingResponse:
+    """
+    Stream rows as an NDJSON or CSV attachment, gzip-compressed if requested.
+    The row iterator is consumed by Starlette on a worker thread while the
+    response is sent, so only one chunk is held in memory at a time.
+    
+    Raises:
+        ValueError: Unknown format
+    """
+    chunks = encode_rows(rows, fields, fmt)
+    extension = "csv" if fmt == "csv" else "ndjson"
+    media_type = EXPORT_FORMATS[fmt]
+    if compress:
+        chunks = gzip_chunks(chunks)
+        extension += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(chunks, media_type=media_type, headers={
+        "Content-Disposition": f'attachment; filename="{filename}.{extension}"',
+        "Cache-Control": "no-cache"
+    })
+
+
+EXPORT_SNAPSHOT_FIELDS = ("name", "pid", "cpu", "memory", "incoming", "outgoing", "relevance_score")
+EXPORT_HISTORY_FIELDS = ("timestamp", "name", "cpu", "memory", "incoming", "outgoing")
+EXPORT_STORED_FIELDS = ("timestamp", "name", "resolution", "cpu", "memory", "incoming", "outgoing")
+
+
+@app.get("/api/export/snapshot")
+async def export_snapshot(format: str = "csv", gzip: bool = False, min_cpu: float = 0.0,
+                          min_memory: float = 0.0, search: str = "", sort: str = "cpu",
+                          order: str = "desc", group_by: str = "name"):
+    """
+    Download the latest snapshot, filtered and sorted like /api/snapshot,
+    as a streamed CSV or NDJSON file.
+    
+    Args:
+        format: "csv" or "ndjson"
+        gzip: Compress the file on the fly
+        group_by: Aggregate processes by name (default), tree, unit or container
+    """
+    try:
+        index, _ = await get_snapshot_index(group_by)
+        _, apps = index.query(min_cpu, min_memory, search, sort, order != "asc")
+        row = attrgetter(*EXPORT_SNAPSHOT_FIELDS)
+        return export_response(map(row, apps), EXPORT_SNAPSHOT_FIELDS, format,
+                               f"system-snapshot-{datetime.now():%Y-%m-%d}", gzip)
+    except GroupingNotReady as e:
+        return JSONResponse(status_code=503, content={"error": str(e)},
+                            headers={"Retry-After": str(max(int(SAMPLE_INTERVAL), 1))})
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+
+
+@app.get("/api/export/history")
+async def export_history(format: str = "ndjson", gzip: bool = False, seconds: float = 3600.0,
+                         names: str = "", source: str = "memory"):
+    """
+    Download per-app history as a streamed CSV or NDJSON file.
+    
+    Args:
+        format: "csv" or "ndjson"
+        gzip: Compress the file on the fly
+        seconds: How far back to export
+        names: Comma-separated app names (empty = all apps)
+        source: "memory" (finest in-memory tier covering the window) or
+            "stored" (persistent store, requires SYSTEM_PULSE_DATA_DIR)
+    """
+    selected = [name for name in names.split(",") if name] or None
+    if source == "stored":
+        if store is None:
+            return JSONResponse(status_code=400, content={
+                "error": "Persistent history is disabled (set SYSTEM_PULSE_DATA_DIR)"})
+        end = time.time()
+        rows = store.export_rows(end - seconds, end, selected)
+        fields = EXPORT_STORED_FIELDS
+    elif source == "memory":
+        rows = history.export_rows(seconds, selected)
+        fields = EXPORT_HISTORY_FIELDS
+    else:
+        return JSONResponse(status_code=400, content={"error": f"Unknown source {source!r}"})
+    try:
+        return export_response(rows, fields, format, f"system-history-{datetime.now():%Y-%m-%d}", gzip)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+
+
+@app.get("/api/stored-snapshot")
+async def get_stored_snapshot(at: float = 0.0, min_cpu: float = 0.0, min_memory: float = 0.0,
+                              search: str = "", limit: int = 1000):
+    """
+    Get a snapshot persisted in SQLite, filtered like /api/snapshot.
+    Filtering and ordering run in SQL; requires SYSTEM_PULSE_SQLITE_PATH.
+    
+    Args:
+        at: Unix time; the latest snapshot taken at or before it (0 = latest)
+        min_cpu: Minimum CPU usage % to include
+        min_memory: Minimum memory usage MB to include
+        search: Search term to filter process names (case-insensitive)
+        limit: Maximum number of processes returned
+    """
+    if snapshot_sink is None:
+        return {"error": "SQLite snapshots are disabled (set SYSTEM_PULSE_SQLITE_PATH)"}
+    return await run_in_executor(snapshot_sink.query_snapshot, at or None, min_cpu,
+                                 min_memory, search, limit)
+
+
+@app.get("/api/stored-snapshot/app/{name}")
+async def get_stored_app_rows(name: str, seconds: float = 3600.0, limit: int = 1000):
+    """
+    Get the persisted snapshot rows of one app over a recent window.
+    
+    Args:
+        name: App name as shown on the dashboard
+        seconds: How far back to look
+        limit: Maximum number of rows returned (oldest first)
+    """
+    if snapshot_sink is None:
+        return {"error": "SQLite snapshots are disabled (set SYSTEM_PULSE_SQLITE_PATH)"}
+    end = time.time()
+    rows = await run_in_executor(snapshot_sink.query_app, name, end - seconds, end, limit)
+    return {"name": name, "rows": rows}
+
+
+@app.get("/api/stored-snapshot/pid/{pid}")
+async def get_stored_pid_rows(pid: int, seconds: float = 3600.0, limit: int = 1000):
+    """
+    Get the persisted snapshot rows whose app's lowest PID is `pid`.
+    
+    Args:
+        pid: Process ID
+        seconds: How far back to look
+        limit: Maximum number of rows returned (oldest first)
+    """
+    if snapshot_sink is None:
+        return {"error": "SQLite snapshots are disabled (set SYSTEM_PULSE_SQLITE_PATH)"}
+    end = time.time()
+    rows = await run_in_executor(snapshot_sink.query_pid, pid, end - seconds, end, limit)
+    return {"pid": pid, "rows": rows}
+
+
+@app.get("/api/sqlite-stats")
+def get_sqlite_stats():
+    """Get SQLite snapshot sink statistics for monitoring."""
+    if snapshot_sink is None:
+        return {"enabled": False}
+    stats = snapshot_sink.get_stats()
+    stats["enabled"] = True
+    return stats
 
 
 @app.get("/api/cache-stats")
 def get_cache_stats():
-    """Get cache performance statistics for monitoring."""
+    """Get statistics of the history query cache for monitoring."""
     return cache.get_stats()
 
 
-@app.get("/api/self-monitor")
-async def get_self_monitor():
-    """Get System Pulse's own resource usage, uptime, and deviation tracking."""
-    process = psutil.Process(os.getpid())
-    cpu_percent = process.cpu_percent(interval=0.1)
-    memory_info = process.memory_info()
+@app.get("/api/sampler-stats")
+def get_sampler_stats():
+    """Get background sampler statistics for monitoring."""
+    return sampler.get_stats()
+
+
+@app.get("/api/history/top")
+async def get_history_top(metric: str = "cpu", seconds: float = 300.0, limit: int = 10, points: int = 60):
+    """
+    Get the apps with the highest average of a metric over a recent window.
+    
+    Args:
+        metric: cpu, memory, incoming or outgoing
+        seconds: Window to average over (capped at the longest retention)
+        limit: Number of apps returned
+        points: Maximum number of points per series
+    
+    Returns:
+        Apps ordered by average, each with its downsampled series
+    
+    Computed once per key on a worker thread and shared through the cache;
+    for a few seconds after expiry the previous result is served while it
+    is refreshed in the background.
+    """
+    try:
+        apps = await cache.get_or_compute_async(
+            f"history-top:{metric}:{seconds}:{limit}:{points}",
+            lambda: history.top(metric, seconds, limit, points),
+            ttl=HISTORY_TOP_TTL, stale_ttl=HISTORY_TOP_TTL * 5)
+        return {"metric": metric, "apps": apps}
+    except ValueError as e:
+        return {"metric": metric, "apps": [], "error": str(e)}
+
+
+@app.get("/api/history/{name}/stored")
+async def get_stored_app_history(request: Request, name: str, seconds: float = 86400.0,
+                                 points: int = 200):
+    """
+    Get the persisted metric history of one app (min/max/avg/p95 per point).
+    Covers restarts and up to 30 days; requires SYSTEM_PULSE_DATA_DIR.
+    Queries are cached for 10 seconds (served stale for 30 more while
+    refreshing); concurrent identical queries share one segment scan.
+    JSON by default, or the columnar wire format if accepted.
+    
+    Args:
+        name: App name as shown on the dashboard
+        seconds: How far back to look
+        points: Maximum number of points per series
+    """
+    if store is None:
+        return {"found": False, "error": "Persistent history is disabled (set SYSTEM_PULSE_DATA_DIR)"}
+    def query():
+        end = time.time()
+        return store.query(name, end - seconds, end, points)
+    
+    series = await cache.get_or_compute_async(f"stored-history:{name}:{seconds}:{points}", query,
+                                              ttl=STORED_HISTORY_TTL, stale_ttl=STORED_HISTORY_TTL * 3)
+    if series is None:
+        return {"found": False, "error": f"No stored history for app {name}"}
+    return negotiated_response(request, dict(series, found=True))
+
+
+@app.get("/api/history/{name}")
+async def get_app_history(request: Request, name: str, seconds: float = 600.0, points: int = 120):
+    """
+    Get the downsampled metric history of one app (min/max/avg/p95 per point).
+    Served from the coarsest rollup tier that still gives `points` points,
+    so a day-long query reads minute buckets, not per-second data.
+    Encoded once per sample (JSON, or the columnar wire format if accepted).
+    
+    Args:
+        name: App name as shown on the dashboard
+        seconds: How far back to look (capped at the longest retention)
+        points: Maximum number of points per series
+    """
+    def build():
+        series = history.series(name, seconds, points)
+        if series is None:
+            return {"found": False, "error": f"No history for app {name}"}
+        series["found"] = True
+        return series
+    
+    return json_responses.respond(request, ("history", name, seconds, points), sample_version(), build)
+
+
+@app.get("/api/history-stats")
+def get_history_stats():
+    """Get metric history statistics for monitoring."""
+    return history.get_stats()
+
+
+@app.get("/api/store-stats")
+def get_store_stats():
+    """Get persistent metric store statistics for monitoring."""
+    if store is None:
+        return {"enabled": False}
+    stats = store.get_stats()
+    stats["enabled"] = True
+    return stats
+
+
+def build_self_monitor():
+    """
+    Build System Pulse's own resource usage, uptime, and deviation payload.
+    CPU percent is measured since the previous call (non-blocking).
+    """
+    cpu_percent = SELF_PROCESS.cpu_percent(interval=None)
+    memory_info = SELF_PROCESS.memory_info()
     memory_mb = memory_info.rss / (1024 * 1024)  # Convert bytes to MB
     
     # Calculate uptime in seconds
@@ -233,28 +707,68 @@ async def get_self_monitor():
     }
 
 
+@app.get("/api/self-monitor")
+async def get_self_monitor():
+    """Get System Pulse's own resource usage, uptime, and deviation tracking."""
+    return build_self_monitor()
+
+
+# Push stream: one snapshot, then per-app deltas at the sampler cadence
+stream = SampleStream(sampler, monitor_fn=build_self_monitor, monitor_interval=5.0)
+
+
+@app.get("/api/stream")
+async def stream_dashboard(request: Request):
+    """
+    Server-Sent Events stream of the dashboard.
+    
+    Events:
+        snapshot: {"version", "timestamp", "apps": [...]} sent once on connect
+        delta: {"version", "base", "timestamp", "total", "added": [...],
+                "removed": [names], "updated": [{"name", changed fields...}]}
+        monitor: Same payload as /api/self-monitor, at most every 5 seconds
+    
+    Slow clients skip intermediate samples and receive a single delta
+    against the last sample they actually got.
+    """
+    return StreamingResponse(
+        stream.events(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.get("/api/stream-stats")
+def get_stream_stats():
+    """Get push stream statistics for monitoring."""
+    return stream.get_stats()
+
+
 @app.get("/api/process-search")
-async def search_processes():
+async def search_processes(q: str = "", limit: int = 10):
     """
-    Get all running processes for search auto-complete.
-    Returns process name, PID, and basics for search results.
+    Autocomplete processes by name for the search box.
+    Answered from the prefix index maintained by the background sampler;
+    exe paths are only looked up for the returned rows (cached per process).
+    
+    Args:
+        q: Typed text: a prefix of the name or of a word in it, or a PID
+        limit: Maximum number of results (1-50)
+    
+    Returns:
+        Matching processes (pid, name, exe) ordered by name
     """
-    try:
-        processes = []
-        for proc in psutil.process_iter(['pid', 'name', 'exe', 'status']):
-            try:
-                info = proc.as_dict(attrs=['pid', 'name', 'exe', 'status'])
-                processes.append({
-                    "pid": info['pid'],
-                    "name": info['name'],
-                    "exe": info.get('exe', ''),
-                    "status": info.get('status', 'unknown')
-                })
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
-        return {"processes": sorted(processes, key=lambda p: p['name'])}
-    except Exception as e:
-        return {"processes": [], "error": str(e)}
+    await sampler.get_sample()  # Index is filled by the first collection
+    rows = process_index.search(q, min(max(limit, 1), 50))
+    if any(row["exe"] is None for row in rows):
+        rows = await run_in_executor(process_index.resolve_exes, rows)
+    return {"query": q, "processes": rows, "indexed": len(process_index)}
+
+
+@app.get("/api/process-search-stats")
+def get_process_search_stats():
+    """Get autocomplete index statistics for monitoring."""
+    return process_index.get_stats()
 
 
 @app.get("/api/process-details/{pid}")
@@ -262,59 +776,115 @@ async def get_process_details(pid: int):
     """
     Get detailed information about a specific process.
     Includes all metrics: CPU, memory, connections, file handles, etc.
+    Fields come from the per-process detail cache (static ones are read once
+    per process, volatile ones at most every few seconds); CPU percent is the
+    background sampler's value from its last tick.
     """
+    tracked = process_table.lookup(pid)
+    key, entry = tracked if tracked is not None else (None, None)
     try:
-        proc = psutil.Process(pid)
-        
-        # Get all process info
-        info = proc.as_dict(attrs=[
-            'pid', 'name', 'exe', 'cmdline', 'status', 'create_time',
-            'cpu_percent', 'memory_info', 'num_threads', 'ppid'
-        ])
-        
-        # Get connection info
-        connections = proc.net_connections(kind='inet')
-        num_connections = len(connections)
-        
-        # Get open files count
-        try:
-            open_files = len(proc.open_files())
-        except:
-            open_files = 0
-        
-        # Format create time
-        create_time = datetime.fromtimestamp(info['create_time']).isoformat() if info['create_time'] else None
-        
-        # Build response
-        return {
-            "pid": info['pid'],
-            "name": info['name'],
-            "exe": info.get('exe', ''),
-            "cmdline": ' '.join(info.get('cmdline', [])),
-            "status": info.get('status', 'unknown'),
-            "cpu_percent": round(info['cpu_percent'], 2),
-            "memory_mb": round(info['memory_info'].rss / 1024 / 1024, 2),
-            "memory_percent": round(proc.memory_percent(), 2),
-            "num_threads": info['num_threads'],
-            "num_connections": num_connections,
-            "open_files": open_files,
-            "created_at": create_time,
-            "parent_pid": info.get('ppid', 0),
-            "logo": APP_ICONS.get(info['name'].lower(), ''),
-            "found": True
-        }
+        info = detail_cache.peek(key) if key is not None else None
+        if info is None:
+            info = await run_in_executor(detail_cache.get, key, pid)
     except psutil.NoSuchProcess:
         return {"found": False, "error": f"Process with PID {pid} not found"}
     except Exception as e:
         return {"found": False, "error": str(e)}
+    
+    # Format create time
+    create_time = datetime.fromtimestamp(info['create_time']).isoformat() if info['create_time'] else None
+    
+    # Build response
+    return {
+        "pid": pid,
+        "name": info['name'],
+        "exe": info['exe'],
+        "cmdline": info['cmdline'],
+        "status": info['status'],
+        "cpu_percent": round(entry.cpu, 2) if entry is not None else 0.0,
+        "memory_mb": round(info['rss'] / 1024 / 1024, 2),
+        "memory_percent": round(detail_cache.memory_percent(info['rss']), 2),
+        "num_threads": info['num_threads'],
+        "num_connections": info['num_connections'],
+        "open_files": info['open_files'],
+        "created_at": create_time,
+        "parent_pid": info['ppid'],
+        "logo": icon_resolver.resolve(info['name']),
+        "found": True
+    }
+
+
+@app.get("/api/grouping-stats")
+def get_grouping_stats():
+    """Get process grouping statistics for monitoring."""
+    return grouper.get_stats()
+
+
+@app.get("/api/containers")
+async def get_containers():
+    """
+    Get per-container CPU, memory and block I/O of the latest sample, read
+    from each container's cgroup (busiest first), with the apps inside it.
+    Requires a cgroup v2 hierarchy.
+    """
+    if container_collector is None:
+        return {"enabled": False, "containers": []}
+    await sampler.get_sample()
+    timestamp, containers = container_view
+    result = []
+    for container in sorted(containers, key=lambda c: (-c.cpu, -c.memory)):
+        apps = set()
+        for pid in container.pids:
+            found = process_table.lookup(pid)
+            if found is not None:
+                apps.add(found[1].name)
+        item = container._asdict()
+        item["process_count"] = len(container.pids)
+        del item["pids"]
+        item["apps"] = sorted(apps)
+        result.append(item)
+    return {"enabled": True, "timestamp": timestamp, "containers": result}
+
+
+@app.get("/api/container-stats")
+def get_container_stats():
+    """Get container collector statistics for monitoring."""
+    if container_collector is None:
+        return {"enabled": False}
+    return {"enabled": True, **container_collector.get_stats()}
+
+
+@app.get("/api/process-details-stats")
+def get_process_details_stats():
+    """Get process detail cache statistics for monitoring."""
+    return detail_cache.get_stats()
+
+
+@app.get("/api/icon-stats")
+def get_icon_stats():
+    """Get icon resolver statistics for monitoring."""
+    return icon_resolver.get_stats()
 
 
 @app.get("/api/all-apps")
-async def get_all_apps():
-    """Get all running processes with full details (not paginated)."""
-    app_data = collect_process_data()
-    apps_list = list(app_data.values())
-    return {"apps": sort_processes_by_relevance(apps_list)}
+async def get_all_apps(request: Request):
+    """Get all running processes with full details (not paginated, ETag / 304 supported)."""
+    json_responses.offer_stale(request, ("all-apps",))
+    sample = await sampler.get_sample()
+    return json_responses.respond(request, ("all-apps",), sample.version,
+                                  lambda: {"apps": [app.to_dict() for app in sample.apps.ranked()]})
+
+
+@app.get("/api/response-cache-stats")
+def get_response_cache_stats():
+    """Get encoded response cache statistics for monitoring."""
+    return json_responses.get_stats()
+
+
+@app.get("/api/timeout-stats")
+def get_request_timeout_stats():
+    """Get request timeout, stale fallback and cancellation counters for monitoring."""
+    return get_timeout_stats()
 
 @app.get("/api/app-icons")
 def get_app_icons():
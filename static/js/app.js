@@ -8,9 +8,13 @@ const App = {
         totalItems: 0,
         displayedItems: 0,
         allProcesses: [],
-        searchCache: [],  // Cache for search autocomplete
+        searchSeq: 0,  // Latest autocomplete request; older responses are ignored
+        searchTimer: null,
         refreshInterval: 30000,  // 30 seconds default
         refreshIntervalId: null,
+        streamApps: new Map(),  // name -> app, kept current by /api/stream
+        streamConnected: false,
+        conditionalCache: new Map(),  // url -> {etag, data} for If-None-Match polling
         thresholds: {
             cpuYellow: 20,
             cpuRed: 70,
@@ -35,11 +39,9 @@ const App = {
         // Update self-monitor once on load
         this.updateSelfMonitor();
         
-        // Fetch search processes once on load
-        this.fetchSearchProcesses();
-        
-        // Regular updates
+        // Regular updates (polling is the fallback while the push stream is down)
         setInterval(() => this.updateSelfMonitor(), 5000);  // Update self-monitor every 5 seconds
+        this.connectStream();
         
         // Add click-outside handler to close search dropdown
         document.addEventListener('click', (e) => {
@@ -63,6 +65,62 @@ const App = {
         this.state.refreshIntervalId = setInterval(() => this.updateDashboard(), this.state.refreshInterval);
     },
 
+    connectStream() {
+        // Without EventSource the dashboard keeps polling
+        if (!('EventSource' in globalThis)) return;
+        
+        const source = new EventSource(`${window.location.origin}/api/stream`);
+        
+        source.addEventListener('snapshot', (e) => {
+            const data = JSON.parse(e.data);
+            this.state.streamApps = new Map(data.apps.map(app => [app.name, app]));
+            this.state.streamConnected = true;
+            this.renderStreamDashboard();
+        });
+        
+        source.addEventListener('delta', (e) => {
+            const data = JSON.parse(e.data);
+            const apps = this.state.streamApps;
+            data.removed.forEach(name => apps.delete(name));
+            data.added.forEach(app => apps.set(app.name, app));
+            data.updated.forEach(changes => {
+                const app = apps.get(changes.name);
+                if (app) apps.set(changes.name, { ...app, ...changes });
+            });
+            this.renderStreamDashboard();
+        });
+        
+        source.addEventListener('monitor', (e) => this.renderSelfMonitor(JSON.parse(e.data)));
+        
+        // EventSource reconnects by itself and gets a fresh snapshot; poll meanwhile
+        source.onerror = () => {
+            this.state.streamConnected = false;
+        };
+    },
+
+    renderStreamDashboard() {
+        // Page 2+ is browsed at the user's own pace (same rule as polling)
+        if (this.state.currentView !== 'dashboard' || this.state.currentPage !== 1) return;
+        
+        const items = [...this.state.streamApps.values()]
+            .sort((a, b) => b.relevance_score - a.relevance_score)
+            .slice(0, 20);  // 20 items per page
+        
+        const container = document.getElementById('dashboard');
+        container.classList.remove('all-apps-view');
+        if (!container.classList.contains('app-grid')) {
+            container.classList.add('app-grid');
+        }
+        container.innerHTML = items.length > 0
+            ? items.map(app => this.renderProcessCard(app)).join('')
+            : '<div class="col-span-4 text-center text-slate-500 py-20">Monitoring network connections...</div>';
+        
+        this.state.totalItems = this.state.streamApps.size;
+        this.state.displayedItems = items.length;
+        this.state.lastUpdated = new Date();
+        this.updatePaginationInfo();
+    },
+
     showNotification(message, type = 'info', duration = 3000) {
         const container = document.getElementById('notification-container');
         
@@ -220,11 +278,14 @@ const App = {
         document.getElementById('dashboard').style.display = view === 'dashboard' ? 'grid' : 'none';
         document.getElementById('load-more-section').style.display = view === 'dashboard' ? 'flex' : 'none';
         document.getElementById('snapshot-view').style.display = view === 'snapshot' ? 'block' : 'none';
+        document.getElementById('containers-view').style.display = view === 'containers' ? 'block' : 'none';
         
         if (view === 'all-apps') {
             this.displayAllApps();
         } else if (view === 'snapshot') {
             this.loadSnapshot();
+        } else if (view === 'containers') {
+            this.loadContainers();
         } else {
             this.state.currentPage = 1;
             this.state.displayedItems = 0;
@@ -263,12 +324,9 @@ const App = {
     async loadAllApps() {
         try {
             const url = `${window.location.origin}/api/all-apps`;
-            const response = await fetch(url);
-            if (!response.ok) {
-                const error = await response.text();
-                throw new Error(`HTTP ${response.status}: ${error}`);
-            }
-            const apps = await response.json();
+            const response = await this.fetchConditional(url);
+            if (!response.ok) throw new Error('Failed to load all apps');
+            const apps = response.data;
             // Store for later display
             this.state.allApps = apps;
         } catch (error) {
@@ -277,6 +335,8 @@ const App = {
     },
 
     async updateSelfMonitor() {
+        // Pushed as 'monitor' events while the stream is connected
+        if (this.state.streamConnected) return;
         try {
             const url = `${window.location.origin}/api/self-monitor`;
             const response = await fetch(url);
@@ -284,76 +344,78 @@ const App = {
                 const error = await response.text();
                 throw new Error(`HTTP ${response.status}: ${error}`);
             }
-            const data = await response.json();
-            
-            // Update CPU Card
-            const cpuPercent = data.cpu_percent;
-            const cpuBar = document.getElementById('monitor-cpu-bar');
-            const cpuText = document.getElementById('monitor-cpu-percent');
-            const cpuStatus = document.getElementById('monitor-cpu-status');
-            if (cpuBar) {
-                cpuBar.style.width = Math.min(cpuPercent, 100) + '%';
-                cpuBar.className = cpuPercent > 15 ? 'bg-gradient-to-r from-red-400 to-red-600 h-full rounded-full transition-all duration-300' : 'bg-gradient-to-r from-cyan-400 to-blue-500 h-full rounded-full transition-all duration-300';
-            }
-            if (cpuText) cpuText.textContent = cpuPercent.toFixed(1) + '%';
-            if (cpuStatus) cpuStatus.textContent = cpuPercent > 15 ? '⚠️ Warning' : '✓ Healthy';
-            
-            // Update RAM Card
-            const memoryMb = data.memory_mb;
-            const ramBar = document.getElementById('monitor-ram-bar');
-            const ramText = document.getElementById('monitor-ram-mb');
-            const ramStatus = document.getElementById('monitor-ram-status');
-            const memPercent = Math.min((memoryMb / 500) * 100, 100);
-            if (ramBar) {
-                ramBar.style.width = memPercent + '%';
-                ramBar.className = memoryMb > 200 ? 'bg-gradient-to-r from-red-400 to-red-600 h-full rounded-full transition-all duration-300' : 'bg-gradient-to-r from-purple-400 to-pink-500 h-full rounded-full transition-all duration-300';
-            }
-            if (ramText) ramText.textContent = memoryMb.toFixed(1) + ' MB';
-            if (ramStatus) ramStatus.textContent = memoryMb > 200 ? '⚠️ Warning' : '✓ Healthy';
-            
-            // Update Uptime Card
-            const uptimeSeconds = data.uptime_seconds;
-            const uptimeFormatted = this.formatUptime(uptimeSeconds);
-            const uptimeText = document.getElementById('monitor-uptime-text');
-            const uptimeDetail = document.getElementById('monitor-uptime-detail');
-            if (uptimeText) uptimeText.textContent = uptimeFormatted.short;
-            if (uptimeDetail) uptimeDetail.textContent = `Running for ${uptimeFormatted.long}`;
-            
-            // Update Last Deviation Card
-            const deviation = data.last_deviation;
-            const deviationApp = document.getElementById('monitor-deviation-app');
-            const deviationMetric = document.getElementById('monitor-deviation-metric');
-            const deviationTime = document.getElementById('monitor-deviation-time');
-            const deviationSeverity = document.getElementById('monitor-deviation-severity');
-            
-            if (deviation && deviation.process_name !== 'None') {
-                if (deviationApp) deviationApp.textContent = `⚠️ ${deviation.process_name}`;
-                if (deviationMetric) deviationMetric.textContent = `${deviation.metric}`;
-                if (deviationSeverity) deviationSeverity.textContent = deviation.severity === 'critical' ? '🔴 Critical' : '🟡 Warning';
-                if (deviationTime) {
-                    const deviationDate = new Date(deviation.timestamp);
-                    const now = new Date();
-                    const diffMs = now - deviationDate;
-                    const diffSec = Math.floor(diffMs / 1000);
-                    let timeAgo = '';
-                    if (diffSec < 60) timeAgo = `${diffSec}s ago`;
-                    else if (diffSec < 3600) timeAgo = `${Math.floor(diffSec / 60)}m ago`;
-                    else timeAgo = `${Math.floor(diffSec / 3600)}h ago`;
-                    deviationTime.textContent = `Last seen: ${timeAgo}`;
-                }
-                document.getElementById('monitor-deviation-card').style.borderColor = deviation.severity === 'critical' ? 'rgba(239, 68, 68, 0.5)' : 'rgba(217, 119, 6, 0.5)';
-            } else {
-                if (deviationApp) deviationApp.textContent = '✓ No deviations';
-                if (deviationMetric) deviationMetric.textContent = 'System running smoothly';
-                if (deviationSeverity) deviationSeverity.textContent = '🟢 Good';
-                if (deviationTime) deviationTime.textContent = '---';
-                document.getElementById('monitor-deviation-card').style.borderColor = 'rgba(34, 197, 94, 0.3)';
-            }
+            this.renderSelfMonitor(await response.json());
         } catch (error) {
             console.error('Failed to update self-monitor:', error);
         }
     },
 
+    renderSelfMonitor(data) {
+        // Update CPU Card
+        const cpuPercent = data.cpu_percent;
+        const cpuBar = document.getElementById('monitor-cpu-bar');
+        const cpuText = document.getElementById('monitor-cpu-percent');
+        const cpuStatus = document.getElementById('monitor-cpu-status');
+        if (cpuBar) {
+            cpuBar.style.width = Math.min(cpuPercent, 100) + '%';
+            cpuBar.className = cpuPercent > 15 ? 'bg-gradient-to-r from-red-400 to-red-600 h-full rounded-full transition-all duration-300' : 'bg-gradient-to-r from-cyan-400 to-blue-500 h-full rounded-full transition-all duration-300';
+        }
+        if (cpuText) cpuText.textContent = cpuPercent.toFixed(1) + '%';
+        if (cpuStatus) cpuStatus.textContent = cpuPercent > 15 ? '⚠️ Warning' : '✓ Healthy';
+        
+        // Update RAM Card
+        const memoryMb = data.memory_mb;
+        const ramBar = document.getElementById('monitor-ram-bar');
+        const ramText = document.getElementById('monitor-ram-mb');
+        const ramStatus = document.getElementById('monitor-ram-status');
+        const memPercent = Math.min((memoryMb / 500) * 100, 100);
+        if (ramBar) {
+            ramBar.style.width = memPercent + '%';
+            ramBar.className = memoryMb > 200 ? 'bg-gradient-to-r from-red-400 to-red-600 h-full rounded-full transition-all duration-300' : 'bg-gradient-to-r from-purple-400 to-pink-500 h-full rounded-full transition-all duration-300';
+        }
+        if (ramText) ramText.textContent = memoryMb.toFixed(1) + ' MB';
+        if (ramStatus) ramStatus.textContent = memoryMb > 200 ? '⚠️ Warning' : '✓ Healthy';
+        
+        // Update Uptime Card
+        const uptimeSeconds = data.uptime_seconds;
+        const uptimeFormatted = this.formatUptime(uptimeSeconds);
+        const uptimeText = document.getElementById('monitor-uptime-text');
+        const uptimeDetail = document.getElementById('monitor-uptime-detail');
+        if (uptimeText) uptimeText.textContent = uptimeFormatted.short;
+        if (uptimeDetail) uptimeDetail.textContent = `Running for ${uptimeFormatted.long}`;
+        
+        // Update Last Deviation Card
+        const deviation = data.last_deviation;
+        const deviationApp = document.getElementById('monitor-deviation-app');
+        const deviationMetric = document.getElementById('monitor-deviation-metric');
+        const deviationTime = document.getElementById('monitor-deviation-time');
+        const deviationSeverity = document.getElementById('monitor-deviation-severity');
+        
+        if (deviation && deviation.process_name !== 'None') {
+            if (deviationApp) deviationApp.textContent = `⚠️ ${deviation.process_name}`;
+            if (deviationMetric) deviationMetric.textContent = `${deviation.metric}`;
+            if (deviationSeverity) deviationSeverity.textContent = deviation.severity === 'critical' ? '🔴 Critical' : '🟡 Warning';
+            if (deviationTime) {
+                const deviationDate = new Date(deviation.timestamp);
+                const now = new Date();
+                const diffMs = now - deviationDate;
+                const diffSec = Math.floor(diffMs / 1000);
+                let timeAgo = '';
+                if (diffSec < 60) timeAgo = `${diffSec}s ago`;
+                else if (diffSec < 3600) timeAgo = `${Math.floor(diffSec / 60)}m ago`;
+                else timeAgo = `${Math.floor(diffSec / 3600)}h ago`;
+                deviationTime.textContent = `Last seen: ${timeAgo}`;
+            }
+            document.getElementById('monitor-deviation-card').style.borderColor = deviation.severity === 'critical' ? 'rgba(239, 68, 68, 0.5)' : 'rgba(217, 119, 6, 0.5)';
+        } else {
+            if (deviationApp) deviationApp.textContent = '✓ No deviations';
+            if (deviationMetric) deviationMetric.textContent = 'System running smoothly';
+            if (deviationSeverity) deviationSeverity.textContent = '🟢 Good';
+            if (deviationTime) deviationTime.textContent = '---';
+            document.getElementById('monitor-deviation-card').style.borderColor = 'rgba(34, 197, 94, 0.3)';
+        }
+    },
+
     formatUptime(seconds) {
         const days = Math.floor(seconds / 86400);
         const hours = Math.floor((seconds % 86400) / 3600);
@@ -518,10 +580,41 @@ const App = {
         btn.style.opacity = '1';
     },
 
+    // Conditional GET: sends the ETag of the last response for this URL and
+    // reuses its parsed body on 304, so unchanged samples are not re-sent.
+    // With columns = true the server answers in the binary columnar format
+    // (static/js/wire.js), decoded into the same shape as the JSON payload.
+    async fetchConditional(url, columns = false) {
+        const key = columns ? `${url}#columns` : url;
+        const cached = this.state.conditionalCache.get(key);
+        const headers = columns ? { 'Accept': Wire.MEDIA_TYPE } : {};
+        if (cached) headers['If-None-Match'] = cached.etag;
+        const response = await fetch(url, { cache: 'no-store', headers });
+        if (response.status === 304 && cached) {
+            return { ok: true, data: cached.data };
+        }
+        if (!response.ok) {
+            return { ok: false, data: null };
+        }
+        const data = response.headers.get('Content-Type')?.startsWith(Wire.MEDIA_TYPE)
+            ? Wire.toPayload(Wire.decode(await response.arrayBuffer()))
+            : await response.json();
+        const etag = response.headers.get('ETag');
+        if (etag) {
+            this.state.conditionalCache.delete(key);
+            this.state.conditionalCache.set(key, { etag, data });
+            // Keep the most recent URLs only (filters and pages create new ones)
+            if (this.state.conditionalCache.size > 50) {
+                this.state.conditionalCache.delete(this.state.conditionalCache.keys().next().value);
+            }
+        }
+        return { ok: true, data };
+    },
+
     async fetchAndDisplay(showNotifications = false) {
         try {
-            const url = `${window.location.origin}/api/dashboard?page=${this.state.currentPage}&t=${Date.now()}`;
-            const response = await fetch(url);
+            const url = `${window.location.origin}/api/dashboard?page=${this.state.currentPage}`;
+            const response = await this.fetchConditional(url);
             
             if (!response.ok) {
                 if (showNotifications) {
@@ -530,7 +623,7 @@ const App = {
                 throw new Error('Network response was not ok');
             }
             
-            const data = await response.json();
+            const data = response.data;
             
             const container = document.getElementById('dashboard');
             
@@ -587,20 +680,20 @@ const App = {
 
     async loadSnapshot() {
         try {
-            const url = `${window.location.origin}/api/snapshot`;
-            const response = await fetch(url);
+            // Initialize sorting (the server returns rows already sorted)
+            this.state.snapshotSortKey = 'cpu';
+            this.state.snapshotSortOrder = 'desc';
+            
+            const url = `${window.location.origin}/api/snapshot?sort=cpu&order=desc`;
+            const response = await this.fetchConditional(url, true);
             if (!response.ok) throw new Error('Failed to load snapshot');
-            const data = await response.json();
+            const data = response.data;
             
             // Store snapshot data in state
             this.state.snapshotData = data.processes || [];
             this.state.snapshotTotal = data.total || 0;
             this.state.snapshotFiltered = data.filtered || 0;
             
-            // Initialize sorting
-            this.state.snapshotSortKey = 'cpu';
-            this.state.snapshotSortOrder = 'desc';
-            
             this.displaySnapshot();
         } catch (error) {
             console.error('Failed to load snapshot:', error);
@@ -645,6 +738,52 @@ const App = {
         document.getElementById('snapshot-filtered').textContent = this.state.snapshotData.length;
     },
 
+    async loadContainers() {
+        try {
+            const response = await fetch(`${window.location.origin}/api/containers`);
+            if (!response.ok) throw new Error('Failed to load containers');
+            const data = await response.json();
+            this.state.containersEnabled = data.enabled;
+            this.state.containers = data.containers || [];
+            this.displayContainers();
+        } catch (error) {
+            console.error('Failed to load containers:', error);
+            this.showNotification('Failed to load containers', 'error', 5000);
+        }
+    },
+
+    displayContainers() {
+        const tbody = document.getElementById('containers-tbody');
+        const formatRate = (bytes) => bytes >= 1048576 ? `${(bytes / 1048576).toFixed(1)} MB` : `${(bytes / 1024).toFixed(1)} KB`;
+        
+        if (!this.state.containersEnabled) {
+            tbody.innerHTML = '<tr><td colspan="6" class="px-4 py-8 text-center text-slate-500">Container view needs a cgroup v2 hierarchy</td></tr>';
+            return;
+        }
+        if (this.state.containers.length === 0) {
+            tbody.innerHTML = '<tr><td colspan="6" class="px-4 py-8 text-center text-slate-500">No running containers</td></tr>';
+            return;
+        }
+
+        tbody.innerHTML = this.state.containers.map(container => `
+            <tr class="border-t border-slate-700/50 hover:bg-slate-800/30 transition-all">
+                <td class="px-4 py-3">
+                    <span class="font-medium text-slate-800 dark:text-slate-100">${container.name}</span>
+                    <span class="text-xs text-slate-500 ml-2">${container.id}</span>
+                </td>
+                <td class="px-4 py-3 text-right">
+                    <span class="${container.cpu > 70 ? 'text-red-400 font-bold' : container.cpu > 20 ? 'text-yellow-400' : 'text-green-400'}">
+                        ${container.cpu.toFixed(1)}%
+                    </span>
+                </td>
+                <td class="px-4 py-3 text-right text-purple-400">${container.memory.toFixed(1)}</td>
+                <td class="px-4 py-3 text-right text-blue-400">${formatRate(container.read_bytes_per_sec)}</td>
+                <td class="px-4 py-3 text-right text-orange-400">${formatRate(container.write_bytes_per_sec)}</td>
+                <td class="px-4 py-3 text-slate-400 text-xs">${container.apps.join(', ')} (${container.process_count})</td>
+            </tr>
+        `).join('');
+    },
+
     filterSnapshot() {
         const searchTerm = document.getElementById('snapshot-search')?.value || '';
         const minCpu = parseFloat(document.getElementById('snapshot-cpu-filter')?.value || 0);
@@ -654,28 +793,16 @@ const App = {
         document.getElementById('snapshot-cpu-value').textContent = minCpu + '%';
         document.getElementById('snapshot-memory-value').textContent = minMemory + ' MB';
 
-        // Fetch with filters
-        const url = `${window.location.origin}/api/snapshot?min_cpu=${minCpu}&min_memory=${minMemory}&search=${encodeURIComponent(searchTerm)}`;
-        fetch(url)
-            .then(r => r.json())
-            .then(data => {
+        // Fetch with filters, sorted server-side in the current sort order
+        const sortKey = this.state.snapshotSortKey || 'cpu';
+        const sortOrder = this.state.snapshotSortOrder || 'desc';
+        const url = `${window.location.origin}/api/snapshot?min_cpu=${minCpu}&min_memory=${minMemory}&search=${encodeURIComponent(searchTerm)}&sort=${sortKey}&order=${sortOrder}`;
+        this.fetchConditional(url, true)
+            .then(response => {
+                if (!response.ok) throw new Error('Failed to filter snapshot');
+                const data = response.data;
                 this.state.snapshotData = data.processes || [];
                 this.state.snapshotFiltered = data.filtered || 0;
-                
-                // Reapply current sort
-                if (this.state.snapshotSortKey) {
-                    this.state.snapshotData.sort((a, b) => {
-                        const aVal = a[this.state.snapshotSortKey];
-                        const bVal = b[this.state.snapshotSortKey];
-                        
-                        if (typeof aVal === 'string') {
-                            return this.state.snapshotSortOrder === 'asc' ? 
-                                aVal.localeCompare(bVal) : bVal.localeCompare(aVal);
-                        }
-                        return this.state.snapshotSortOrder === 'asc' ? aVal - bVal : bVal - aVal;
-                    });
-                }
-                
                 this.displaySnapshot();
             })
             .catch(err => {
@@ -728,77 +855,60 @@ const App = {
             return;
         }
 
-        // Create CSV header
-        const headers = ['Process Name', 'CPU %', 'Memory MB', 'Incoming Connections', 'Outgoing Connections', 'PID'];
-        
-        // Create CSV rows
-        const rows = this.state.snapshotData.map(app => [
-            app.name,
-            app.cpu.toFixed(1),
-            app.memory.toFixed(1),
-            app.incoming,
-            app.outgoing,
-            app.pid
-        ]);
-
-        // Combine header and rows
-        const csv = [headers, ...rows]
-            .map(row => row.map(cell => {
-                // Escape quotes and wrap in quotes if contains comma
-                const str = String(cell);
-                return str.includes(',') ? `"${str.replace(/"/g, '""')}"` : str;
-            }).join(','))
-            .join('\n');
-
-        // Create blob and download
-        const blob = new Blob([csv], { type: 'text/csv;charset=utf-8;' });
+        // The server streams the file with the current filters and sort order,
+        // so the browser downloads it directly instead of building it in memory
+        const params = new URLSearchParams({
+            format: 'csv',
+            min_cpu: document.getElementById('snapshot-cpu-filter')?.value || 0,
+            min_memory: document.getElementById('snapshot-memory-filter')?.value || 0,
+            search: document.getElementById('snapshot-search')?.value || '',
+            sort: this.state.snapshotSortKey || 'cpu',
+            order: this.state.snapshotSortOrder || 'desc'
+        });
         const link = document.createElement('a');
-        const url = URL.createObjectURL(blob);
-        
-        link.setAttribute('href', url);
-        link.setAttribute('download', `system-snapshot-${new Date().toISOString().split('T')[0]}.csv`);
+        link.setAttribute('href', `${window.location.origin}/api/export/snapshot?${params}`);
+        link.setAttribute('download', '');
         link.style.visibility = 'hidden';
         
         document.body.appendChild(link);
         link.click();
         document.body.removeChild(link);
         
-        this.showNotification('Snapshot exported to CSV', 'success', 3000);
+        this.showNotification('Snapshot export started', 'success', 3000);
     },
 
     // ============ SEARCH AND MODAL METHODS ============
 
-    async fetchSearchProcesses() {
+    async fetchSearchResults(query) {
+        const seq = ++this.state.searchSeq;
         try {
-            const url = `${window.location.origin}/api/process-search`;
+            const url = `${window.location.origin}/api/process-search?q=${encodeURIComponent(query)}&limit=10`;
             const response = await fetch(url);
             if (!response.ok) {
                 const error = await response.text();
                 throw new Error(`HTTP ${response.status}: ${error}`);
             }
             const data = await response.json();
-            this.state.searchCache = data.processes || [];
-            console.log(`Loaded ${this.state.searchCache.length} processes for search`);
+            if (seq === this.state.searchSeq) {
+                this.showSearchResults(data.processes || []);
+            }
         } catch (error) {
-            console.error('Error loading search processes:', error);
-            this.state.searchCache = [];
+            console.error('Error searching processes:', error);
         }
     },
 
     handleSearchInput(event) {
-        const input = event.target.value.toLowerCase().trim();
+        const input = event.target.value.trim();
+        clearTimeout(this.state.searchTimer);
         
         if (input.length === 0) {
+            this.state.searchSeq++;  // Drop responses still in flight
             document.getElementById('search-autocomplete').classList.add('hidden');
             return;
         }
 
-        const filtered = this.state.searchCache.filter(p => 
-            p.name.toLowerCase().includes(input) ||
-            p.pid.toString().includes(input)
-        ).slice(0, 10);  // Limit to 10 results
-
-        this.showSearchResults(filtered);
+        // The server answers from its prefix index; only debounce fast typing
+        this.state.searchTimer = setTimeout(() => this.fetchSearchResults(input), 80);
     },
 
     closeSearchDropdown() {
@@ -935,6 +1045,8 @@ const App = {
 
     async updateDashboard() {
         if (this.state.currentView !== 'dashboard') return;
+        // The push stream already keeps page 1 current
+        if (this.state.streamConnected) return;
         
         // Only auto-refresh page 1 to preserve user's Load More pagination
         // If user is on page 2+, let them browse at their own pace
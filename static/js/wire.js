@@ -0,0 +1,93 @@
+// Decoder for the binary columnar wire format (backend/wire.py).
+// Numeric columns become TypedArray views on the response buffer (no copy);
+// string columns are decoded once per distinct string from the shared table.
+const Wire = {
+    MEDIA_TYPE: 'application/vnd.system-pulse.columns',
+
+    ARRAY_TYPES: {
+        u8: Uint8Array,
+        u32: Uint32Array,
+        i32: Int32Array,
+        f32: Float32Array,
+        f64: Float64Array
+    },
+
+    NULL_STRING: 0xFFFFFFFF,
+
+    // Returns {meta, tables: {field: {rows, columns: {name: TypedArray|Array}}}, arrays: {field: TypedArray|Array}}
+    decode(buffer) {
+        const view = new DataView(buffer);
+        const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+        if (magic !== 'SPC1') throw new Error('Not a columnar payload');
+        const headerLength = view.getUint32(4, true);
+        const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 8, headerLength)));
+        const base = 8 + headerLength + ((8 - (8 + headerLength) % 8) % 8);
+
+        const strings = this.decodeStrings(buffer, base, header.strings);
+        const column = (spec, count) => {
+            if (spec.type === 'str') {
+                const indices = new Uint32Array(buffer, base + spec.offset, count);
+                return Array.from(indices, i => i === this.NULL_STRING ? null : strings[i]);
+            }
+            return new this.ARRAY_TYPES[spec.type](buffer, base + spec.offset, count);
+        };
+
+        const tables = {};
+        for (const [field, table] of Object.entries(header.tables)) {
+            const columns = {};
+            for (const [name, spec] of Object.entries(table.columns)) {
+                columns[name] = column(spec, table.rows);
+            }
+            tables[field] = { rows: table.rows, columns };
+        }
+        const arrays = {};
+        for (const [field, spec] of Object.entries(header.arrays)) {
+            arrays[field] = column(spec, spec.count);
+        }
+        return { meta: header.meta, tables, arrays };
+    },
+
+    decodeStrings(buffer, base, table) {
+        const offsets = new Uint32Array(buffer, base + table.offsets, table.count + 1);
+        const bytes = new Uint8Array(buffer, base + table.data, table.length);
+        const decoder = new TextDecoder();
+        const strings = new Array(table.count);
+        for (let i = 0; i < table.count; i++) {
+            strings[i] = decoder.decode(bytes.subarray(offsets[i], offsets[i + 1]));
+        }
+        return strings;
+    },
+
+    // Row objects of a decoded table, for code that renders one row at a time
+    rows(table) {
+        const names = Object.keys(table.columns);
+        const rows = new Array(table.rows);
+        for (let i = 0; i < table.rows; i++) {
+            const row = {};
+            for (const name of names) row[name] = table.columns[name][i];
+            rows[i] = row;
+        }
+        return rows;
+    },
+
+    // Same shape as the JSON payload: meta fields, tables as row lists and
+    // "field.key" arrays nested back under their field (as TypedArrays)
+    toPayload(decoded) {
+        const payload = { ...decoded.meta };
+        for (const [field, table] of Object.entries(decoded.tables)) {
+            payload[field] = this.rows(table);
+        }
+        for (const [field, values] of Object.entries(decoded.arrays)) {
+            const [outer, inner] = field.split('.', 2);
+            const value = values.length === 0 ? [] : values;
+            if (inner === undefined) {
+                payload[outer] = value;
+            } else {
+                (payload[outer] = payload[outer] || {})[inner] = value;
+            }
+        }
+        return payload;
+    }
+};
+
+globalThis.Wire = Wire;
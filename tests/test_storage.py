@@ -0,0 +1,23 @@
+"""Tests for backend.storage."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.storage import NameTable  # noqa: E402
+
+
+def test_name_table_reopen_keeps_ids(tmp_path):
+    path = str(tmp_path / 'names.txt')
+    table = NameTable(path)
+    names = ['foo\rbar', 'nginx', 'a\r\nb', 'line\nbreak', 'crlf\r']
+    ids = [table.intern(name) for name in names]
+    table.close()
+    
+    reopened = NameTable(path)
+    try:
+        assert reopened.names == table.names
+        assert [reopened.get(name.replace('\n', ' ')) for name in names] == ids
+        assert reopened.intern('nginx') == 1
+    finally:
+        reopened.close()